@@ -0,0 +1,124 @@
+"""
+Benchmarks email template rendering with and without compiled-template caching.
+
+    python -m benchmarks.email_templates --recipients 1000 --output results.json
+
+Every email template is rendered through a template engine without the cached
+loader, which reads and parses the file on each render, and through the
+project's engine, whose cached loader compiles each template once. The bulk
+scenario renders both variants of the invitation for many recipients, as
+BulkInvitationService does.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+SESSION_CONTEXT = {
+    'owner_name': 'owner',
+    'session_name': 'Pair programming session',
+    'session_description': 'Refactoring the matching service together.',
+    'session_date': '01-05-2030 10:30',
+    'session_link': 'http://localhost:5173/sessions/1/',
+}
+CONTEXTS = {
+    'emails/invite_developer_email': {**SESSION_CONTEXT, 'developer_name': 'developer'},
+    'emails/interest_notification_email': {**SESSION_CONTEXT, 'interested_user': 'developer'},
+    'emails/interest_digest_email': {
+        'owner_name': 'owner',
+        'interest_count': 12,
+        'sessions': [
+            {'name': f'Session {index}', 'link': f'http://localhost:5173/sessions/{index}/',
+             'interested_users': [f'developer{user}' for user in range(4)]}
+            for index in range(3)
+        ],
+    },
+    'emails/confirmation_email': {**SESSION_CONTEXT, 'developer_name': 'developer'},
+    'emails/activation_email': {
+        'user': {'username': 'developer'},
+        'activation_url': 'http://localhost:5173/activate/MQ/token/',
+    },
+}
+
+
+def run(samples, recipients):
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    django.setup()
+
+    from django.conf import settings
+    from django.template import Context, Engine
+    from django.template.loader import get_template
+
+    from pair_connect.email_templates import EMAIL_TEMPLATES, warm_email_templates
+
+    uncached = Engine(
+        dirs=settings.TEMPLATES[0]['DIRS'],
+        loaders=['django.template.loaders.filesystem.Loader', 'django.template.loaders.app_directories.Loader'],
+    )
+
+    def render_uncached(name, context):
+        return uncached.get_template(name).render(Context(context))
+
+    def render_cached(name, context):
+        return get_template(name).render(context)
+
+    started = time.perf_counter()
+    warm_email_templates()
+    results = {"warm_up_ms": round((time.perf_counter() - started) * 1000, 3), "templates": {}, "bulk": {}}
+
+    for name in EMAIL_TEMPLATES:
+        context = CONTEXTS[name.rsplit('.', 1)[0]]
+        assert render_uncached(name, context) == render_cached(name, context)
+        results["templates"][name] = {
+            "uncached": measure(lambda: render_uncached(name, context), samples),
+            "cached": measure(lambda: render_cached(name, context), samples),
+        }
+
+    invite = CONTEXTS['emails/invite_developer_email']
+    contexts = [{**invite, 'developer_name': f'developer{index}'} for index in range(recipients)]
+    for label, render in (("uncached", render_uncached), ("cached", render_cached)):
+        started = time.perf_counter()
+        for context in contexts:
+            render('emails/invite_developer_email.html', context)
+            render('emails/invite_developer_email.txt', context)
+        elapsed = time.perf_counter() - started
+        results["bulk"][label] = {"emails": recipients, "emails_per_second": round(recipients / elapsed)}
+    results["bulk"]["speedup"] = round(
+        results["bulk"]["cached"]["emails_per_second"] / results["bulk"]["uncached"]["emails_per_second"], 2
+    )
+    return results
+
+
+def measure(render, samples):
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        render()
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+
+    percentiles = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+    return {"p50_us": round(percentiles[49], 1), "p95_us": round(percentiles[94], 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--samples', type=int, default=500, help="Renders measured per template and engine.")
+    parser.add_argument('--recipients', type=int, default=1000, help="Invitations rendered in the bulk scenario.")
+    parser.add_argument('--output', help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    rendered = json.dumps(run(args.samples, args.recipients), indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(rendered)
+    else:
+        print(rendered)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Benchmarks FastJSONRenderer against DRF's JSONRenderer on real API payloads.
+
+    python -m benchmarks.renderers --users 2000 --page-size 100 --output results.json
+
+The payloads are the ``data`` of list responses served from synthetic data in a
+throwaway test database, so they hold the same serializer output the API renders.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+PAYLOADS = {
+    "sessions.expanded": ("session-list", {"expand": "participants"}),
+    "sessions.compact": ("session-list", {}),
+    "projects.expanded": ("project-list", {"expand": "sessions"}),
+    "user_sessions": ("user_sessions", {"expand": "participants"}),
+}
+
+
+def run(users, page_size, samples, seed):
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    from django.urls import reverse
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.test import APIClient
+
+    from benchmarks.synthetic import SyntheticDataGenerator
+    from pair_connect.renderers import FastJSONRenderer, orjson
+    from projects.models import Session
+
+    setup_test_environment()
+    test_database = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        created = SyntheticDataGenerator(seed=seed).generate(users)
+        client = APIClient()
+        client.force_authenticate(Session.objects.filter(participants__isnull=False).first().host)
+
+        results = {"orjson": orjson is not None, "dataset": created, "payloads": {}}
+        for name, (url_name, params) in PAYLOADS.items():
+            data = client.get(reverse(url_name), {**params, "page_size": page_size}).data
+            baseline, fast = JSONRenderer(), FastJSONRenderer()
+            results["payloads"][name] = {
+                "bytes": len(baseline.render(data)),
+                "identical": baseline.render(data) == fast.render(data),
+                "json": measure(baseline.render, data, samples),
+                "fast": measure(fast.render, data, samples),
+            }
+            results["payloads"][name]["speedup"] = round(
+                results["payloads"][name]["json"]["p50_ms"] / results["payloads"][name]["fast"]["p50_ms"], 2
+            )
+            print(f"{name} done", file=sys.stderr)
+    finally:
+        connection.creation.destroy_test_db(test_database, verbosity=0)
+
+    return results
+
+
+def measure(render, data, samples):
+    latencies = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        render(data)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    percentiles = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+    return {"p50_ms": round(percentiles[49], 3), "p95_ms": round(percentiles[94], 3)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=2000, help="Size of the synthetic user base.")
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--samples', type=int, default=200, help="Renders measured per payload and renderer.")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="Write the results to this JSON file.")
+    args = parser.parse_args()
+
+    rendered = json.dumps(run(args.users, args.page_size, args.samples, args.seed), indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(rendered)
+    else:
+        print(rendered)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
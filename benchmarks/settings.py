@@ -0,0 +1,23 @@
+"""
+Settings used by the benchmark suite. The database defaults to a local SQLite file
+and can be pointed at a throwaway PostgreSQL database with BENCHMARK_DATABASE_URL.
+"""
+import os
+
+import dj_database_url
+
+from pair_connect.settings import *  # noqa: F401,F403
+from pair_connect.settings import BASE_DIR
+
+if os.environ.get('BENCHMARK_DATABASE_URL'):
+    DATABASES = {'default': dj_database_url.parse(os.environ['BENCHMARK_DATABASE_URL'])}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(BASE_DIR, 'benchmarks', 'benchmark.sqlite3'),
+        }
+    }
+
+DEBUG = False
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
@@ -0,0 +1,195 @@
+"""
+Benchmarks DeveloperSuggestionService and SessionSuggestionService on synthetic data.
+
+    python -m benchmarks.suggestions --sizes 1000 10000 100000 --output results.json
+    python -m benchmarks.suggestions --baseline benchmarks/baseline.json
+
+Each backend runs in its own process against a throwaway test database. PostgreSQL
+is only benchmarked when BENCHMARK_POSTGRES_URL points at a reachable server.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+BACKENDS = ('sqlite', 'postgresql')
+
+
+def run_backend(sizes, samples, seed):
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext, override_settings
+    from django.utils import timezone
+
+    from benchmarks.synthetic import SyntheticDataGenerator
+    from projects.matching_index import developer_index
+    from projects.models import Session
+    from projects.services import RANKING_SCORE, DeveloperSuggestionService, SessionSuggestionService
+    from users.models import CustomUser
+
+    scenarios = {
+        "developers.tier": ({}, lambda session, user: DeveloperSuggestionService(session).get_suggested_developers()),
+        "developers.score": ({}, lambda session, user: DeveloperSuggestionService(
+            session, ranking=RANKING_SCORE).get_suggested_developers()),
+        "developers.index": ({'DEVELOPER_MATCHING_INDEX_ENABLED': True},
+                             lambda session, user: DeveloperSuggestionService(session).get_suggested_developers()),
+        "developers.engine": ({'AFFINITY_ENGINE_ENABLED': True},
+                              lambda session, user: DeveloperSuggestionService(session).get_suggested_developers()),
+        "sessions.tier": ({}, lambda session, user: SessionSuggestionService(user).get_suggested_sessions()),
+        "sessions.score": ({}, lambda session, user: SessionSuggestionService(
+            user, ranking=RANKING_SCORE).get_suggested_sessions()),
+    }
+
+    results = {"vendor": connection.vendor, "sizes": {}}
+    for size in sizes:
+        test_database = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            created = SyntheticDataGenerator(seed=seed).generate(size)
+            developer_index.invalidate()
+
+            sessions = list(Session.objects.filter(
+                schedule_date_time__gte=timezone.now()
+            ).select_related('stack', 'level').order_by('?')[:samples])
+            users = list(CustomUser.objects.select_related('stack', 'level').order_by('?')[:samples])
+
+            measurements = {}
+            for name, (overrides, call) in scenarios.items():
+                with override_settings(**overrides):
+                    list(call(sessions[0], users[0]))
+                    measurements[name] = measure(call, sessions, users, CaptureQueriesContext, connection)
+
+            results["sizes"][str(size)] = {"dataset": created, "scenarios": measurements}
+            print(f"[{connection.vendor}] {size} users done", file=sys.stderr)
+        finally:
+            connection.creation.destroy_test_db(test_database, verbosity=0)
+
+    return results
+
+
+def measure(call, sessions, users, capture_queries, connection):
+    latencies, query_counts = [], []
+    for session, user in zip(sessions, users):
+        with capture_queries(connection) as queries:
+            started = time.perf_counter()
+            list(call(session, user))
+            latencies.append((time.perf_counter() - started) * 1000)
+        query_counts.append(len(queries))
+
+    tracemalloc.start()
+    peak = 0
+    for session, user in list(zip(sessions, users))[:5]:
+        tracemalloc.reset_peak()
+        list(call(session, user))
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+
+    percentiles = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+    return {
+        "calls": len(latencies),
+        "p50_ms": round(percentiles[49], 3),
+        "p95_ms": round(percentiles[94], 3),
+        "p99_ms": round(percentiles[98], 3),
+        "mean_queries": round(statistics.mean(query_counts), 2),
+        "peak_memory_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Returns human readable regressions of ``results`` against ``baseline``."""
+    regressions = []
+    for backend, backend_results in results.items():
+        for size, size_results in backend_results.get("sizes", {}).items():
+            for name, current in size_results["scenarios"].items():
+                previous = baseline.get(backend, {}).get("sizes", {}).get(size, {}).get("scenarios", {}).get(name)
+                if not previous:
+                    continue
+                label = f"{backend} {size} users {name}"
+                if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+                    regressions.append(f"{label}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+                if current["mean_queries"] > previous["mean_queries"]:
+                    regressions.append(
+                        f"{label}: queries {previous['mean_queries']} -> {current['mean_queries']}"
+                    )
+    return regressions
+
+
+def postgres_available(url):
+    try:
+        import dj_database_url
+        import psycopg2
+
+        config = dj_database_url.parse(url)
+        psycopg2.connect(
+            dbname=config['NAME'], user=config['USER'], password=config['PASSWORD'],
+            host=config['HOST'], port=config['PORT'] or 5432, connect_timeout=3,
+        ).close()
+        return True
+    except Exception as e:
+        print(f"Skipping PostgreSQL: {e}", file=sys.stderr)
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--samples', type=int, default=50, help="Service calls measured per scenario.")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--backend', choices=BACKENDS + ('all',), default='all')
+    parser.add_argument('--output', help="Write the results to this JSON file.")
+    parser.add_argument('--baseline', help="Compare against this JSON file and exit 1 on regressions.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed p95 slowdown before flagging.")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_backend(args.sizes, args.samples, args.seed)))
+        return 0
+
+    backends = BACKENDS if args.backend == 'all' else (args.backend,)
+    results = {}
+    for backend in backends:
+        env = dict(os.environ)
+        env.pop('BENCHMARK_DATABASE_URL', None)
+        if backend == 'postgresql':
+            url = os.environ.get('BENCHMARK_POSTGRES_URL')
+            if not url or not postgres_available(url):
+                continue
+            env['BENCHMARK_DATABASE_URL'] = url
+
+        with tempfile.TemporaryFile(mode='w+') as output:
+            subprocess.run(
+                [sys.executable, '-m', 'benchmarks.suggestions', '--child', '--seed', str(args.seed),
+                 '--samples', str(args.samples), '--sizes', *map(str, args.sizes)],
+                env=env, stdout=output, check=True,
+            )
+            output.seek(0)
+            results[backend] = json.load(output)
+
+    rendered = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(rendered)
+    else:
+        print(rendered)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(results, json.load(baseline), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
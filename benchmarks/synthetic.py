@@ -0,0 +1,151 @@
+import random
+from datetime import timedelta
+
+from django.utils import timezone
+
+from projects.models import InterestedParticipant, Project, Session
+from skills.masks import mask_of_bits
+from skills.models import Level, ProgLanguage, Stack
+from users.models import CustomUser
+
+STACK_WEIGHTS = {'Backend': 0.4, 'Frontend': 0.35, 'Fullstack': 0.25}
+LEVEL_WEIGHTS = {'Junior': 0.5, 'Mid': 0.3, 'Senior': 0.2}
+LANGUAGES = [
+    'JavaScript', 'Python', 'TypeScript', 'Java', 'C#', 'PHP', 'Go', 'Ruby', 'Kotlin', 'Swift',
+    'Rust', 'C++', 'C', 'Dart', 'Scala', 'Elixir', 'Haskell', 'Clojure', 'R', 'Lua',
+]
+BATCH_SIZE = 2000
+
+
+class SyntheticDataGenerator:
+    """
+    Creates a seeded, reproducible population of developers, projects and sessions.
+
+    Language popularity follows a Zipf-like curve, so a handful of languages are
+    shared by most developers, as in the real user base.
+    """
+
+    def __init__(self, seed=42, projects_per_user=0.1, sessions_per_project=2, upcoming_ratio=0.7):
+        self.random = random.Random(seed)
+        self.projects_per_user = projects_per_user
+        self.sessions_per_project = sessions_per_project
+        self.upcoming_ratio = upcoming_ratio
+
+    def generate(self, users):
+        stacks = {name: Stack.objects.get_or_create(name=name)[0] for name in STACK_WEIGHTS}
+        levels = {name: Level.objects.get_or_create(name=name)[0] for name in LEVEL_WEIGHTS}
+        languages = [ProgLanguage.objects.get_or_create(name=name)[0] for name in LANGUAGES]
+        self.language_bits = {language.id: language.mask_bit for language in languages}
+        language_weights = [1 / rank for rank in range(1, len(languages) + 1)]
+
+        user_ids = self._create_users(users, stacks, levels, languages, language_weights)
+        project_ids = self._create_projects(user_ids, stacks, levels, languages, language_weights)
+        session_ids = self._create_sessions(project_ids, user_ids, stacks, levels, languages, language_weights)
+        self._create_interest(session_ids, user_ids)
+
+        return {
+            "users": len(user_ids),
+            "projects": len(project_ids),
+            "sessions": len(session_ids),
+        }
+
+    def _pick(self, weights):
+        return self.random.choices(list(weights), weights=list(weights.values()))[0]
+
+    def _language_mask(self, language_ids):
+        return mask_of_bits(self.language_bits[language_id] for language_id in language_ids)
+
+    def _pick_languages(self, languages, language_weights, minimum=1, maximum=4):
+        count = self.random.randint(minimum, maximum)
+        return {language.id for language in self.random.choices(languages, weights=language_weights, k=count)}
+
+    def _create_users(self, count, stacks, levels, languages, language_weights):
+        offset = CustomUser.objects.count()
+        users, user_languages = [], []
+        for index in range(offset, offset + count):
+            language_ids = self._pick_languages(languages, language_weights)
+            user_languages.append(language_ids)
+            users.append(CustomUser(
+                username=f'synthetic{index}',
+                email=f'synthetic{index}@example.com',
+                name=f'Synthetic Developer {index}',
+                password='!',
+                stack=stacks[self._pick(STACK_WEIGHTS)],
+                level=levels[self._pick(LEVEL_WEIGHTS)],
+                language_mask=self._language_mask(language_ids),
+            ))
+        CustomUser.objects.bulk_create(users, batch_size=BATCH_SIZE)
+
+        user_ids = list(CustomUser.objects.filter(
+            username__startswith='synthetic'
+        ).order_by('id').values_list('id', flat=True))[-count:]
+        CustomUser.prog_language.through.objects.bulk_create([
+            CustomUser.prog_language.through(customuser_id=user_id, proglanguage_id=language_id)
+            for user_id, language_ids in zip(user_ids, user_languages)
+            for language_id in language_ids
+        ], batch_size=BATCH_SIZE)
+        return user_ids
+
+    def _create_projects(self, user_ids, stacks, levels, languages, language_weights):
+        count = max(1, int(len(user_ids) * self.projects_per_user))
+        projects, project_languages = [], []
+        for index in range(count):
+            language_ids = self._pick_languages(languages, language_weights, maximum=3)
+            project_languages.append(language_ids)
+            projects.append(Project(
+                owner_id=self.random.choice(user_ids),
+                name=f'Synthetic Project {index}',
+                stack=stacks[self._pick(STACK_WEIGHTS)],
+                level=levels[self._pick(LEVEL_WEIGHTS)],
+                language_mask=self._language_mask(language_ids),
+            ))
+        Project.objects.bulk_create(projects, batch_size=BATCH_SIZE)
+
+        project_rows = list(Project.objects.order_by('id').values_list('id', 'owner_id'))[-count:]
+        Project.languages.through.objects.bulk_create([
+            Project.languages.through(project_id=project_id, proglanguage_id=language_id)
+            for (project_id, _), language_ids in zip(project_rows, project_languages)
+            for language_id in language_ids
+        ], batch_size=BATCH_SIZE)
+        return project_rows
+
+    def _create_sessions(self, project_rows, user_ids, stacks, levels, languages, language_weights):
+        now = timezone.now()
+        sessions, session_languages = [], []
+        for project_id, owner_id in project_rows:
+            for _ in range(self.random.randint(1, self.sessions_per_project * 2 - 1)):
+                days = self.random.randint(1, 60)
+                if self.random.random() >= self.upcoming_ratio:
+                    days = -days
+                language_ids = self._pick_languages(languages, language_weights, maximum=2)
+                session_languages.append(language_ids)
+                sessions.append(Session(
+                    project_id=project_id,
+                    host_id=owner_id,
+                    name=f'Synthetic Session {len(sessions)}',
+                    schedule_date_time=now + timedelta(days=days, hours=self.random.randint(0, 23)),
+                    stack=stacks[self._pick(STACK_WEIGHTS)],
+                    level=levels[self._pick(LEVEL_WEIGHTS)],
+                    language_mask=self._language_mask(language_ids),
+                ))
+        Session.objects.bulk_create(sessions, batch_size=BATCH_SIZE)
+
+        session_ids = list(Session.objects.order_by('id').values_list('id', flat=True))[-len(sessions):]
+        Session.languages.through.objects.bulk_create([
+            Session.languages.through(session_id=session_id, proglanguage_id=language_id)
+            for session_id, language_ids in zip(session_ids, session_languages)
+            for language_id in language_ids
+        ], batch_size=BATCH_SIZE)
+        return session_ids
+
+    def _create_interest(self, session_ids, user_ids):
+        interested, participants = [], []
+        for session_id in session_ids:
+            users = self.random.sample(user_ids, min(len(user_ids), self.random.randint(0, 8)))
+            interested.extend(InterestedParticipant(session_id=session_id, user_id=user_id) for user_id in users)
+            participants.extend(
+                Session.participants.through(session_id=session_id, customuser_id=user_id)
+                for user_id in users[:self.random.randint(0, 2)]
+            )
+        InterestedParticipant.objects.bulk_create(interested, batch_size=BATCH_SIZE)
+        Session.participants.through.objects.bulk_create(participants, batch_size=BATCH_SIZE)
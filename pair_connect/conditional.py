@@ -0,0 +1,62 @@
+import hashlib
+
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from skills.versions import REFERENCE_DATA, get_versions
+
+
+def make_etag(*parts):
+    """Strong ETag hashing the given version parts."""
+    return quote_etag(hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    Adds strong ETags to ``list`` and ``retrieve`` of views over models with a
+    ``version_field`` timestamp, and answers a matching ``If-None-Match`` with a
+    304 before the objects are loaded or serialized.
+
+    A row is identified by its version; a collection by its size, latest version
+    and id sum, along with the requesting user and the full path, since lists
+    may be per-user and the query string selects pages and fields. Both also
+    include the ``shared_versions`` of data embedded in every representation,
+    such as skill names, so changing those does not have to touch every row.
+    """
+    version_field = "updated_at"
+    shared_versions = (REFERENCE_DATA,)
+
+    def list(self, request, *args, **kwargs):
+        versions = self.filter_queryset(self.get_queryset()).prefetch_related(None).aggregate(
+            count=Count("pk"), latest=Max(self.version_field), id_sum=Sum("pk")
+        )
+        etag = make_etag(
+            versions["count"], versions["latest"], versions["id_sum"], request.user.pk, request.get_full_path(),
+            *get_versions(*self.shared_versions),
+        )
+        return self.conditional_response(request, etag, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        version = self.filter_queryset(self.get_queryset()).prefetch_related(None).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        ).values_list(self.version_field, flat=True).first()
+        if version is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = make_etag(
+            kwargs[lookup_url_kwarg], version, request.get_full_path(), *get_versions(*self.shared_versions)
+        )
+        return self.conditional_response(request, etag, super().retrieve, *args, **kwargs)
+
+    def conditional_response(self, request, etag, render, *args, **kwargs):
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified["ETag"] = etag
+            return not_modified
+
+        response = render(request, *args, **kwargs)
+        if response.status_code == 200:
+            response["ETag"] = etag
+        return response
@@ -0,0 +1,25 @@
+from django.template.loader import get_template
+
+EMAIL_TEMPLATES = (
+    'emails/invite_developer_email.html',
+    'emails/invite_developer_email.txt',
+    'emails/interest_notification_email.html',
+    'emails/interest_notification_email.txt',
+    'emails/interest_digest_email.html',
+    'emails/interest_digest_email.txt',
+    'emails/confirmation_email.html',
+    'emails/confirmation_email.txt',
+    'emails/activation_email.html',
+    'emails/activation_email.txt',
+)
+
+
+def warm_email_templates():
+    """
+    Compiles every email template into the cached template loader, which Django
+    enables by default, so the first email a process renders does not pay for
+    reading and parsing the templates. Called from ``ProjectsConfig.ready()``.
+    """
+    for name in EMAIL_TEMPLATES:
+        get_template(name)
+    return len(EMAIL_TEMPLATES)
@@ -0,0 +1,59 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _split(value):
+    if value is None:
+        return None
+    names = {name.strip() for name in value.split(",")} - {""}
+    return names or None
+
+
+class SparseFieldset:
+    """
+    Top-level fields kept with ``?fields=a,b`` and/or dropped with ``?omit=c``.
+    Without either parameter every field is kept.
+    """
+
+    def __init__(self, fields=None, omit=None):
+        self.fields = None if fields is None else set(fields)
+        self.omit = set(omit or ())
+
+    @classmethod
+    def from_request(cls, request):
+        """Reads the fieldset of read requests; writes always use the full representation."""
+        if request is None or request.method not in SAFE_METHODS:
+            return cls()
+        return cls(_split(request.query_params.get("fields")), _split(request.query_params.get("omit")))
+
+    def __contains__(self, name):
+        return (self.fields is None or name in self.fields) and name not in self.omit
+
+    def __bool__(self):
+        return self.fields is not None or bool(self.omit)
+
+    def filter(self, representation):
+        if not self:
+            return representation
+        return {name: value for name, value in representation.items() if name in self}
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin dropping the fields left out of the request's sparse fieldset
+    before anything is serialized. Only the top-level serializer holding the
+    request in its context is trimmed; nested serializers stay complete.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fieldset = SparseFieldset.from_request(self.context.get("request"))
+        if not self.fieldset:
+            return
+
+        unknown = (self.fieldset.fields or set()) - set(self.fields)
+        if unknown:
+            raise ValidationError(f"Unknown fields: {', '.join(sorted(unknown))}.")
+        for name in list(self.fields):
+            if name not in self.fieldset:
+                self.fields.pop(name)
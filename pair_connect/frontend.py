@@ -0,0 +1,10 @@
+from django.conf import settings
+
+
+def frontend_url(path):
+    """Absolute link to ``path`` in the frontend app served at ``FRONTEND_URL``."""
+    return f"{settings.FRONTEND_URL.rstrip('/')}/{path.lstrip('/')}"
+
+
+def session_url(session_id):
+    return frontend_url(f"sessions/{session_id}/")
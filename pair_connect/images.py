@@ -0,0 +1,12 @@
+CLOUDINARY_UPLOAD_URL = "https://res.cloudinary.com/dwzqcmaod/image/upload/"
+
+
+def upload_url(image):
+    """URL of an image stored in a CloudinaryField, from its stored public id."""
+    return f"{CLOUDINARY_UPLOAD_URL}{image}"
+
+
+def photo_url(photo):
+    """Like ``upload_url``, but photos already stored as absolute URLs are kept as they are."""
+    photo = str(photo)
+    return photo if photo.startswith("http") else upload_url(photo)
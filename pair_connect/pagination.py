@@ -0,0 +1,38 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class ListCursorPagination(CursorPagination):
+    """
+    Cursor pagination shared by the list endpoints. The page size comes from
+    ``API_PAGE_SIZE`` and can be lowered or raised with ``?page_size=`` up to
+    ``API_MAX_PAGE_SIZE``. While ``UNPAGINATED_LIST_RESPONSES`` is set, lists keep
+    their previous unpaginated shape.
+    """
+    page_size_query_param = "page_size"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if settings.UNPAGINATED_LIST_RESPONSES:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return settings.API_PAGE_SIZE
+        if page_size <= 0:
+            return settings.API_PAGE_SIZE
+        return min(page_size, settings.API_MAX_PAGE_SIZE)
+
+
+class ProjectCursorPagination(ListCursorPagination):
+    ordering = ("-date_created", "-id")
+
+
+class SessionCursorPagination(ListCursorPagination):
+    ordering = ("schedule_date_time", "id")
+
+
+class InterestCursorPagination(ListCursorPagination):
+    ordering = ("-date_created_interested", "-id")
@@ -0,0 +1,23 @@
+import pytest
+
+from pair_connect.query_budget import enforce_budgets
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "skip_query_budget: do not fail the test when a view exceeds its query budget"
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Fails tests whose requests ran more queries than the view's ``query_budget``."""
+    if item.get_closest_marker("skip_query_budget"):
+        return (yield)
+
+    with enforce_budgets() as violations:
+        result = yield
+
+    if violations:
+        pytest.fail("Query budget exceeded:\n" + "\n".join(str(violation) for violation in violations))
+    return result
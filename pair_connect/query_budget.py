@@ -0,0 +1,169 @@
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+_stats_lock = threading.Lock()
+_stats = {}
+_enforced = []
+
+
+def query_shape(sql):
+    """Normalizes ``sql`` so queries differing only in their parameters share a shape."""
+    return _LITERAL.sub("?", _IN_LIST.sub("IN (...)", sql))
+
+
+class QueryRecorder:
+    """``execute_wrapper`` counting the queries, DB time and query shapes of one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            self.shapes[query_shape(sql)] += 1
+
+    def repeated_shapes(self):
+        """Shapes run at least ``QUERY_BUDGET_REPEAT_THRESHOLD`` times: the N+1 signature."""
+        threshold = settings.QUERY_BUDGET_REPEAT_THRESHOLD
+        return {shape: count for shape, count in self.shapes.items() if count >= threshold}
+
+
+class BudgetViolation:
+    def __init__(self, view, queries, budget, repeated_shapes):
+        self.view = view
+        self.queries = queries
+        self.budget = budget
+        self.repeated_shapes = repeated_shapes
+
+    def __str__(self):
+        lines = [f"{self.view} ran {self.queries} queries, over its budget of {self.budget}."]
+        lines.extend(f"  {count}x {shape}" for shape, count in self.repeated_shapes.items())
+        return "\n".join(lines)
+
+
+def resolve_view(request):
+    """Returns the ``(label, view class, action)`` handling ``request``, or None."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return None
+
+    view_class = getattr(match.func, "cls", None) or getattr(match.func, "view_class", None)
+    if view_class is None:
+        return match._func_path, None, None
+
+    action = getattr(match.func, "actions", {}).get(request.method.lower())
+    label = f"{view_class.__module__}.{view_class.__name__}"
+    return (f"{label}.{action}" if action else label), view_class, action
+
+
+def get_budget(view_class, action):
+    """
+    Reads the ``query_budget`` of a view: a number of queries, or a dict of them
+    keyed by viewset action.
+    """
+    budget = getattr(view_class, "query_budget", None)
+    if isinstance(budget, dict):
+        return budget.get(action)
+    return budget
+
+
+def record(view, recorder):
+    repeated = recorder.repeated_shapes()
+    with _stats_lock:
+        stats = _stats.setdefault(view, {
+            "requests": 0, "queries": 0, "max_queries": 0, "db_time": 0.0, "repeated_shapes": Counter(),
+        })
+        stats["requests"] += 1
+        stats["queries"] += recorder.count
+        stats["max_queries"] = max(stats["max_queries"], recorder.count)
+        stats["db_time"] += recorder.duration
+        stats["repeated_shapes"].update(repeated)
+
+    if repeated:
+        logger.warning("%s repeated %d query shapes: %s", view, len(repeated), list(repeated))
+
+
+def get_stats():
+    """Per-view query counts, DB time and repeated shapes recorded by this process, served at ``query-stats/``."""
+    with _stats_lock:
+        return {
+            view: {
+                "requests": stats["requests"],
+                "avg_queries": round(stats["queries"] / stats["requests"], 2),
+                "max_queries": stats["max_queries"],
+                "avg_db_time_ms": round(stats["db_time"] * 1000 / stats["requests"], 3),
+                "repeated_shapes": dict(stats["repeated_shapes"]),
+            }
+            for view, stats in _stats.items()
+        }
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+@contextmanager
+def enforce_budgets():
+    """Records every request and collects the budget violations that happen inside the block."""
+    violations = []
+    _enforced.append(violations)
+    try:
+        yield violations
+    finally:
+        _enforced.remove(violations)
+
+
+class QueryBudgetMiddleware:
+    """
+    Counts the SQL queries and DB time of each request and checks them against the
+    ``query_budget`` declared on the view. Requests are recorded when
+    ``QUERY_BUDGET_ENABLED`` is set, for a ``QUERY_BUDGET_SAMPLE_RATE`` share of
+    them, and always while budgets are enforced by the test suite.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not _enforced and not (
+                settings.QUERY_BUDGET_ENABLED and random.random() < settings.QUERY_BUDGET_SAMPLE_RATE):
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        resolved = resolve_view(request)
+        if resolved is None:
+            return response
+
+        view, view_class, action = resolved
+        record(view, recorder)
+
+        budget = get_budget(view_class, action)
+        if budget is not None and recorder.count > budget:
+            violation = BudgetViolation(view, recorder.count, budget, recorder.repeated_shapes())
+            logger.warning(str(violation))
+            for violations in _enforced:
+                violations.append(violation)
+        return response
@@ -0,0 +1,46 @@
+import re
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ORJSON_OPTIONS = 0 if orjson is None else (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+)
+# Numbers orjson writes differently than repr(): exponents (1e16 vs 1e+16, 1e-7 vs 1e-07)
+# and small fractions it keeps positional (0.00001 vs 1e-05). Matches inside strings only
+# cost a fallback.
+DIVERGENT_FLOAT = re.compile(rb'[:,\[]-?(?:\d+(?:\.\d+)?e|0\.0000)')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` encoding with orjson when it is installed. Datetimes, dates,
+    times and dataclasses are passed back to DRF's encoder, so timedeltas,
+    Decimals and lazy strings come out as they do with the stdlib. Indented,
+    ASCII-only or non-compact output, and anything orjson refuses (such as
+    integers wider than 64 bits), is rendered by ``JSONRenderer`` itself, as
+    are payloads holding floats that orjson formats differently than ``repr()``.
+
+    NaN and infinities are the one known difference: orjson writes them as
+    ``null`` where the strict stdlib encoder raises ``ValueError``.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if DIVERGENT_FLOAT.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep the output a strict javascript subset, as JSONRenderer does.
+        return ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
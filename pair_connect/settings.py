@@ -44,9 +44,23 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'pair_connect.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'pair_connect.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', 20))
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 100))
+UNPAGINATED_LIST_RESPONSES = os.getenv('UNPAGINATED_LIST_RESPONSES', 'False') == 'True'
+
 MIDDLEWARE = [
+    'pair_connect.query_budget.QueryBudgetMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -159,6 +173,25 @@ cloudinary.config(
 
 SITE_NAME = os.getenv('SITE_NAME', 'localhost:5173')
 DOMAIN = os.getenv('DOMAIN', 'localhost:5173')
+FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:5173')
+
+DEVELOPER_MATCHING_INDEX_ENABLED = os.getenv('DEVELOPER_MATCHING_INDEX_ENABLED', 'False') == 'True'
+AFFINITY_ENGINE_ENABLED = os.getenv('AFFINITY_ENGINE_ENABLED', 'False') == 'True'
+VALUES_LIST_SERIALIZERS_ENABLED = os.getenv('VALUES_LIST_SERIALIZERS_ENABLED', 'True') == 'True'
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pair-connect',
+    }
+}
+
+SUGGESTION_CACHE_TIMEOUT = int(os.getenv('SUGGESTION_CACHE_TIMEOUT', 300))
+SKILLS_CACHE_MAX_AGE = int(os.getenv('SKILLS_CACHE_MAX_AGE', 3600))
+
+QUERY_BUDGET_ENABLED = os.getenv('QUERY_BUDGET_ENABLED', 'False') == 'True'
+QUERY_BUDGET_SAMPLE_RATE = float(os.getenv('QUERY_BUDGET_SAMPLE_RATE', 1.0))
+QUERY_BUDGET_REPEAT_THRESHOLD = int(os.getenv('QUERY_BUDGET_REPEAT_THRESHOLD', 3))
 
 
 DJOSER = {
@@ -198,4 +231,15 @@ EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 50))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 6))
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv('EMAIL_OUTBOX_RETRY_DELAY', 30))
+EMAIL_OUTBOX_MAX_RETRY_DELAY = int(os.getenv('EMAIL_OUTBOX_MAX_RETRY_DELAY', 3600))
+EMAIL_OUTBOX_LEASE = int(os.getenv('EMAIL_OUTBOX_LEASE', 600))
+EMAIL_CONNECTION_MAX_IDLE = int(os.getenv('EMAIL_CONNECTION_MAX_IDLE', 60))
+EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', 30))
+
+INTEREST_DIGEST_ENABLED = os.getenv('INTEREST_DIGEST_ENABLED', 'False') == 'True'
+INTEREST_DIGEST_WINDOW = int(os.getenv('INTEREST_DIGEST_WINDOW', 60))
+
 django_heroku.settings(locals())
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Project, Session, InterestedParticipant
+from .models import Project, Session, InterestedParticipant, OutboundEmail
 
 
 class ProjectAdmin(admin.ModelAdmin):
@@ -59,6 +59,15 @@ class InterestedParticipantAdmin(admin.ModelAdmin):
     readonly_fields = ('date_created_interested',)
 
 
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to', 'status', 'attempts', 'next_attempt_at', 'date_created', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'to')
+    ordering = ('-date_created',)
+    readonly_fields = ('date_created', 'sent_at', 'last_error')
+
+
 admin.site.register(Project, ProjectAdmin)
 admin.site.register(Session, SessionAdmin)
 admin.site.register(InterestedParticipant, InterestedParticipantAdmin)
+admin.site.register(OutboundEmail, OutboundEmailAdmin)
@@ -0,0 +1,256 @@
+import threading
+
+import numpy as np
+
+from skills.models import ProgLanguage, Stack
+from skills.versions import DEVELOPER_PROFILES, REFERENCE_DATA, get_versions
+from users.models import CustomUser
+
+from .matching_index import STACK_COMPATIBILITY
+from .models import InterestedParticipant, Session
+
+NOT_ELIGIBLE = np.iinfo(np.int64).max
+BLOCK_SIZE = 256
+
+
+class FeatureEncoder:
+    """Maps stack names, level names and language ids onto matrix columns."""
+
+    def __init__(self, stack_names, language_ids):
+        self.stack_columns = {name: column for column, name in enumerate(stack_names)}
+        self.language_columns = {language_id: column for column, language_id in enumerate(language_ids)}
+        self.level_codes = {None: 0}
+
+        self.compatibility = np.zeros((len(stack_names), len(stack_names)), dtype=np.float32)
+        for name, column in self.stack_columns.items():
+            compatible_stacks = STACK_COMPATIBILITY.get(name)
+            for other_name, other_column in self.stack_columns.items():
+                if compatible_stacks is None or other_name in compatible_stacks:
+                    self.compatibility[column, other_column] = 1
+
+    def encode(self, stack_names, level_names, language_sets):
+        """
+        Returns a one-hot stack matrix, an ordinal level vector and a multi-hot
+        language matrix with one row per entry.
+        """
+        stacks = np.zeros((len(stack_names), len(self.stack_columns)), dtype=np.float32)
+        levels = np.empty(len(stack_names), dtype=np.int64)
+        languages = np.zeros((len(stack_names), len(self.language_columns)), dtype=np.float32)
+
+        for row, (stack_name, level_name, language_ids) in enumerate(zip(stack_names, level_names, language_sets)):
+            if stack_name in self.stack_columns:
+                stacks[row, self.stack_columns[stack_name]] = 1
+            levels[row] = self.level_codes.setdefault(level_name, len(self.level_codes))
+            for language_id in language_ids:
+                column = self.language_columns.get(language_id)
+                if column is not None:
+                    languages[row, column] = 1
+
+        return stacks, levels, languages
+
+
+class SessionBlock:
+    """Dense features of a set of sessions, ordered by schedule date then id."""
+
+    def __init__(self, encoder, rows, languages, excluded_user_ids):
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.host_ids = np.array([row[3] or 0 for row in rows], dtype=np.int64)
+        self.stacks, self.levels, self.languages = encoder.encode(
+            [row[1] for row in rows],
+            [row[2] for row in rows],
+            [languages.get(row[0], ()) for row in rows],
+        )
+        self.has_language = self.languages.any(axis=1)
+        self.excluded_user_ids = [excluded_user_ids.get(row[0], set()) for row in rows]
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class AffinityEngine:
+    """
+    NumPy scoring engine behind the suggestion services.
+
+    Stack compatibility and language overlap between sessions and developers are
+    computed as matrix products, then turned into the same tiers used by
+    DeveloperSuggestionService and SessionSuggestionService, and the best K
+    entries of every row are selected with ``argpartition``.
+    """
+
+    def __init__(self, user_rows, user_languages, stack_names, language_ids):
+        self.encoder = FeatureEncoder(stack_names, language_ids)
+        self.user_ids = np.array([row[0] for row in user_rows], dtype=np.int64)
+        self.user_stacks, self.user_levels, self.user_languages = self.encoder.encode(
+            [row[1] for row in user_rows],
+            [row[2] for row in user_rows],
+            [user_languages.get(row[0], ()) for row in user_rows],
+        )
+        self.user_has_language = self.user_languages.any(axis=1)
+        self.user_is_candidate = np.array(
+            [not row[3] and row[1] is not None for row in user_rows], dtype=bool
+        )
+
+    @classmethod
+    def load(cls):
+        user_rows = list(CustomUser.objects.order_by('id').values_list('id', 'stack__name', 'level__name', 'is_staff'))
+        user_languages = {}
+        for user_id, language_id in CustomUser.prog_language.through.objects.values_list(
+                'customuser_id', 'proglanguage_id'):
+            user_languages.setdefault(user_id, set()).add(language_id)
+
+        return cls(
+            user_rows,
+            user_languages,
+            list(Stack.objects.order_by('id').values_list('name', flat=True)),
+            list(ProgLanguage.objects.order_by('id').values_list('id', flat=True)),
+        )
+
+    def load_sessions(self, sessions):
+        rows = list(sessions.order_by('schedule_date_time', 'id').values_list(
+            'id', 'stack__name', 'level__name', 'host_id'
+        ))
+        session_ids = [row[0] for row in rows]
+
+        languages = {}
+        for session_id, language_id in Session.languages.through.objects.filter(
+                session_id__in=session_ids).values_list('session_id', 'proglanguage_id'):
+            languages.setdefault(session_id, set()).add(language_id)
+
+        excluded_user_ids = {}
+        for session_id, user_id in InterestedParticipant.objects.filter(
+                session_id__in=session_ids).values_list('session_id', 'user_id'):
+            excluded_user_ids.setdefault(session_id, set()).add(user_id)
+        for session_id, user_id in Session.participants.through.objects.filter(
+                session_id__in=session_ids).values_list('session_id', 'customuser_id'):
+            excluded_user_ids.setdefault(session_id, set()).add(user_id)
+
+        return SessionBlock(self.encoder, rows, languages, excluded_user_ids)
+
+    def session_block(self, session, excluded_user_ids):
+        row = (session.id, session.stack.name if session.stack else None,
+               session.level.name if session.level else None, session.host_id)
+        languages = {session.id: set(session.languages.values_list('id', flat=True))}
+        return SessionBlock(self.encoder, [row], languages, {session.id: set(excluded_user_ids)})
+
+    def developer_keys(self, block, start, stop):
+        """
+        Sort keys of every developer for sessions ``start:stop`` of ``block``:
+        ``tier * n_users + user position``, or NOT_ELIGIBLE.
+        """
+        stack_ok = (block.stacks[start:stop] @ self.encoder.compatibility) @ self.user_stacks.T > 0
+        overlap = block.languages[start:stop] @ self.user_languages.T
+        language_match = np.where(
+            block.has_language[start:stop, None], overlap > 0, self.user_has_language[None, :]
+        )
+        level_match = block.levels[start:stop, None] == self.user_levels[None, :]
+
+        tiers = np.where(language_match & level_match, 1, np.where(language_match, 2, 3))
+        keys = tiers * len(self.user_ids) + np.arange(len(self.user_ids))
+        keys[~(stack_ok & self.user_is_candidate[None, :])] = NOT_ELIGIBLE
+
+        for offset in range(stop - start):
+            row = start + offset
+            excluded = set(block.excluded_user_ids[row])
+            if block.host_ids[row]:
+                excluded.add(int(block.host_ids[row]))
+            positions = self._user_positions(excluded)
+            keys[offset, positions] = NOT_ELIGIBLE
+
+        return keys
+
+    def session_keys(self, block, start, stop):
+        """
+        Sort keys of every session in ``block`` for users ``start:stop``:
+        ``priority * n_sessions + session position``, or NOT_ELIGIBLE.
+        """
+        stack_ok = (self.user_stacks[start:stop] @ self.encoder.compatibility) @ block.stacks.T > 0
+        shares_language = self.user_languages[start:stop] @ block.languages.T > 0
+        level_match = self.user_levels[start:stop, None] == block.levels[None, :]
+
+        priorities = np.where(level_match & stack_ok, 1, np.where(stack_ok, 2, 3))
+        keys = priorities * len(block) + np.arange(len(block))
+        keys[~shares_language | (self.user_ids[start:stop, None] == block.host_ids[None, :])] = NOT_ELIGIBLE
+        return keys
+
+    def top_developers(self, block, k=5):
+        """Returns ``{session_id: [(user_id, tier), ...]}`` for every session of ``block``."""
+        results = {}
+        for start in range(0, len(block), BLOCK_SIZE):
+            stop = min(start + BLOCK_SIZE, len(block))
+            positions, keys = self._top_k(self.developer_keys(block, start, stop), k)
+            for offset in range(stop - start):
+                results[int(block.ids[start + offset])] = [
+                    (int(self.user_ids[position]), int(key // len(self.user_ids)))
+                    for position, key in zip(positions[offset], keys[offset]) if key != NOT_ELIGIBLE
+                ]
+        return results
+
+    def top_developers_for_session(self, session, excluded_user_ids, k=5):
+        block = self.session_block(session, excluded_user_ids)
+        return [user_id for user_id, _ in self.top_developers(block, k)[session.id]]
+
+    def top_sessions(self, block, k=10, first_user=0, last_user=None):
+        """
+        Returns ``{user_id: [(session_id, priority), ...]}`` for the loaded users at
+        positions ``first_user:last_user`` (all users by default).
+        """
+        last_user = len(self.user_ids) if last_user is None else min(last_user, len(self.user_ids))
+        results = {}
+        for start in range(first_user, last_user, BLOCK_SIZE):
+            stop = min(start + BLOCK_SIZE, last_user)
+            positions, keys = self._top_k(self.session_keys(block, start, stop), k)
+            for offset in range(stop - start):
+                results[int(self.user_ids[start + offset])] = [
+                    (int(block.ids[position]), int(key // len(block)))
+                    for position, key in zip(positions[offset], keys[offset]) if key != NOT_ELIGIBLE
+                ]
+        return results
+
+    def _user_positions(self, user_ids):
+        if not user_ids:
+            return np.empty(0, dtype=np.int64)
+        user_ids = np.fromiter(user_ids, dtype=np.int64)
+        positions = np.searchsorted(self.user_ids, user_ids)
+        positions = positions[positions < len(self.user_ids)]
+        return positions[np.isin(self.user_ids[positions], user_ids)]
+
+    @staticmethod
+    def _top_k(keys, k):
+        k = min(k, keys.shape[1])
+        if k == 0:
+            empty = np.empty((keys.shape[0], 0), dtype=np.int64)
+            return empty, empty
+
+        positions = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        top_keys = np.take_along_axis(keys, positions, axis=1)
+        order = np.argsort(top_keys, axis=1, kind='stable')
+        return np.take_along_axis(positions, order, axis=1), np.take_along_axis(top_keys, order, axis=1)
+
+
+_engine_lock = threading.Lock()
+_engine = (None, None)
+
+
+def get_affinity_engine():
+    """
+    Returns the process-wide engine, reloading it when the developer profiles or
+    the skills it encodes moved to a new shared version. A single thread reloads
+    while the others keep answering from the previous engine.
+    """
+    global _engine
+
+    version = get_versions(DEVELOPER_PROFILES, REFERENCE_DATA)
+    loaded_version, engine = _engine
+    if engine is not None and loaded_version == version:
+        return engine
+    if not _engine_lock.acquire(blocking=engine is None):
+        return engine
+
+    try:
+        loaded_version, engine = _engine
+        if engine is None or loaded_version != version:
+            engine = AffinityEngine.load()
+            _engine = (version, engine)
+        return engine
+    finally:
+        _engine_lock.release()
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ProjectsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'projects'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from pair_connect.email_templates import warm_email_templates
+
+        # Web workers and the mail commands alike render emails, so every process compiles them up front.
+        warm_email_templates()
@@ -1,37 +1,41 @@
-from django.core.mail import EmailMultiAlternatives
-from django.template.loader import render_to_string
-from django.conf import settings
+from django.template.loader import get_template, render_to_string
+
+from pair_connect.frontend import session_url
+
+from .outbox import queue_email, queue_emails
 
 
 class EmailService:
     @staticmethod
     def send_invite_email(session, developer):
+        EmailService.send_invite_emails(session, [developer])
+
+    @staticmethod
+    def send_invite_emails(session, developers):
+        """Queues one invitation per developer, compiling the templates once for all of them."""
         try:
             owner = session.project.owner
             subject = f"¡{owner.username} te invita a una sesión de programación!"
 
-            context = {
-                'developer_name': developer.username,
+            session_context = {
                 'owner_name': owner.username,
                 'session_description': session.description,
                 'session_date': session.schedule_date_time.strftime("%d-%m-%Y %H:%M"),
-                'session_link': f"http://localhost:5173/sessions/{session.id}/",
+                'session_link': session_url(session.id),
             }
+            html_template = get_template('emails/invite_developer_email.html')
+            text_template = get_template('emails/invite_developer_email.txt')
 
-            html_content = render_to_string('emails/invite_developer_email.html', context)
-            text_content = render_to_string('emails/invite_developer_email.txt', context)
-
-            email = EmailMultiAlternatives(
-                subject,
-                text_content,
-                settings.DEFAULT_FROM_EMAIL,
-                [developer.email]
-            )
-            email.attach_alternative(html_content, "text/html")
-            email.send()
+            emails = []
+            for developer in developers:
+                context = {**session_context, 'developer_name': developer.username}
+                emails.append((
+                    subject, text_template.render(context), html_template.render(context), [developer.email]
+                ))
+            return queue_emails(emails)
 
         except Exception as e:
-            raise Exception(f"Error sending invite email: {str(e)}")
+            raise Exception(f"Error queuing invite email: {str(e)}")
 
     @staticmethod
     def send_interest_notification_email(session, interested_user):
@@ -42,25 +46,47 @@ class EmailService:
                 'owner_name': session.project.owner.username,
                 'interested_user': interested_user.username,
                 'session_name': session.name,
-
-                'session_link': f"http://localhost:5173/projects/{session.project.id}/sessions/{session.id}/",
+                'session_link': session_url(session.id),
             }
 
             html_content = render_to_string('emails/interest_notification_email.html', context)
             text_content = render_to_string('emails/interest_notification_email.txt', context)
 
-            email = EmailMultiAlternatives(
-                subject,
-                text_content,
-                settings.DEFAULT_FROM_EMAIL,
-                [session.project.owner.email]
-            )
-            email.attach_alternative(html_content, "text/html")
-            email.send()
+            queue_email(subject, text_content, html_content, [session.project.owner.email])
 
         except Exception as e:
-            raise Exception(f"Error sending interest notification email: {str(e)}")
+            raise Exception(f"Error queuing interest notification email: {str(e)}")
+
+
+    @staticmethod
+    def send_interest_digest_emails(interest_by_owner):
+        """Queues one summary per owner of the ``InterestedParticipant`` rows grouped under them."""
+        try:
+            html_template = get_template('emails/interest_digest_email.html')
+            text_template = get_template('emails/interest_digest_email.txt')
+
+            emails = []
+            for owner, interests in interest_by_owner.items():
+                sessions = {}
+                for interest in interests:
+                    session = interest.session
+                    sessions.setdefault(session.id, {
+                        'name': session.name,
+                        'link': session_url(session.id),
+                        'interested_users': [],
+                    })['interested_users'].append(interest.user.username)
+
+                subject = f"¡{len(interests)} nuevas muestras de interés en tus sesiones!"
+                context = {
+                    'owner_name': owner.username,
+                    'interest_count': len(interests),
+                    'sessions': list(sessions.values()),
+                }
+                emails.append((subject, text_template.render(context), html_template.render(context), [owner.email]))
+            return queue_emails(emails)
 
+        except Exception as e:
+            raise Exception(f"Error queuing interest digest emails: {str(e)}")
 
     @staticmethod
     def send_confirmation_email(session, developer):
@@ -72,20 +98,13 @@ class EmailService:
                 'session_name': session.name,
                 'session_description': session.description,
                 'session_date': session.schedule_date_time.strftime("%d-%m-%Y %H:%M"),
-                'session_link': f"http://localhost:5173/sessions/{session.id}/",
+                'session_link': session_url(session.id),
             }
 
             html_content = render_to_string('emails/confirmation_email.html', context)
             text_content = render_to_string('emails/confirmation_email.txt', context)
 
-            email = EmailMultiAlternatives(
-                subject,
-                text_content,
-                settings.DEFAULT_FROM_EMAIL,
-                [developer.email]
-            )
-            email.attach_alternative(html_content, "text/html")
-            email.send()
+            queue_email(subject, text_content, html_content, [developer.email])
 
         except Exception as e:
-            raise Exception(f"Error sending confirmation email: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Error queuing confirmation email: {str(e)}")
\ No newline at end of file
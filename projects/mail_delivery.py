@@ -0,0 +1,105 @@
+import logging
+import threading
+import time
+from smtplib import SMTPServerDisconnected
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+
+class MailDelivery:
+    """
+    Email connection kept open across the batches of one worker, so a burst of
+    emails pays for a single SMTP and TLS handshake. Messages are sent one at a
+    time over that connection and their results recorded one by one, so a
+    failure never causes an accepted message to be sent again. A connection the
+    server dropped is reopened once for the message it interrupted; other
+    errors are reported for that message only. Connections idle for longer than
+    ``EMAIL_CONNECTION_MAX_IDLE`` seconds are reopened, as servers drop them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._connection = None
+        self._last_used = 0.0
+
+    def send(self, messages, on_result=None):
+        """
+        Sends ``messages`` and returns ``(failures, seconds)``, failures mapping message
+        indexes to errors. ``on_result(index, error)`` is called as soon as each message
+        is accepted, with ``None``, or has failed.
+        """
+        started = time.perf_counter()
+        failures = {}
+        with self._lock:
+            for index, message in enumerate(messages):
+                try:
+                    connection = self._get_connection()
+                except Exception as e:
+                    logger.warning("Could not open an email connection: %s", e)
+                    for rest in range(index, len(messages)):
+                        failures[rest] = e
+                        if on_result:
+                            on_result(rest, e)
+                    break
+
+                try:
+                    self._send_message(connection, message)
+                except Exception as e:
+                    logger.warning("Email %d of %d failed: %s", index + 1, len(messages), e)
+                    failures[index] = e
+                self._last_used = time.monotonic()
+                if on_result:
+                    on_result(index, failures.get(index))
+
+        seconds = time.perf_counter() - started
+        logger.info("Delivered %d of %d emails in %.3fs", len(messages) - len(failures), len(messages), seconds)
+        return failures, seconds
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def _send_message(self, connection, message):
+        try:
+            connection.send_messages([message])
+        except SMTPServerDisconnected:
+            # The server hung up before accepting the message, so it is safe to send it again.
+            self._close()
+            try:
+                self._get_connection().send_messages([message])
+            except SMTPServerDisconnected:
+                self._close()
+                raise
+
+    def _get_connection(self):
+        if self._connection is not None and time.monotonic() - self._last_used > settings.EMAIL_CONNECTION_MAX_IDLE:
+            self._close()
+        if self._connection is None:
+            connection = get_connection()
+            connection.open()
+            self._connection = connection
+            self._last_used = time.monotonic()
+        return self._connection
+
+    def _close(self):
+        if self._connection is None:
+            return
+        try:
+            self._connection.close()
+        except Exception:
+            pass
+        self._connection = None
+
+
+mail_delivery = MailDelivery()
+
+
+@receiver(setting_changed)
+def reset_mail_delivery(setting, **kwargs):
+    if setting.startswith("EMAIL_"):
+        mail_delivery.close()
@@ -0,0 +1,43 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from projects.affinity import AffinityEngine
+from projects.models import Session
+
+
+class Command(BaseCommand):
+    help = "Precomputes suggested developers per upcoming session and suggested sessions per user."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--developers', type=int, default=5, help="Developers to keep per session.")
+        parser.add_argument('--sessions', type=int, default=10, help="Sessions to keep per user.")
+        parser.add_argument('--output', help="Write the recommendations to this JSON file instead of stdout.")
+
+    def handle(self, *args, **options):
+        started = timezone.now()
+        engine = AffinityEngine.load()
+        block = engine.load_sessions(Session.objects.filter(schedule_date_time__gte=started))
+
+        recommendations = {
+            "generated_at": started.isoformat(),
+            "developers_by_session": {
+                session_id: [user_id for user_id, _ in ranked]
+                for session_id, ranked in engine.top_developers(block, options['developers']).items()
+            },
+            "sessions_by_user": {
+                user_id: [session_id for session_id, _ in ranked]
+                for user_id, ranked in engine.top_sessions(block, options['sessions']).items()
+            },
+        }
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                json.dump(recommendations, output)
+            self.stdout.write(self.style.SUCCESS(
+                f"Wrote recommendations for {len(block)} sessions and "
+                f"{len(recommendations['sessions_by_user'])} users to {options['output']}."
+            ))
+        else:
+            self.stdout.write(json.dumps(recommendations))
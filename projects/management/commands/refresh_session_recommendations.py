@@ -0,0 +1,77 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+
+from projects.affinity import AffinityEngine
+from projects.models import PendingSessionRecommendation, Session
+from projects.services import SessionRecommendationService
+
+_engine = None
+_block = None
+
+
+def _init_worker(engine, block):
+    global _engine, _block
+    _engine, _block = engine, block
+
+
+def _rank_users(first_user, last_user, k):
+    return _engine.top_sessions(_block, k, first_user, last_user)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the stored top-K session recommendations of every user, or with --pending "
+        "merges only the sessions changed since into them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--k', type=int, default=10, help="Sessions to keep per user.")
+        parser.add_argument('--chunk-size', type=int, default=1000, help="Users ranked per task.")
+        parser.add_argument('--workers', type=int, default=1, help="Worker processes; 1 ranks in-process.")
+        parser.add_argument('--pending', action='store_true',
+                            help="Only merge the sessions changed since the last run into the stored lists.")
+
+    def handle(self, *args, **options):
+        if options['pending']:
+            sessions = SessionRecommendationService.refresh_pending(limit=options['k'])
+            self.stdout.write(self.style.SUCCESS(
+                f"Merged {sessions} changed sessions into the stored recommendations."
+            ))
+            return
+
+        started = timezone.now()
+        engine = AffinityEngine.load()
+        block = engine.load_sessions(Session.objects.filter(schedule_date_time__gte=timezone.now()))
+        chunks = [
+            (first_user, first_user + options['chunk_size'], options['k'])
+            for first_user in range(0, len(engine.user_ids), options['chunk_size'])
+        ]
+
+        if options['workers'] > 1:
+            # Forked workers must not share the parent's database connections.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                    max_workers=options['workers'], initializer=_init_worker, initargs=(engine, block)
+            ) as executor:
+                results = executor.map(_rank_users, *zip(*chunks)) if chunks else []
+                users = self._store(results, options['k'])
+        else:
+            _init_worker(engine, block)
+            users = self._store((_rank_users(*chunk) for chunk in chunks), options['k'])
+        # Changes made before the engine was loaded are part of the lists just stored.
+        PendingSessionRecommendation.objects.filter(requested_at__lte=started).delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored session recommendations for {users} users across {len(block)} upcoming sessions."
+        ))
+
+    @staticmethod
+    def _store(results, k):
+        users = 0
+        for recommendations in results:
+            SessionRecommendationService.store_many(recommendations, limit=k)
+            users += len(recommendations)
+        return users
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from projects.services import InterestDigestService
+
+
+class Command(BaseCommand):
+    help = "Queues one summary email per project owner of the interest expressed in their sessions."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=int, default=None,
+                            help="Minutes interest is collected before it is summarized (INTEREST_DIGEST_WINDOW).")
+
+    def handle(self, *args, **options):
+        owners = InterestDigestService(window=options['window']).send_digests()
+        self.stdout.write(self.style.SUCCESS(f"Queued interest digests for {owners} owners."))
@@ -0,0 +1,37 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from projects.mail_delivery import mail_delivery
+from projects.outbox import drain
+
+
+class Command(BaseCommand):
+    help = "Delivers the emails waiting in the outbox, retrying failures with exponential backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+                            help="Outbox rows claimed per delivery pass.")
+        parser.add_argument('--loop', action='store_true', help="Keep polling the outbox instead of exiting.")
+        parser.add_argument('--interval', type=float, default=5, help="Seconds between polls with --loop.")
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                totals = drain(options['batch_size'])
+                if totals['sent'] or totals['failed'] or not options['loop']:
+                    self.report(totals)
+                if not options['loop']:
+                    return
+                time.sleep(options['interval'])
+        finally:
+            mail_delivery.close()
+
+    def report(self, totals):
+        batches = totals['batch_seconds']
+        timing = ""
+        if batches:
+            timing = (f" in {len(batches)} batches (avg {sum(batches) / len(batches) * 1000:.1f}ms, "
+                      f"max {max(batches) * 1000:.1f}ms)")
+        self.stdout.write(self.style.SUCCESS(f"Sent {totals['sent']} emails, {totals['failed']} failed{timing}."))
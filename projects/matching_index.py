@@ -0,0 +1,112 @@
+import heapq
+import threading
+
+from skills.versions import DEVELOPER_PROFILES, REFERENCE_DATA, get_versions
+from users.models import CustomUser
+
+
+STACK_COMPATIBILITY = {
+    'Fullstack': ['Fullstack', 'Frontend', 'Backend'],
+    'Frontend': ['Frontend', 'Fullstack'],
+    'Backend': ['Backend', 'Fullstack'],
+}
+
+
+class DeveloperMatchingIndex:
+    """
+    Process-local inverted index of developers used by DeveloperSuggestionService.
+
+    Each posting list maps a skill value (stack name, level name or language name)
+    to the set of user ids that have it, so the tiered lookup becomes a handful of
+    set intersections instead of three multi-join queries. The index remembers the
+    shared developer profile and skills versions it was built from and is rebuilt
+    by whichever worker next notices that one of them moved.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._version = None
+        self._entries = {}
+        self._by_stack = {}
+        self._by_level = {}
+        self._by_language = {}
+
+    @property
+    def is_built(self):
+        return self._built
+
+    def build(self, version=None):
+        """Loads every non-staff developer with a stack into the index."""
+        version = version or get_versions(DEVELOPER_PROFILES, REFERENCE_DATA)
+        rows = CustomUser.objects.filter(
+            is_staff=False, stack__isnull=False
+        ).values_list('id', 'stack__name', 'level__name')
+
+        languages = {}
+        for user_id, language_name in CustomUser.prog_language.through.objects.filter(
+                customuser__is_staff=False, customuser__stack__isnull=False
+        ).values_list('customuser_id', 'proglanguage__name'):
+            languages.setdefault(user_id, set()).add(language_name)
+
+        with self._lock:
+            self._entries = {}
+            self._by_stack = {}
+            self._by_level = {}
+            self._by_language = {}
+            for user_id, stack_name, level_name in rows:
+                self._add(user_id, stack_name, level_name, frozenset(languages.get(user_id, ())))
+            self._built = True
+            self._version = version
+
+    def invalidate(self):
+        with self._lock:
+            self._built = False
+
+    def suggest(self, session_stack_name, session_level_name, session_language_names,
+                excluded_user_ids=(), limit=5):
+        """
+        Returns up to ``limit`` user ids ordered by match tier:
+        stack + level + language, then stack + language, then stack only.
+        """
+        version = get_versions(DEVELOPER_PROFILES, REFERENCE_DATA)
+        if not self._built or self._version != version:
+            self.build(version)
+
+        with self._lock:
+            compatible_stacks = STACK_COMPATIBILITY.get(session_stack_name)
+            if compatible_stacks is None:
+                stack_ids = set(self._entries)
+            else:
+                stack_ids = set()
+                for stack_name in compatible_stacks:
+                    stack_ids |= self._by_stack.get(stack_name, set())
+            stack_ids -= set(excluded_user_ids)
+
+            if session_language_names:
+                language_ids = set()
+                for language_name in session_language_names:
+                    language_ids |= self._by_language.get(language_name, set())
+            else:
+                language_ids = {user_id for user_id, entry in self._entries.items() if entry[2]}
+
+            phase2_ids = stack_ids & language_ids
+            phase1_ids = phase2_ids & self._by_level.get(session_level_name, set())
+
+            suggested = []
+            for tier_ids in (phase1_ids, phase2_ids - phase1_ids, stack_ids - phase2_ids):
+                if len(suggested) >= limit:
+                    break
+                suggested.extend(heapq.nsmallest(limit - len(suggested), tier_ids))
+
+            return suggested
+
+    def _add(self, user_id, stack_name, level_name, language_names):
+        self._entries[user_id] = (stack_name, level_name, language_names)
+        self._by_stack.setdefault(stack_name, set()).add(user_id)
+        self._by_level.setdefault(level_name, set()).add(user_id)
+        for language_name in language_names:
+            self._by_language.setdefault(language_name, set()).add(user_id)
+
+
+developer_index = DeveloperMatchingIndex()
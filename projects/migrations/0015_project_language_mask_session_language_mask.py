@@ -0,0 +1,36 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:15
+
+from django.db import migrations, models
+
+LANGUAGE_MASK_BITS = 63
+
+
+def backfill_language_masks(apps, schema_editor):
+    for model_name, relation_field in (('Project', 'project_id'), ('Session', 'session_id')):
+        model = apps.get_model('projects', model_name)
+        masks = {}
+        for owner_id, language_id in model.languages.through.objects.values_list(relation_field, 'proglanguage_id'):
+            masks[owner_id] = masks.get(owner_id, 0) | (1 << ((language_id - 1) % LANGUAGE_MASK_BITS))
+        for owner_id, mask in masks.items():
+            model.objects.filter(pk=owner_id).update(language_mask=mask)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0014_merge_20241007_2008'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='language_mask',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='language_mask',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_language_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0016_sessionrecommendation'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='interestedparticipant',
+            name='date_created_interested',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='project',
+            name='date_created',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='session',
+            name='schedule_date_time',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
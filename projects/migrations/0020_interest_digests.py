@@ -0,0 +1,31 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_existing_interest_notified(apps, schema_editor):
+    # Owners were already emailed about every interest recorded before digests existed.
+    InterestedParticipant = apps.get_model('projects', 'InterestedParticipant')
+    InterestedParticipant.objects.update(owner_notified_at=models.F('date_created_interested'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0019_outboundemail'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interestedparticipant',
+            name='owner_notified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_existing_interest_notified, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='interestedparticipant',
+            index=models.Index(condition=models.Q(('owner_notified_at__isnull', True)), fields=['date_created_interested'], name='interest_digest_pending'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0020_interest_digests'),
+        ('users', '0007_customuser_language_mask'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionRecommendationList',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='session_recommendation_list', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('date_computed', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:53
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0021_sessionrecommendationlist'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingSessionRecommendation',
+            fields=[
+                ('session', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='pending_recommendation', serialize=False, to='projects.session')),
+                ('requested_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
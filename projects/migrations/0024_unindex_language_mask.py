@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-18 21:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0023_outboundemail_sending'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='language_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='session',
+            name='language_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from datetime import timedelta
 from cloudinary.models import CloudinaryField
 from django.db import models
+from django.db.models import Prefetch
+from django.utils import timezone
 from skills.models import Stack, ProgLanguage, Level
 from django.contrib.auth import get_user_model
 
@@ -12,10 +14,12 @@ class Project(models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(null=True, blank=True)
     image = CloudinaryField('image', null=True, blank=True, default="https://res.cloudinary.com/dwzqcmaod/image/upload/v1728120693/neon2_r6qoo1.png")
-    date_created = models.DateTimeField(auto_now_add=True)
+    date_created = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
     active = models.BooleanField(default=False)
     stack = models.ForeignKey(Stack, on_delete=models.CASCADE)
     languages = models.ManyToManyField(ProgLanguage)
+    language_mask = models.BigIntegerField(default=0, editable=False)
     level = models.ForeignKey(Level, on_delete=models.CASCADE)
 
     def image_url(self):
@@ -25,21 +29,76 @@ class Project(models.Model):
         return self.name
 
 
+SESSION_LIST_RELATED = ('host', 'project', 'stack', 'level')
+SESSION_RELATION_FIELDS = {
+    'host': ('owner_name', 'owner_avatar_url'),
+    'project': ('project_id', 'project_name', 'project_image_url'),
+    'stack': ('stack_name',),
+    'level': ('level_name',),
+}
+
+
+def session_list_prefetches(prefix='', participants=True):
+    """
+    Prefetches needed to serialize sessions reached through ``prefix`` without N+1
+    queries. Only participant ids are loaded when ``participants`` is False.
+    """
+    if participants:
+        participant_queryset = User.objects.select_related('stack', 'level').prefetch_related('prog_language')
+    else:
+        participant_queryset = User.objects.only('id')
+
+    return [
+        f'{prefix}languages',
+        Prefetch(f'{prefix}participants', queryset=participant_queryset),
+    ]
+
+
+class SessionQuerySet(models.QuerySet):
+    def with_list_relations(self, participants=True, fields=None):
+        """
+        Shared query plan of every endpoint that serializes sessions with
+        SessionSerializer. Relations only needed by fields missing from ``fields``
+        (a container of serialized field names, all fields by default) are skipped.
+        """
+        if fields is None:
+            return self.select_related(*SESSION_LIST_RELATED).prefetch_related(
+                *session_list_prefetches(participants=participants)
+            )
+
+        related = [
+            relation for relation in SESSION_LIST_RELATED
+            if any(field in fields for field in SESSION_RELATION_FIELDS[relation])
+        ]
+        languages, participant_prefetch = session_list_prefetches(participants=participants)
+        prefetches = []
+        if 'language_names' in fields:
+            prefetches.append(languages)
+        if 'participants' in fields:
+            prefetches.append(participant_prefetch)
+        queryset = self.select_related(*related) if related else self
+        return queryset.prefetch_related(*prefetches)
+
+
 class Session(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='sessions')
     name = models.CharField(max_length=255, default="Default Session Name")
     host = models.ForeignKey('users.CustomUser', on_delete=models.SET_NULL, null=True)
     description = models.TextField(null=True, blank=True)
-    schedule_date_time = models.DateTimeField()
+    schedule_date_time = models.DateTimeField(db_index=True)
     duration = models.DurationField(default=timedelta(hours=2))
     stack = models.ForeignKey(Stack, on_delete=models.SET_NULL, null=True, blank=True)
     level = models.ForeignKey(Level, on_delete=models.SET_NULL, null=True, blank=True)
     languages = models.ManyToManyField(ProgLanguage, blank=True)
+    language_mask = models.BigIntegerField(default=0, editable=False)
     session_link = models.URLField(max_length=255, null=True, blank=True)
     participant_limit = models.IntegerField(default=0)
     active = models.BooleanField(default=True)
     public = models.BooleanField(default=True)
     participants = models.ManyToManyField(User, related_name='sessions_joined', blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = SessionQuerySet.as_manager()
 
     def __str__(self):
         return f"Session: {self.description}"
@@ -48,8 +107,99 @@ class Session(models.Model):
 class InterestedParticipant(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     session = models.ForeignKey(Session, on_delete=models.CASCADE)
-    date_created_interested = models.DateTimeField(auto_now_add=True)
+    date_created_interested = models.DateTimeField(auto_now_add=True, db_index=True)
+    owner_notified_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['date_created_interested'], condition=models.Q(owner_notified_at__isnull=True),
+                name='interest_digest_pending',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} is interested in session {self.session.id}"
 
+
+
+class SessionRecommendation(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='session_recommendations')
+    session = models.ForeignKey(Session, on_delete=models.CASCADE, related_name='recommendations')
+    rank = models.PositiveSmallIntegerField()
+    score = models.IntegerField()
+    date_computed = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['user', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'rank'], name='unique_session_recommendation_rank'),
+        ]
+
+    def __str__(self):
+        return f"Session {self.session_id} recommended to {self.user_id} (#{self.rank})"
+
+
+class SessionRecommendationList(models.Model):
+    """
+    Marks the stored recommendations of a user as computed, including an empty
+    list. A full list expires when its earliest session starts, as the session
+    ranked just below the list may then belong to it.
+    """
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name='session_recommendation_list'
+    )
+    expires_at = models.DateTimeField(null=True, blank=True)
+    date_computed = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Session recommendations of {self.user_id}"
+
+
+class PendingSessionRecommendation(models.Model):
+    """
+    Session changed since it was last merged into the stored recommendations.
+    Rows are written by signals and merged by ``refresh_session_recommendations --pending``.
+    """
+    session = models.OneToOneField(
+        Session, on_delete=models.CASCADE, primary_key=True, related_name='pending_recommendation'
+    )
+    requested_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Recommendations pending for session {self.session_id}"
+
+
+class OutboundEmail(models.Model):
+    """
+    Email waiting in the outbox. Rows are written in the transaction of the change
+    they announce and delivered by the ``send_outbound_emails`` worker. While a
+    worker sends a row it is ``sending`` and ``next_attempt_at`` holds the end of
+    its lease, after which another worker may claim it again.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        SENDING = 'sending', 'Sending'
+        SENT = 'sent', 'Sent'
+        DEAD = 'dead', 'Dead'
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254, null=True, blank=True)
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    date_created = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbound_email_due'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {', '.join(self.to)} ({self.status})"
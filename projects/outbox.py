@@ -0,0 +1,127 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .mail_delivery import mail_delivery
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def outbound_email(subject, text_content, html_content, recipients):
+    return OutboundEmail(
+        subject=subject,
+        body=text_content,
+        html_body=html_content or "",
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=list(recipients),
+    )
+
+
+def queue_email(subject, text_content, html_content, recipients):
+    """
+    Writes an email to the outbox. Called inside the caller's transaction, so the
+    email is only delivered if the change it announces is committed.
+    """
+    email = outbound_email(subject, text_content, html_content, recipients)
+    email.save()
+    return email
+
+
+def queue_emails(emails):
+    """Writes ``(subject, text_content, html_content, recipients)`` tuples to the outbox in one insert."""
+    return OutboundEmail.objects.bulk_create([outbound_email(*email) for email in emails])
+
+
+def retry_delay(attempts):
+    """Exponential backoff after the given number of failed attempts."""
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_RETRY_DELAY))
+
+
+def build_message(email):
+    message = EmailMultiAlternatives(email.subject, email.body, email.from_email, email.to)
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
+
+
+def mark_failed(email, error, now):
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboundEmail.Status.DEAD
+        logger.error("Outbound email %s is dead after %d attempts: %s", email.pk, email.attempts, error)
+    else:
+        email.status = OutboundEmail.Status.PENDING
+        email.next_attempt_at = now + retry_delay(email.attempts)
+    email.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
+
+
+def mark_sent(email):
+    email.status = OutboundEmail.Status.SENT
+    email.sent_at = timezone.now()
+    email.save(update_fields=["status", "sent_at"])
+
+
+def claim_batch(batch_size, now):
+    """
+    Leases up to ``batch_size`` due emails to this worker in a short transaction,
+    locking rows with SKIP LOCKED so several workers can claim side by side. Rows
+    whose lease expired, as their worker died mid-batch, are claimed again.
+    """
+    with transaction.atomic():
+        emails = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=OutboundEmail.Status.PENDING) | Q(status=OutboundEmail.Status.SENDING),
+                next_attempt_at__lte=now,
+            )
+            .order_by("next_attempt_at", "id")[:batch_size]
+        )
+        OutboundEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            status=OutboundEmail.Status.SENDING,
+            next_attempt_at=now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE),
+        )
+    return emails
+
+
+def deliver_batch(batch_size=None):
+    """
+    Claims up to ``batch_size`` due emails, sends them over the worker's pooled
+    connection outside of any transaction and returns ``{"sent", "failed", "seconds"}``.
+    The result of each email is saved as soon as the server answers, so an error
+    later in the batch never puts an accepted email back in the outbox.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    now = timezone.now()
+
+    emails = claim_batch(batch_size, now)
+    if not emails:
+        return {"sent": 0, "failed": 0, "seconds": 0.0}
+
+    def record(index, error):
+        if error is None:
+            mark_sent(emails[index])
+        else:
+            mark_failed(emails[index], error, now)
+
+    failures, seconds = mail_delivery.send([build_message(email) for email in emails], on_result=record)
+    return {"sent": len(emails) - len(failures), "failed": len(failures), "seconds": seconds}
+
+
+def drain(batch_size=None):
+    """Delivers batches until no due email is left and returns the totals with the time spent per batch."""
+    totals = {"sent": 0, "failed": 0, "batch_seconds": []}
+    while True:
+        report = deliver_batch(batch_size)
+        if not report["sent"] and not report["failed"]:
+            return totals
+        totals["sent"] += report["sent"]
+        totals["failed"] += report["failed"]
+        totals["batch_seconds"].append(report["seconds"])
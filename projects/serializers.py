@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from pair_connect.fieldsets import SparseFieldsetMixin
+from pair_connect.images import upload_url
 from skills.models import Level, ProgLanguage, Stack
 from users.models import CustomUser
 from users.serializers import CustomUserSerializer
@@ -7,7 +9,25 @@ from users.serializers import CustomUserSerializer
 from .models import InterestedParticipant, Project, Session
 
 
-class SessionSerializer(serializers.ModelSerializer):
+def get_expanded_fields(request):
+    """
+    Returns the field paths requested with ``?expand=sessions,sessions.participants``.
+    Expanding a nested path also expands its parents.
+    """
+    if request is None:
+        return set()
+
+    expanded = set()
+    for path in request.query_params.get("expand", "").split(","):
+        parts = [part.strip() for part in path.split(".")]
+        if not all(parts):
+            continue
+        for depth in range(1, len(parts) + 1):
+            expanded.add(".".join(parts[:depth]))
+    return expanded
+
+
+class SessionSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     name = serializers.CharField(max_length=255)
     owner_id = serializers.PrimaryKeyRelatedField(source="host", read_only=True)
     owner_name = serializers.CharField(source="host.username", read_only=True)
@@ -69,6 +89,11 @@ class SessionSerializer(serializers.ModelSerializer):
             "public",
         ]
 
+    def __init__(self, *args, expand_participants=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not expand_participants and "participants" in self.fields:
+            self.fields["participants"] = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
+
     def validate_languages(self, value):
         project_id = self.initial_data.get("project")
         try:
@@ -106,13 +131,13 @@ class SessionSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation["is_private"] = not instance.public
+        if "is_private" in self.fieldset:
+            representation["is_private"] = not instance.public
         return representation
 
     def get_project_image_url(self, obj):
         if obj.project and obj.project.image:
-            base_url = "https://res.cloudinary.com/dwzqcmaod/image/upload/"
-            return f"{base_url}{obj.project.image}"
+            return upload_url(obj.project.image)
         return None
 
 
@@ -145,7 +170,7 @@ class SessionParticipantSerializer(serializers.ModelSerializer):
         fields = ["participants"]
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     owner_name = serializers.CharField(source="owner.username", read_only=True)
     owner_id = serializers.PrimaryKeyRelatedField(source="owner", read_only=True)
     owner_avatar_url = serializers.SerializerMethodField()
@@ -164,7 +189,7 @@ class ProjectSerializer(serializers.ModelSerializer):
         queryset=Level.objects.all(), write_only=True
     )
     level_name = serializers.CharField(source="level.name", read_only=True)
-    sessions = SessionSerializer(many=True, read_only=True)
+    sessions = serializers.PrimaryKeyRelatedField(many=True, read_only=True)
 
     class Meta:
         model = Project
@@ -186,6 +211,14 @@ class ProjectSerializer(serializers.ModelSerializer):
             "sessions",
         ]
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        expanded = get_expanded_fields(self.context.get("request"))
+        if "sessions" in expanded and "sessions" in self.fields:
+            self.fields["sessions"] = SessionSerializer(
+                many=True, read_only=True, expand_participants="sessions.participants" in expanded
+            )
+
     def create(self, validated_data):
         languages_data = validated_data.pop("languages")
         project = Project.objects.create(
@@ -220,8 +253,7 @@ class ProjectSerializer(serializers.ModelSerializer):
 
     def get_owner_avatar_url(self, obj):
         if obj.owner and obj.owner.photo:
-            base_url = "https://res.cloudinary.com/dwzqcmaod/image/upload/"
-            return f"{base_url}{obj.owner.photo}"
+            return upload_url(obj.owner.photo)
         return None
 
 
@@ -1,9 +1,55 @@
-from django.db.models import Q, Case, When, IntegerField
+import base64
+import heapq
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, Case, Count, Exists, F, IntegerField, Min, OuterRef, Subquery, Value, When
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError, PermissionDenied
+from skills.masks import filter_shared_languages
 from users.models import CustomUser
 from .email_service import EmailService
-from projects.models import Session, Project, InterestedParticipant
+from .matching_index import STACK_COMPATIBILITY, developer_index
+from projects.models import (
+    SESSION_LIST_RELATED, Session, Project, InterestedParticipant, PendingSessionRecommendation, SessionRecommendation,
+    SessionRecommendationList, session_list_prefetches
+)
+
+RANKING_TIER = 'tier'
+RANKING_SCORE = 'score'
+RANKING_MODES = (RANKING_TIER, RANKING_SCORE)
+
+LEVEL_RANKS = {
+    'Junior': 0,
+    'Mid': 1,
+    'Senior': 2,
+}
+MAX_LEVEL_DISTANCE = len(LEVEL_RANKS)
+LANGUAGE_OVERLAP_WEIGHT = 2
+
+
+def level_distance(level, field='level'):
+    """
+    Builds a SQL expression measuring how far ``field`` is from ``level``:
+    0 for the same level, the rank gap for known levels, MAX_LEVEL_DISTANCE otherwise.
+    """
+    if level is None:
+        return Case(
+            When(**{f'{field}__isnull': True}, then=Value(0)),
+            default=Value(MAX_LEVEL_DISTANCE),
+            output_field=IntegerField()
+        )
+
+    whens = [When(**{field: level.pk}, then=Value(0))]
+    rank = LEVEL_RANKS.get(level.name)
+    if rank is not None:
+        whens += [
+            When(**{f'{field}__name': name}, then=Value(abs(rank - other_rank)))
+            for name, other_rank in LEVEL_RANKS.items()
+        ]
+    return Case(*whens, default=Value(MAX_LEVEL_DISTANCE), output_field=IntegerField())
 
 
 class SessionService:
@@ -32,82 +78,38 @@ class SessionService:
             raise ValidationError(f"Error validating or assigning stack: {e}")
 
 
+def encode_session_cursor(session):
+    position = [session.priority, session.schedule_date_time.isoformat(), session.id]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_session_cursor(cursor):
+    try:
+        priority, schedule_date_time, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(priority), datetime.fromisoformat(schedule_date_time), int(session_id)
+    except (TypeError, ValueError):
+        raise ValidationError("Invalid cursor.")
+
+
 class DeveloperSuggestionService:
-    def __init__(self, session):
+    SUGGESTION_LIMIT = 5
+
+    def __init__(self, session, ranking=RANKING_TIER):
         self.session = session
+        self.ranking = ranking
 
     def get_suggested_developers(self):
         try:
-            session_stack_name = self.session.stack.name
-            session_level_name = self.session.level.name if self.session.level else None
-            session_language_names = list(self.session.languages.values_list('name', flat=True))
-
-            interested_user_ids = InterestedParticipant.objects.filter(session=self.session).values_list('user_id',
-                                                                                                         flat=True)
-            participant_user_ids = self.session.participants.values_list('id', flat=True)
-
-            host_user = self.session.host
-            host_user_id = host_user.id if host_user else None
-
-            excluded_user_ids = list(interested_user_ids) + list(participant_user_ids)
-            if host_user_id:
-                excluded_user_ids.append(host_user_id)
-
-            stack_filter = Q()
-            if session_stack_name == 'Fullstack':
-                stack_filter = Q(stack__name='Fullstack') | Q(stack__name='Frontend') | Q(stack__name='Backend')
-            elif session_stack_name == 'Frontend':
-                stack_filter = Q(stack__name='Frontend') | Q(stack__name='Fullstack')
-            elif session_stack_name == 'Backend':
-                stack_filter = Q(stack__name='Backend') | Q(stack__name='Fullstack')
-
-            if session_stack_name == 'Frontend':
-                stack_filter &= ~Q(stack__name='Backend')
-            elif session_stack_name == 'Backend':
-                stack_filter &= ~Q(stack__name='Frontend')
-
-            language_filter = Q()
-            for language_name in session_language_names:
-                language_filter |= Q(prog_language__name=language_name)
-
-            phase1_users = CustomUser.objects.exclude(
-                id__in=excluded_user_ids
-            ).filter(
-                stack_filter,
-                level__name=session_level_name,
-                is_staff=False,
-                prog_language__isnull=False,
-                stack__isnull=False
-            ).filter(language_filter).distinct()
-
-            if phase1_users.count() >= 5:
-                return phase1_users
-
-            phase2_users = CustomUser.objects.exclude(
-                id__in=excluded_user_ids
-            ).filter(
-                stack_filter,
-                is_staff=False,
-                prog_language__isnull=False,
-                stack__isnull=False
-            ).filter(language_filter).distinct()
-
-            combined_users = list(phase1_users) + [user for user in phase2_users if user not in phase1_users]
-
-            if len(combined_users) >= 5:
-                return combined_users[:5]
-
-            phase3_users = CustomUser.objects.exclude(
-                id__in=excluded_user_ids
-            ).filter(
-                stack_filter,
-                is_staff=False,
-                stack__isnull=False
-            ).distinct()
-
-            final_users = combined_users + [user for user in phase3_users if user not in combined_users]
-
-            return final_users[:5]
+            if self.ranking == RANKING_SCORE:
+                return self.get_scored_developers()[:self.SUGGESTION_LIMIT]
+
+            if settings.AFFINITY_ENGINE_ENABLED:
+                return self.get_engine_suggested_developers()
+
+            if settings.DEVELOPER_MATCHING_INDEX_ENABLED:
+                return self.get_indexed_suggested_developers()
+
+            return self.get_ranked_developers()[:self.SUGGESTION_LIMIT]
 
         except CustomUser.DoesNotExist:
             raise ValidationError("No developers found matching the criteria.")
@@ -116,6 +118,169 @@ class DeveloperSuggestionService:
         except Exception as e:
             raise ValidationError(f"An unexpected error occurred: {str(e)}")
 
+    def get_candidate_developers(self):
+        """Non-staff developers with a compatible stack who are not already tied to the session."""
+        developers = CustomUser.objects.filter(
+            is_staff=False,
+            stack__isnull=False,
+        ).exclude(
+            Exists(InterestedParticipant.objects.filter(session_id=self.session.id, user_id=OuterRef('pk')))
+        ).exclude(
+            Exists(Session.participants.through.objects.filter(session_id=self.session.id,
+                                                               customuser_id=OuterRef('pk')))
+        )
+
+        if self.session.host_id:
+            developers = developers.exclude(pk=self.session.host_id)
+
+        compatible_stacks = STACK_COMPATIBILITY.get(self.session.stack.name)
+        if compatible_stacks is not None:
+            developers = developers.filter(stack__name__in=compatible_stacks)
+
+        return developers
+
+    def get_ranked_developers(self):
+        """
+        Annotates every eligible developer with a match tier in a single query:
+        1 = level + language + stack, 2 = language + stack, 3 = stack only.
+        """
+        developers = self.get_candidate_developers()
+        if self.session.language_mask:
+            developers = developers.alias(
+                shared_language_bits=F('language_mask').bitand(self.session.language_mask)
+            )
+            language_match = ~Q(shared_language_bits=0)
+        else:
+            language_match = ~Q(language_mask=0)
+
+        level_name = self.session.level.name if self.session.level else None
+
+        return developers.annotate(
+            match_tier=Case(
+                When(language_match & Q(level__name=level_name), then=1),
+                When(language_match, then=2),
+                default=3,
+                output_field=IntegerField()
+            )
+        ).order_by('match_tier', 'id')
+
+    def get_scored_developers(self):
+        """
+        Orders eligible developers by the number of languages they share with the
+        session, penalised by their level distance. Everything is computed in SQL.
+        """
+        session_language_ids = Session.languages.through.objects.filter(
+            session_id=self.session.id
+        ).values('proglanguage_id')
+
+        return self.get_candidate_developers().annotate(
+            shared_languages=Count(
+                'prog_language', filter=Q(prog_language__in=Subquery(session_language_ids)), distinct=True
+            ),
+            level_distance=level_distance(self.session.level),
+        ).annotate(
+            match_score=F('shared_languages') * LANGUAGE_OVERLAP_WEIGHT - F('level_distance')
+        ).order_by('-match_score', 'id')
+
+    def get_excluded_user_ids(self):
+        excluded_user_ids = set(
+            InterestedParticipant.objects.filter(session=self.session).values_list('user_id', flat=True)
+        )
+        excluded_user_ids.update(self.session.participants.values_list('id', flat=True))
+        if self.session.host_id:
+            excluded_user_ids.add(self.session.host_id)
+        return excluded_user_ids
+
+    def get_indexed_suggested_developers(self):
+        suggested_ids = developer_index.suggest(
+            self.session.stack.name,
+            self.session.level.name if self.session.level else None,
+            list(self.session.languages.values_list('name', flat=True)),
+            self.get_excluded_user_ids(),
+            limit=self.SUGGESTION_LIMIT,
+        )
+        users = CustomUser.objects.in_bulk(suggested_ids)
+        return [users[user_id] for user_id in suggested_ids if user_id in users]
+
+    def get_engine_suggested_developers(self):
+        # Imported here so NumPy is only loaded by processes that enable the engine.
+        from .affinity import get_affinity_engine
+
+        suggested_ids = get_affinity_engine().top_developers_for_session(
+            self.session, self.get_excluded_user_ids(), k=self.SUGGESTION_LIMIT
+        )
+        users = CustomUser.objects.in_bulk(suggested_ids)
+        return [users[user_id] for user_id in suggested_ids if user_id in users]
+
+
+class BatchDeveloperSuggestionService:
+    """
+    Suggests developers for several sessions at once. The candidate pool and the
+    exclusions are fetched once and every session is scored against them in Python,
+    using the same tiers as DeveloperSuggestionService.get_ranked_developers.
+    """
+    MAX_SESSIONS = 50
+    MAX_LIMIT = DeveloperSuggestionService.SUGGESTION_LIMIT
+
+    def __init__(self, sessions, limit=DeveloperSuggestionService.SUGGESTION_LIMIT):
+        self.sessions = sessions
+        self.limit = limit
+
+    def get_suggested_developer_ids(self):
+        session_ids = [session.id for session in self.sessions]
+
+        excluded_user_ids = {session.id: set() for session in self.sessions}
+        for session in self.sessions:
+            if session.host_id:
+                excluded_user_ids[session.id].add(session.host_id)
+        for session_id, user_id in InterestedParticipant.objects.filter(
+                session_id__in=session_ids).values_list('session_id', 'user_id'):
+            excluded_user_ids[session_id].add(user_id)
+        for session_id, user_id in Session.participants.through.objects.filter(
+                session_id__in=session_ids).values_list('session_id', 'customuser_id'):
+            excluded_user_ids[session_id].add(user_id)
+
+        candidates = list(CustomUser.objects.filter(
+            is_staff=False, stack__isnull=False
+        ).values_list('id', 'stack__name', 'level__name', 'language_mask'))
+
+        session_specs = [
+            (
+                session.id,
+                STACK_COMPATIBILITY.get(session.stack.name),
+                session.level.name if session.level else None,
+                session.language_mask,
+                excluded_user_ids[session.id],
+            )
+            for session in self.sessions
+        ]
+
+        # Bounded max-heaps of (-tier, -user_id) so each session keeps only its best ``limit`` candidates.
+        heaps = {session.id: [] for session in self.sessions}
+        for user_id, stack_name, user_level_name, user_mask in candidates:
+            for session_id, compatible_stacks, level_name, session_mask, excluded in session_specs:
+                if user_id in excluded or (compatible_stacks is not None and stack_name not in compatible_stacks):
+                    continue
+
+                language_match = bool(user_mask & session_mask) if session_mask else bool(user_mask)
+                if language_match and user_level_name == level_name:
+                    tier = 1
+                elif language_match:
+                    tier = 2
+                else:
+                    tier = 3
+
+                heap = heaps[session_id]
+                if len(heap) < self.limit:
+                    heapq.heappush(heap, (-tier, -user_id))
+                elif (-tier, -user_id) > heap[0]:
+                    heapq.heapreplace(heap, (-tier, -user_id))
+
+        return {
+            session_id: [-negated_id for _, negated_id in sorted(heap, reverse=True)]
+            for session_id, heap in heaps.items()
+        }
+
 
 class InvitationService:
     def __init__(self, session, developer):
@@ -129,18 +294,122 @@ class InvitationService:
             raise ValidationError(f"Failed to send invitation: {str(e)}")
 
 
+class BulkInvitationService:
+    """
+    Invites several developers to a session at once: the developers are loaded in
+    one query and every invitation is queued in a single outbox insert.
+    """
+    MAX_DEVELOPERS = 50
+
+    INVITED = "invited"
+    NOT_FOUND = "not_found"
+    ALREADY_PARTICIPANT = "already_participant"
+
+    def __init__(self, session, developer_ids):
+        self.session = session
+        self.developer_ids = list(dict.fromkeys(int(developer_id) for developer_id in developer_ids))
+
+    def send_invitations(self):
+        """Returns the outcome of each requested developer, in request order."""
+        if not self.developer_ids:
+            raise ValidationError("developer_ids must be a non-empty list.")
+        if len(self.developer_ids) > self.MAX_DEVELOPERS:
+            raise ValidationError(f"At most {self.MAX_DEVELOPERS} developers can be invited at once.")
+
+        developers = {
+            developer.id: developer
+            for developer in CustomUser.objects.filter(id__in=self.developer_ids).only(
+                "id", "username", "email"
+            ).annotate(is_participant=Exists(
+                Session.participants.through.objects.filter(session_id=self.session.id, customuser_id=OuterRef("pk"))
+            ))
+        }
+        invited = [
+            developers[developer_id] for developer_id in self.developer_ids
+            if developer_id in developers and not developers[developer_id].is_participant
+        ]
+
+        if invited:
+            try:
+                with transaction.atomic():
+                    EmailService.send_invite_emails(self.session, invited)
+            except Exception as e:
+                raise ValidationError(f"Failed to send invitations: {str(e)}")
+
+        return [
+            {"developer_id": developer_id, "status": self.get_status(developers.get(developer_id))}
+            for developer_id in self.developer_ids
+        ]
+
+    def get_status(self, developer):
+        if developer is None:
+            return self.NOT_FOUND
+        if developer.is_participant:
+            return self.ALREADY_PARTICIPANT
+        return self.INVITED
+
+
 class InterestNotificationService:
     def __init__(self, session, interested_user):
         self.session = session
         self.interested_user = interested_user
 
     def send_notification(self):
+        if settings.INTEREST_DIGEST_ENABLED:
+            # The interest stays pending until InterestDigestService summarizes it.
+            return
+
         try:
             EmailService.send_interest_notification_email(self.session, self.interested_user)
+            InterestedParticipant.objects.filter(
+                session=self.session, user=self.interested_user, owner_notified_at__isnull=True
+            ).update(owner_notified_at=timezone.now())
         except Exception as e:
             raise ValidationError(f"Failed to send interest notification: {str(e)}")
 
 
+class InterestDigestService:
+    """
+    Emails each project owner one summary of the interest expressed in their
+    sessions since they were last notified. An owner is due once their oldest
+    pending interest is older than the digest window, so bursts of interest
+    coalesce into a single email.
+    """
+
+    def __init__(self, window=None, now=None):
+        self.window = timedelta(minutes=settings.INTEREST_DIGEST_WINDOW if window is None else window)
+        self.now = now or timezone.now()
+
+    def get_pending_interest_by_owner(self):
+        """Pending interest of the due owners, grouped by owner, in a single query."""
+        pending = InterestedParticipant.objects.filter(
+            owner_notified_at__isnull=True, session__project__owner__isnull=False
+        )
+        due_owners = pending.values("session__project__owner").annotate(
+            first_interest=Min("date_created_interested")
+        ).filter(first_interest__lte=self.now - self.window).values("session__project__owner")
+
+        interest_by_owner = {}
+        for interest in pending.filter(session__project__owner__in=due_owners).select_related(
+            "user", "session__project__owner"
+        ).order_by("session__project__owner", "session", "date_created_interested"):
+            interest_by_owner.setdefault(interest.session.project.owner, []).append(interest)
+        return interest_by_owner
+
+    def send_digests(self):
+        """Queues the digests of the due owners and returns how many were queued."""
+        interest_by_owner = self.get_pending_interest_by_owner()
+        if not interest_by_owner:
+            return 0
+
+        with transaction.atomic():
+            EmailService.send_interest_digest_emails(interest_by_owner)
+            InterestedParticipant.objects.filter(
+                id__in=[interest.id for interests in interest_by_owner.values() for interest in interests]
+            ).update(owner_notified_at=self.now)
+        return len(interest_by_owner)
+
+
 class ConfirmationNotificationService:
     def __init__(self, session, developer):
         self.session = session
@@ -154,57 +423,254 @@ class ConfirmationNotificationService:
 
 
 class SessionSuggestionService:
-    def __init__(self, user):
+    SUGGESTION_LIMIT = 10
+    MAX_PAGE_SIZE = 50
+
+    def __init__(self, user, ranking=RANKING_TIER):
         self.user = user
+        self.ranking = ranking
 
     def get_suggested_sessions(self):
         try:
-            now = timezone.now()
-            user_stack = self.user.stack
-            user_level = self.user.level
-            user_languages = list(self.user.prog_language.all())
+            if self.ranking == RANKING_SCORE:
+                return self.get_scored_sessions()[:self.SUGGESTION_LIMIT]
 
-            stack_compatible = self.get_stack_compatibility(user_stack)
-            sessions = Session.objects.exclude(host=self.user).filter(schedule_date_time__gte=now)
+            return self.get_prioritized_sessions()[:self.SUGGESTION_LIMIT]
 
-            if user_languages:
-                language_filter = Q(languages__in=user_languages)
-                sessions = sessions.filter(language_filter).distinct()
-            else:
-                return Session.objects.none()
-
-            sessions = sessions.annotate(
-                priority=Case(
-                    When(
-                        Q(level=user_level) & Q(stack__name__in=stack_compatible),
-                        then=1
-                    ),
-                    When(
-                        Q(stack__name__in=stack_compatible),
-                        then=2
-                    ),
-                    default=3,
-                    output_field=IntegerField()
-                )
+        except Exception as e:
+            raise ValidationError(f"Error retrieving suggested sessions: {str(e)}")
+
+    def get_prioritized_sessions(self):
+        """Upcoming sessions sharing a language with the user, ordered by (priority, schedule_date_time, id)."""
+        now = timezone.now()
+        user_stack = self.user.stack
+        user_level = self.user.level
+
+        stack_compatible = self.get_stack_compatibility(user_stack)
+        sessions = Session.objects.exclude(host=self.user).filter(schedule_date_time__gte=now)
+        sessions = filter_shared_languages(sessions, self.user.language_mask)
+
+        sessions = sessions.annotate(
+            priority=Case(
+                When(
+                    Q(level=user_level) & Q(stack__name__in=stack_compatible),
+                    then=1
+                ),
+                When(
+                    Q(stack__name__in=stack_compatible),
+                    then=2
+                ),
+                default=3,
+                output_field=IntegerField()
             )
+        )
 
-            sessions = sessions.filter(priority__lte=3)
-            sessions = sessions.order_by('priority', 'schedule_date_time')
-            suggested_sessions = sessions.select_related('level', 'stack').prefetch_related('languages').distinct()[:10]
+        sessions = sessions.order_by('priority', 'schedule_date_time', 'id')
+        return sessions.with_list_relations()
 
-            return suggested_sessions
+    def get_suggested_sessions_page(self, cursor=None, page_size=SUGGESTION_LIMIT):
+        """
+        Returns one keyset-paginated page of prioritized sessions and the cursor of
+        the next page, or None when there are no more sessions.
+        """
+        try:
+            sessions = self.get_prioritized_sessions()
+            if cursor:
+                priority, schedule_date_time, session_id = decode_session_cursor(cursor)
+                sessions = sessions.filter(
+                    Q(priority__gt=priority)
+                    | Q(priority=priority, schedule_date_time__gt=schedule_date_time)
+                    | Q(priority=priority, schedule_date_time=schedule_date_time, id__gt=session_id)
+                )
 
+            page = list(sessions[:page_size + 1])
+        except ValidationError:
+            raise
         except Exception as e:
             raise ValidationError(f"Error retrieving suggested sessions: {str(e)}")
 
+        next_cursor = None
+        if len(page) > page_size:
+            page = page[:page_size]
+            next_cursor = encode_session_cursor(page[-1])
+        return page, next_cursor
+
+    def get_recommended_sessions(self):
+        """
+        Reads the precomputed recommendations of the user, computing and storing
+        them first when they are missing or expired.
+        """
+        now = timezone.now()
+        if SessionRecommendationService.current_lists(now).filter(user=self.user).exists():
+            recommendations = SessionRecommendation.objects.filter(
+                user=self.user, session__schedule_date_time__gte=now
+            ).select_related(
+                *(f'session__{relation}' for relation in SESSION_LIST_RELATED)
+            ).prefetch_related(*session_list_prefetches('session__')).order_by('rank')
+            return [recommendation.session for recommendation in recommendations]
+
+        sessions = list(self.get_suggested_sessions())
+        SessionRecommendationService.store(
+            self.user.id, [(session.id, session.priority) for session in sessions]
+        )
+        return sessions
+
+    def get_scored_sessions(self):
+        """
+        Orders upcoming sessions by the number of languages shared with the user,
+        penalised by their level distance. Sessions sharing no language are dropped.
+        """
+        user_language_ids = CustomUser.prog_language.through.objects.filter(
+            customuser_id=self.user.id
+        ).values('proglanguage_id')
+
+        sessions = Session.objects.exclude(host=self.user).filter(schedule_date_time__gte=timezone.now())
+
+        return filter_shared_languages(sessions, self.user.language_mask).annotate(
+            shared_languages=Count(
+                'languages', filter=Q(languages__in=Subquery(user_language_ids)), distinct=True
+            ),
+            level_distance=level_distance(self.user.level),
+        ).filter(
+            shared_languages__gt=0
+        ).annotate(
+            match_score=F('shared_languages') * LANGUAGE_OVERLAP_WEIGHT - F('level_distance')
+        ).order_by('-match_score', 'schedule_date_time', 'id').with_list_relations()
+
     def get_stack_compatibility(self, user_stack):
-        stack_mapping = {
-            'Fullstack': ['Fullstack', 'Frontend', 'Backend'],
-            'Frontend': ['Frontend', 'Fullstack'],
-            'Backend': ['Backend', 'Fullstack'],
-        }
-        stack_mapping.get(user_stack, [])
-        return stack_mapping.get(user_stack, [])
+        return STACK_COMPATIBILITY.get(user_stack.name if user_stack else None, [])
+
+
+class SessionRecommendationService:
+    LIMIT = SessionSuggestionService.SUGGESTION_LIMIT
+
+    @staticmethod
+    def current_lists(now=None):
+        now = now or timezone.now()
+        return SessionRecommendationList.objects.filter(Q(expires_at__isnull=True) | Q(expires_at__gt=now))
+
+    @staticmethod
+    def store(user_id, ranked_sessions):
+        """Replaces the stored recommendations of one user with ``[(session_id, score), ...]``."""
+        SessionRecommendationService.store_many({user_id: ranked_sessions})
+
+    @staticmethod
+    def store_many(recommendations, limit=LIMIT):
+        """
+        Replaces the stored recommendations of several users, empty lists included.
+        Lists holding ``limit`` sessions expire when their earliest session starts.
+        """
+        user_ids = list(recommendations)
+        with transaction.atomic():
+            SessionRecommendation.objects.filter(user_id__in=user_ids).delete()
+            SessionRecommendation.objects.bulk_create([
+                SessionRecommendation(user_id=user_id, session_id=session_id, rank=rank, score=score)
+                for user_id, ranked_sessions in recommendations.items()
+                for rank, (session_id, score) in enumerate(ranked_sessions, start=1)
+            ])
+
+            full_user_ids = [user_id for user_id, ranked in recommendations.items() if len(ranked) >= limit]
+            expires_at = dict(SessionRecommendation.objects.filter(user_id__in=full_user_ids).values(
+                'user_id'
+            ).annotate(first_session=Min('session__schedule_date_time')).values_list('user_id', 'first_session'))
+
+            SessionRecommendationList.objects.filter(user_id__in=user_ids).delete()
+            SessionRecommendationList.objects.bulk_create([
+                SessionRecommendationList(user_id=user_id, expires_at=expires_at.get(user_id))
+                for user_id in user_ids
+            ])
+
+    @staticmethod
+    def invalidate_users(user_ids):
+        SessionRecommendationList.objects.filter(user_id__in=user_ids).delete()
+        SessionRecommendation.objects.filter(user_id__in=user_ids).delete()
+
+    @staticmethod
+    def mark_sessions(session_ids):
+        """
+        Queues changed sessions for ``refresh_pending``, so requests saving a session
+        never load the affinity engine or rewrite the lists of other users.
+        """
+        now = timezone.now()
+        PendingSessionRecommendation.objects.bulk_create(
+            [PendingSessionRecommendation(session_id=session_id, requested_at=now) for session_id in session_ids],
+            update_conflicts=True, unique_fields=['session'], update_fields=['requested_at'],
+        )
+
+    @staticmethod
+    def refresh_pending(limit=LIMIT):
+        """
+        Merges the queued sessions into the stored lists and returns how many were
+        merged. Sessions queued again while being merged stay queued.
+        """
+        pending = list(PendingSessionRecommendation.objects.select_related('session').order_by('requested_at'))
+        for row in pending:
+            SessionRecommendationService.refresh_session(row.session, limit)
+            PendingSessionRecommendation.objects.filter(
+                session_id=row.session_id, requested_at=row.requested_at
+            ).delete()
+        return len(pending)
+
+    @staticmethod
+    def refresh_session(session, limit=LIMIT):
+        """
+        Scores ``session`` with the affinity engine against the users holding a
+        current list it is, or was, eligible for, and merges it into those lists.
+        Only lists whose sessions or order change are written.
+
+        A full list that loses the session, or would keep it only in its last slot,
+        is dropped instead, since the best session outside the list is unknown.
+        """
+        now = timezone.now()
+        current_lists = SessionRecommendationService.current_lists(now)
+        user_ids = set(current_lists.filter(
+            user__session_recommendations__session=session
+        ).values_list('user_id', flat=True))
+        if session.schedule_date_time >= now and session.language_mask:
+            user_ids.update(filter_shared_languages(
+                CustomUser.objects.filter(session_recommendation_list__in=current_lists), session.language_mask
+            ).values_list('pk', flat=True))
+        if not user_ids:
+            return
+
+        # Imported here so NumPy is only loaded by processes that store recommendations.
+        from .affinity import get_affinity_engine
+
+        engine = get_affinity_engine()
+        scores = {}
+        if session.schedule_date_time >= now:
+            for user_id, ranked in engine.top_sessions(engine.session_block(session, ()), k=1).items():
+                if ranked and user_id in user_ids:
+                    scores[user_id] = ranked[0][1]
+
+        lists = {user_id: [] for user_id in user_ids}
+        stored = {user_id: [] for user_id in user_ids}
+        listed_user_ids = set()
+        for user_id, session_id, score, schedule_date_time in SessionRecommendation.objects.filter(
+                user_id__in=user_ids, session__schedule_date_time__gte=now
+        ).order_by('rank').values_list('user_id', 'session_id', 'score', 'session__schedule_date_time'):
+            stored[user_id].append((session_id, score))
+            if session_id == session.id:
+                listed_user_ids.add(user_id)
+            else:
+                lists[user_id].append((score, schedule_date_time, session_id))
+
+        merged, dropped = {}, []
+        for user_id, ranked in lists.items():
+            was_full = len(ranked) + (user_id in listed_user_ids) >= limit
+            if user_id in scores:
+                ranked.append((scores[user_id], session.schedule_date_time, session.id))
+                ranked.sort()
+            lands_last = user_id not in scores or ranked[-1][2] == session.id
+            if user_id in listed_user_ids and was_full and lands_last:
+                dropped.append(user_id)
+            elif user_id in scores or user_id in listed_user_ids:
+                ranked = [(session_id, score) for score, _, session_id in ranked[:limit]]
+                if ranked != stored[user_id]:
+                    merged[user_id] = ranked
+
+        SessionRecommendationService.invalidate_users(dropped)
+        SessionRecommendationService.store_many(merged, limit)
 
 
 class SessionCreationService:
@@ -0,0 +1,269 @@
+from django.db.models import F, Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from skills import versions
+from skills.masks import filter_shared_languages, language_bit, refresh_language_masks
+from skills.models import ProgLanguage
+from users.models import CustomUser
+
+from .models import InterestedParticipant, Project, Session, SessionRecommendationList
+from .services import SessionRecommendationService
+
+
+# User fields read by the matching index, the affinity engine and the stored recommendations.
+PROFILE_FIELDS = ('stack_id', 'level_id', 'is_staff')
+# User fields embedded in session and project representations.
+SERIALIZED_USER_FIELDS = (
+    'username', 'email', 'name', 'photo', 'about_me', 'telephone', 'linkedin_link', 'github_link', 'discord_link',
+    'stack_id', 'level_id',
+)
+# Session fields the session rankings and stored recommendations depend on, besides its languages.
+RECOMMENDED_SESSION_FIELDS = ('stack_id', 'level_id', 'host_id', 'schedule_date_time')
+TRACKED_FIELDS = {
+    CustomUser: tuple(dict.fromkeys(PROFILE_FIELDS + SERIALIZED_USER_FIELDS)),
+    Session: RECOMMENDED_SESSION_FIELDS,
+}
+
+
+@receiver(pre_save, sender=CustomUser)
+@receiver(pre_save, sender=Session)
+def remember_tracked_fields(sender, instance, update_fields=None, **kwargs):
+    """Keeps the stored values of the tracked fields, so post_save receivers can tell what a save changed."""
+    if instance.pk is None or (update_fields and set(update_fields) <= {'last_login'}):
+        instance._tracked_fields = {}
+        return
+
+    instance._tracked_fields = sender.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS[sender]).first() or {}
+
+
+def changed_fields(instance, created):
+    """Returns the tracked fields changed by the save of ``instance``, all of them for a new row."""
+    if created:
+        return set(TRACKED_FIELDS[type(instance)])
+
+    changed = set()
+    for name, value in getattr(instance, '_tracked_fields', {}).items():
+        field = instance._meta.get_field(name)
+        if _prep_value(field, getattr(instance, name)) != _prep_value(field, value):
+            changed.add(name)
+    return changed
+
+
+def _prep_value(field, value):
+    # Normalized first, since a photo set to its default URL is stored differently than it is read back.
+    return field.get_prep_value(field.to_python(value))
+
+
+@receiver(post_save, sender=CustomUser)
+def bump_developer_profiles_on_save(sender, instance, created, **kwargs):
+    if changed_fields(instance, created) & set(PROFILE_FIELDS):
+        versions.bump_version(versions.DEVELOPER_PROFILES)
+
+
+@receiver(post_delete, sender=CustomUser)
+def bump_developer_profiles_on_delete(sender, **kwargs):
+    versions.bump_version(versions.DEVELOPER_PROFILES)
+
+
+@receiver(m2m_changed, sender=CustomUser.prog_language.through)
+def bump_developer_profiles_on_languages(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        versions.bump_version(versions.DEVELOPER_PROFILES)
+
+
+def language_mask_updater(model, relation_name):
+    def update_language_mask(sender, instance, action, reverse, pk_set, **kwargs):
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+
+        if not reverse:
+            masks = refresh_language_masks(model, relation_name, [instance.pk])
+            instance.language_mask = masks[instance.pk]
+            return
+
+        if pk_set is None:
+            pk_set = filter_shared_languages(
+                model.objects.all(), language_bit(instance.mask_bit)
+            ).values_list('pk', flat=True)
+        refresh_language_masks(model, relation_name, list(pk_set))
+
+    return update_language_mask
+
+
+for mask_model, mask_relation in (
+        (CustomUser, 'prog_language'),
+        (Session, 'languages'),
+        (Project, 'languages'),
+):
+    m2m_changed.connect(
+        language_mask_updater(mask_model, mask_relation),
+        sender=getattr(mask_model, mask_relation).through,
+        weak=False,
+        dispatch_uid=f'language_mask_{mask_model._meta.label_lower}',
+    )
+
+
+@receiver(post_delete, sender=ProgLanguage)
+def clear_deleted_language_bit(sender, instance, **kwargs):
+    """Drops the bit of a deleted language, whose M2M rows go away without an m2m_changed signal."""
+    bit = language_bit(instance.mask_bit)
+    for model in (CustomUser, Session, Project):
+        filter_shared_languages(model.objects.all(), bit).update(language_mask=F('language_mask').bitand(~bit))
+
+
+# Fields of each model the cached suggestion rankings depend on.
+RANKED_FIELDS = {
+    CustomUser: PROFILE_FIELDS,
+    Session: RECOMMENDED_SESSION_FIELDS,
+}
+
+
+def invalidate_suggestions():
+    versions.bump_version(versions.DEVELOPER_SUGGESTIONS)
+    versions.bump_version(versions.SESSION_SUGGESTIONS)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_save, sender=Session)
+def invalidate_suggestions_on_save(sender, instance, created, **kwargs):
+    if changed_fields(instance, created) & set(RANKED_FIELDS[sender]):
+        invalidate_suggestions()
+
+
+@receiver(post_delete, sender=CustomUser)
+@receiver(m2m_changed, sender=CustomUser.prog_language.through)
+@receiver(post_delete, sender=Session)
+@receiver(m2m_changed, sender=Session.languages.through)
+def invalidate_suggestions_on_change(sender, action=None, **kwargs):
+    if action is None or action.startswith('post_'):
+        invalidate_suggestions()
+
+
+@receiver(post_save, sender=InterestedParticipant)
+@receiver(post_delete, sender=InterestedParticipant)
+@receiver(m2m_changed, sender=Session.participants.through)
+def invalidate_developer_suggestions(sender, action=None, **kwargs):
+    if action is not None and not action.startswith('post_'):
+        return
+
+    versions.bump_version(versions.DEVELOPER_SUGGESTIONS)
+
+
+@receiver(post_save, sender=Session)
+def refresh_recommendations_for_session(sender, instance, created, **kwargs):
+    if changed_fields(instance, created) & set(RECOMMENDED_SESSION_FIELDS):
+        SessionRecommendationService.mark_sessions([instance.pk])
+
+
+@receiver(pre_delete, sender=Session)
+def drop_full_recommendations_of_session(sender, instance, **kwargs):
+    """A full list losing a deleted session may now miss the session ranked just below it."""
+    SessionRecommendationService.invalidate_users(list(SessionRecommendationList.objects.filter(
+        expires_at__isnull=False, user__session_recommendations__session=instance
+    ).values_list('user_id', flat=True)))
+
+
+@receiver(m2m_changed, sender=Session.languages.through)
+def refresh_recommendations_for_session_languages(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        SessionRecommendationService.mark_sessions([instance.pk])
+    elif pk_set:
+        SessionRecommendationService.mark_sessions(pk_set)
+    else:
+        SessionRecommendationService.invalidate_users(
+            filter_shared_languages(CustomUser.objects.all(), language_bit(instance.mask_bit)).values('pk')
+        )
+
+
+@receiver(post_save, sender=CustomUser)
+def refresh_recommendations_for_user(sender, instance, created, **kwargs):
+    if not created and changed_fields(instance, created) & set(PROFILE_FIELDS):
+        SessionRecommendationService.invalidate_users([instance.pk])
+
+
+@receiver(m2m_changed, sender=CustomUser.prog_language.through)
+def refresh_recommendations_for_user_languages(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        SessionRecommendationService.invalidate_users([instance.pk])
+    elif pk_set:
+        SessionRecommendationService.invalidate_users(list(pk_set))
+    else:
+        SessionRecommendationService.invalidate_users(
+            filter_shared_languages(CustomUser.objects.all(), language_bit(instance.mask_bit)).values('pk')
+        )
+
+
+def touch_sessions(sessions):
+    """Moves the version of ``sessions`` and of their projects, which embed them."""
+    now = timezone.now()
+    session_ids = list(sessions.values_list('pk', flat=True))
+    Session.objects.filter(pk__in=session_ids).update(updated_at=now)
+    Project.objects.filter(sessions__in=session_ids).update(updated_at=now)
+
+
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+def touch_project_of_session(sender, instance, **kwargs):
+    Project.objects.filter(pk=instance.project_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Project)
+def touch_sessions_of_project(sender, instance, created, **kwargs):
+    if not created:
+        Session.objects.filter(project=instance).update(updated_at=instance.updated_at)
+
+
+def m2m_toucher(model, relation_name, touch):
+    """
+    Moves the version of the ``model`` rows whose ``relation_name`` changed. Reverse
+    clears are handled before they run, while the cleared rows can still be found.
+    """
+    def touch_changed_rows(sender, instance, action, reverse, pk_set, **kwargs):
+        if not reverse and action in ('post_add', 'post_remove', 'post_clear'):
+            touch(model.objects.filter(pk=instance.pk))
+        elif reverse and action in ('post_add', 'post_remove'):
+            touch(model.objects.filter(pk__in=pk_set))
+        elif reverse and action == 'pre_clear':
+            touch(model.objects.filter(**{relation_name: instance}))
+
+    return touch_changed_rows
+
+
+def touch_projects(projects):
+    projects.update(updated_at=timezone.now())
+
+
+for touched_model, touched_relation, touch in (
+        (Session, 'languages', touch_sessions),
+        (Session, 'participants', touch_sessions),
+        (Project, 'languages', touch_projects),
+):
+    m2m_changed.connect(
+        m2m_toucher(touched_model, touched_relation, touch),
+        sender=getattr(touched_model, touched_relation).through,
+        weak=False,
+        dispatch_uid=f'touch_{touched_model._meta.label_lower}_{touched_relation}',
+    )
+
+
+@receiver(post_save, sender=CustomUser)
+def touch_resources_of_user(sender, instance, created, **kwargs):
+    if created or not changed_fields(instance, created) & set(SERIALIZED_USER_FIELDS):
+        return
+
+    touch_sessions(Session.objects.filter(Q(host=instance) | Q(participants=instance)))
+    touch_projects(Project.objects.filter(owner=instance))
+
+
+@receiver(m2m_changed, sender=CustomUser.prog_language.through)
+def touch_sessions_of_user_languages(sender, instance, action, reverse, **kwargs):
+    if not reverse and action in ('post_add', 'post_remove', 'post_clear'):
+        touch_sessions(Session.objects.filter(participants=instance))
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from skills.versions import DEVELOPER_SUGGESTIONS, SESSION_SUGGESTIONS, get_version
+from users.models import CustomUser
+
+from .models import Session
+
+
+def get_stats():
+    """
+    Hit and miss counts of this process. The default cache is a per-process
+    LocMemCache, so every worker counts, and reports, only the requests it served.
+    """
+    hits = cache.get('suggestions:stats:hits', 0)
+    misses = cache.get('suggestions:stats:misses', 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / total, 4) if total else 0.0,
+    }
+
+
+def _count(outcome):
+    key = f'suggestions:stats:{outcome}'
+    if not cache.add(key, 1, None):
+        cache.incr(key)
+
+
+class SuggestionCache:
+    """
+    Stores ranked id lists produced by a suggestion service, keyed by the object the
+    suggestions are for. Entries are only reused while the namespace version is
+    unchanged; versions are shared through ``skills.versions``, so a change saved by
+    one worker invalidates the entries of every worker.
+    """
+
+    def __init__(self, namespace, queryset):
+        self.namespace = namespace
+        self.queryset = queryset
+
+    def get_or_compute(self, object_id, variant, compute):
+        version = get_version(self.namespace)
+        key = f'suggestions:{self.namespace}:{version}:{variant}:{object_id}'
+
+        ranked_ids = cache.get(key)
+        if ranked_ids is None:
+            _count('misses')
+            results = list(compute())
+            cache.set(key, [result.pk for result in results], settings.SUGGESTION_CACHE_TIMEOUT)
+            return results
+
+        _count('hits')
+        objects = self.queryset.in_bulk(ranked_ids)
+        return [objects[object_pk] for object_pk in ranked_ids if object_pk in objects]
+
+
+developer_suggestion_cache = SuggestionCache(DEVELOPER_SUGGESTIONS, CustomUser.objects.all())
+session_suggestion_cache = SuggestionCache(
+    SESSION_SUGGESTIONS,
+    Session.objects.with_list_relations(),
+)
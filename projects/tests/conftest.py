@@ -6,3 +6,57 @@ from django.core import mail
 def enable_mail_testing(settings):
     settings.EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
     mail.outbox = []
+
+
+@pytest.fixture(autouse=True)
+def reset_developer_index():
+    from projects.matching_index import developer_index
+    developer_index.invalidate()
+    yield
+    developer_index.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from django.core.cache import cache
+    cache.clear()
+
+
+@pytest.fixture
+def create_developer(db):
+    """Factory for users with an ``<username>@example.com`` email, a fixed password and the given profile."""
+    from users.models import CustomUser
+
+    def create(username, stack=None, level=None, languages=(), **fields):
+        developer = CustomUser.objects.create_user(
+            username=username, email=f'{username}@example.com', password='password123',
+            stack=stack, level=level, **fields
+        )
+        if languages:
+            developer.prog_language.add(*languages)
+        return developer
+
+    return create
+
+
+@pytest.fixture
+def create_session(db):
+    """
+    Factory for sessions of a project, hosted by its owner with the project's
+    stack and level and scheduled ``days`` from now unless told otherwise.
+    """
+    from datetime import datetime, timedelta
+
+    from projects.models import Session
+
+    def create(project, languages=(), days=1, **fields):
+        fields.setdefault('host', project.owner)
+        fields.setdefault('stack', project.stack)
+        fields.setdefault('level', project.level)
+        fields.setdefault('schedule_date_time', datetime.now() + timedelta(days=days))
+        session = Session.objects.create(project=project, **fields)
+        if languages:
+            session.languages.add(*languages)
+        return session
+
+    return create
@@ -2,13 +2,44 @@ import pytest
 from rest_framework import status
 from templated_mail import mail
 from django.core import mail
+import io
 import json
+from decimal import Decimal
+from projects.affinity import AffinityEngine, get_affinity_engine
+from projects.mail_delivery import mail_delivery
+from projects import outbox
+from projects.outbox import drain, queue_email
+from projects.views import SessionViewSet
 from projects.serializers import ProjectSerializer
+from projects.services import (
+    RANKING_SCORE, BatchDeveloperSuggestionService, DeveloperSuggestionService, SessionRecommendationService,
+    SessionSuggestionService
+)
 from users.models import CustomUser
-from projects.models import Project, Session, InterestedParticipant
+from projects.models import (
+    Project, Session, InterestedParticipant, OutboundEmail, PendingSessionRecommendation, SessionRecommendation,
+    SessionRecommendationList
+)
+from skills.masks import language_mask
 from skills.models import Stack, Level, ProgLanguage
+from skills.versions import DEVELOPER_SUGGESTIONS, get_version
 from datetime import datetime, timedelta
+from django.core.mail.backends import locmem
+from django.template.loader import render_to_string
+from django.template.loaders import filesystem
+from django.core.management import call_command
+from smtplib import SMTPDataError, SMTPRecipientsRefused, SMTPServerDisconnected
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from pair_connect import renderers
+from pair_connect.email_templates import EMAIL_TEMPLATES, warm_email_templates
+from pair_connect.parsers import FastJSONParser
+from pair_connect.query_budget import QueryRecorder, enforce_budgets
+from pair_connect.renderers import FastJSONRenderer
 from datetime import timedelta
 
 
@@ -482,6 +513,7 @@ def test_confirm_participant_success(client):
     assert response.status_code == status.HTTP_200_OK
     assert 'confirmed' in response.data['message'].lower()
     assert session.participants.filter(id=developer.id).exists()
+    call_command('send_outbound_emails')
     assert len(mail.outbox) == 1
     email = mail.outbox[0]
     assert developer.email in email.to
@@ -585,10 +617,1292 @@ def test_express_interest_in_session(client):
 
     # Then: I should receive a success message and an interest notification email should be sent
     assert response.status_code == status.HTTP_201_CREATED
+    call_command('send_outbound_emails')
     assert len(mail.outbox) == 1
     email = mail.outbox[0]
     assert host.email in email.to
     assert 'interesadx' in email.subject.lower()
 
 
+@pytest.mark.django_db
+def test_indexed_suggested_developers_follow_tiers(client, settings, create_developer, create_session):
+    """
+    Scenario: Suggested developers are served from the in-memory matching index
+    Given the developer matching index is enabled
+    And developers with different degrees of skill match exist
+    When I request suggested developers for a session
+    Then developers are ordered by match tier and the index is rebuilt after profile changes
+    """
+    # Given: the developer matching index is enabled
+    settings.DEVELOPER_MATCHING_INDEX_ENABLED = True
+    host = create_developer('host')
+    authenticate_client(client, host)
+
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    frontend, _ = Stack.objects.get_or_create(name='Frontend')
+    junior, _ = Level.objects.get_or_create(name='Junior')
+    senior, _ = Level.objects.get_or_create(name='Senior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    javascript, _ = ProgLanguage.objects.get_or_create(name='JavaScript')
+
+    project = Project.objects.create(owner=host, name='Host Project', stack=backend, level=junior)
+    project.languages.add(python)
+    session = create_session(project, [python], days=0, description='Indexed session')
+
+    # And: developers with different degrees of skill match exist
+    stack_only = create_developer('stack_only', backend, senior, [javascript])
+    language_match = create_developer('language_match', backend, senior, [python])
+    full_match = create_developer('full_match', backend, junior, [python])
+    create_developer('wrong_stack', frontend, junior, [python])
+
+    # When: I request suggested developers for the session
+    url = f'/api/projects/sessions/{session.id}/suggested-developers/'
+    response = client.get(url)
+
+    # Then: developers are ordered by match tier
+    assert response.status_code == status.HTTP_200_OK
+    assert [user['id'] for user in response.data] == [full_match.id, language_match.id, stack_only.id]
+
+    # And: the index is rebuilt after profile changes
+    stack_only.prog_language.add(python)
+    stack_only.level = junior
+    stack_only.save()
+    response = client.get(url)
+    assert [user['id'] for user in response.data] == [stack_only.id, full_match.id, language_match.id]
+
+
+@pytest.mark.django_db
+def test_suggested_developers_ranked_in_single_query(django_assert_num_queries, create_developer, create_session):
+    """
+    Scenario: Suggested developers are ranked by match tier in one query
+    Given a session with an interested user, a participant and a host
+    And developers with different degrees of skill match
+    When I ask the suggestion service for developers
+    Then excluded users are left out and the rest are ordered by tier using a single query
+    """
+    # Given: a session with an interested user, a participant and a host
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    junior, _ = Level.objects.get_or_create(name='Junior')
+    senior, _ = Level.objects.get_or_create(name='Senior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    javascript, _ = ProgLanguage.objects.get_or_create(name='JavaScript')
+
+    host = create_developer('host', backend, junior, [python])
+    interested = create_developer('interested', backend, junior, [python])
+    participant = create_developer('participant', backend, junior, [python])
+
+    project = Project.objects.create(owner=host, name='Host Project', stack=backend, level=junior)
+    session = create_session(project, [python], days=0, description='Ranked session')
+    session.participants.add(participant)
+    InterestedParticipant.objects.create(user=interested, session=session)
+
+    # And: developers with different degrees of skill match
+    stack_only = create_developer('stack_only', backend, junior, [javascript])
+    language_match = create_developer('language_match', backend, senior, [python])
+    full_match = create_developer('full_match', backend, junior, [python])
+
+    # When: I ask the suggestion service for developers
+    service = DeveloperSuggestionService(session)
+    with django_assert_num_queries(1):
+        suggested = list(service.get_suggested_developers())
+
+    # Then: excluded users are left out and the rest are ordered by tier
+    assert [user.id for user in suggested] == [full_match.id, language_match.id, stack_only.id]
+    assert [user.match_tier for user in suggested] == [1, 2, 3]
+
+
+@pytest.mark.django_db
+def test_score_ranking_orders_by_language_overlap_and_level(create_developer, create_session):
+    """
+    Scenario: Score ranking favours shared languages and close levels
+    Given a session and an upcoming session with several languages
+    And developers sharing a different number of those languages
+    When I ask both suggestion services for score-ranked results
+    Then results are ordered by language overlap, then by level distance
+    """
+    # Given: sessions with several languages
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    junior, _ = Level.objects.get_or_create(name='Junior')
+    mid, _ = Level.objects.get_or_create(name='Mid')
+    senior, _ = Level.objects.get_or_create(name='Senior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    go, _ = ProgLanguage.objects.get_or_create(name='Go')
+    rust, _ = ProgLanguage.objects.get_or_create(name='Rust')
+
+    host = create_developer('host', backend, junior, [python])
+    project = Project.objects.create(owner=host, name='Host Project', stack=backend, level=junior)
+    session = create_session(project, [python, go, rust], name='Polyglot')
+
+    # And: developers sharing a different number of those languages
+    one_language = create_developer('one_language', backend, mid, [python])
+    two_languages_senior = create_developer('two_languages_senior', backend, senior, [python, go])
+    three_languages = create_developer('three_languages', backend, mid, [python, go, rust])
+    two_languages = create_developer('two_languages', backend, junior, [python, go])
+
+    # When: I ask both services for score-ranked results
+    developers = list(DeveloperSuggestionService(session, ranking=RANKING_SCORE).get_suggested_developers())
+    polyglot_session = create_session(project, [go, rust], name='Also polyglot', level=senior)
+    sessions = list(SessionSuggestionService(two_languages, ranking=RANKING_SCORE).get_suggested_sessions())
+
+    # Then: results are ordered by language overlap, then by level distance
+    assert [user.id for user in developers] == [
+        three_languages.id, two_languages.id, two_languages_senior.id, one_language.id
+    ]
+    assert [user.shared_languages for user in developers] == [3, 2, 2, 1]
+    assert [user.level_distance for user in developers] == [1, 0, 2, 1]
+    assert [suggested.id for suggested in sessions] == [session.id, polyglot_session.id]
+
+
+@pytest.mark.django_db
+def test_language_masks_follow_m2m_changes_and_filter_lists(client, create_developer):
+    """
+    Scenario: Language masks are kept in sync and used by list filters
+    Given projects and users with programming languages
+    When their languages change from either side of the relation
+    Then the stored masks are updated and list endpoints can filter on them
+    And deleting a language drops its bit from the stored masks
+    """
+    # Given: projects and users with programming languages
+    user = create_developer('owner')
+    authenticate_client(client, user)
+
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    go, _ = ProgLanguage.objects.get_or_create(name='Go')
+
+    python_project = Project.objects.create(owner=user, name='Python Project', stack=stack, level=level)
+    go_project = Project.objects.create(owner=user, name='Go Project', stack=stack, level=level)
+
+    # When: their languages change from either side of the relation
+    python_project.languages.add(python)
+    go.project_set.add(go_project)
+    user.prog_language.set([python, go])
+    user.prog_language.remove(go)
+
+    # Then: the stored masks are updated
+    python_project.refresh_from_db()
+    go_project.refresh_from_db()
+    user.refresh_from_db()
+    assert python_project.language_mask == language_mask([python.id])
+    assert go_project.language_mask == language_mask([go.id])
+    assert user.language_mask == language_mask([python.id])
+
+    # And: list endpoints can filter on them
+    response = client.get(f'/api/projects/projects/?languages={go.id}')
+    assert response.status_code == status.HTTP_200_OK
+    assert [project['id'] for project in response.data['results']] == [go_project.id]
+
+    # And: deleting a language drops its bit from the stored masks
+    assert python.mask_bit != go.mask_bit
+    go.delete()
+    go_project.refresh_from_db()
+    assert go_project.language_mask == 0
+
+
+@pytest.mark.django_db
+def test_suggested_developers_are_cached_until_invalidated(client, create_developer, create_session):
+    """
+    Scenario: Suggested developers are served from cache until related data changes
+    Given a session and a matching developer
+    When I request suggested developers twice
+    Then the second request is a cache hit
+    And saving profile fields the ranking ignores keeps the cached ranking
+    And expressing interest in the session invalidates it for every worker
+    """
+    # Given: a session and a matching developer
+    host = create_developer('host', is_staff=True)
+    authenticate_client(client, host)
+
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+
+    developer = create_developer('developer', stack, level, [python])
+
+    project = Project.objects.create(owner=host, name='Host Project', stack=stack, level=level)
+    session = create_session(project, [python], days=0, description='Cached session')
+
+    # When: I request suggested developers twice
+    url = f'/api/projects/sessions/{session.id}/suggested-developers/'
+    first = client.get(url)
+    second = client.get(url)
+
+    # Then: the second request is a cache hit
+    assert first.data == second.data
+    assert [user['id'] for user in second.data] == [developer.id]
+    stats = client.get(reverse('suggestion_cache_stats')).data
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+    # And: saving profile fields the ranking ignores keeps the cached ranking
+    developer.about_me = 'Pairing on weekends'
+    developer.save()
+    client.get(url)
+    assert client.get(reverse('suggestion_cache_stats')).data['hits'] == 2
+
+    # And: expressing interest invalidates it for every worker
+    version = get_version(DEVELOPER_SUGGESTIONS)
+    InterestedParticipant.objects.create(user=developer, session=session)
+    assert get_version(DEVELOPER_SUGGESTIONS) != version
+    assert client.get(url).data == []
+
+
+@pytest.mark.django_db
+def test_batch_suggested_developers_match_single_session_ranking(client, create_developer, create_session):
+    """
+    Scenario: Suggestions for several sessions are computed in one request
+    Given I host two sessions with different levels
+    And several developers exist
+    When I request suggested developers for both sessions at once
+    Then each session gets the same ranking as the single-session endpoint
+    And every suggested user profile is returned once
+    """
+    # Given: I host two sessions with different levels
+    host = create_developer('host')
+    authenticate_client(client, host)
+
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    junior, _ = Level.objects.get_or_create(name='Junior')
+    senior, _ = Level.objects.get_or_create(name='Senior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+
+    project = Project.objects.create(owner=host, name='Host Project', stack=backend, level=junior)
+    sessions = [
+        create_session(project, [python], days=0, description=f'{level.name} session', level=level)
+        for level in (junior, senior)
+    ]
+
+    # And: several developers exist
+    for index, level in enumerate((senior, junior, senior, junior)):
+        create_developer(f'developer{index}', backend, level, [python])
+
+    # When: I request suggested developers for both sessions at once
+    url = reverse('batch_suggested_developers')
+    response = client.post(url, {'session_ids': [session.id for session in sessions]}, content_type='application/json')
+
+    # Then: each session gets the same ranking as the single-session endpoint
+    assert response.status_code == status.HTTP_200_OK
+    for session in sessions:
+        single = client.get(f'/api/projects/sessions/{session.id}/suggested-developers/')
+        assert response.data['suggestions'][session.id] == [user['id'] for user in single.data]
+
+    # And: every suggested user profile is returned once
+    assert set(response.data['users']) == {
+        user_id for ranked_ids in response.data['suggestions'].values() for user_id in ranked_ids
+    }
+
+
+@pytest.mark.django_db
+def test_batch_suggested_developers_are_limited_to_my_sessions(client, create_developer, create_session):
+    """
+    Scenario: Asking for batch suggestions beyond what a host may see
+    Given a session hosted by someone else and one of my own
+    When I request suggestions for their session, or too many developers for mine
+    Then the request is rejected without ranking anyone
+    """
+    # Given: a session hosted by someone else and one of my own
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    host = create_developer('host')
+    me = create_developer('me')
+    for index in range(3):
+        create_developer(f'developer{index}', stack, level, [python])
+    their_session = create_session(
+        Project.objects.create(owner=host, name='Their Project', stack=stack, level=level), [python]
+    )
+    my_session = create_session(Project.objects.create(owner=me, name='My Project', stack=stack, level=level), [python])
+    authenticate_client(client, me)
+    url = reverse('batch_suggested_developers')
+
+    # When: I request suggestions for their session
+    response = client.post(url, {'session_ids': [my_session.id, their_session.id]}, content_type='application/json')
+    # Then: the request is forbidden
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert 'users' not in response.data
+
+    # When: I request more developers than a suggestion list holds
+    limit = BatchDeveloperSuggestionService.MAX_LIMIT + 1
+    response = client.post(url, {'session_ids': [my_session.id], 'limit': limit}, content_type='application/json')
+    # Then: the limit is rejected
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_affinity_engine_matches_suggestion_services(tmp_path, create_developer, create_session):
+    """
+    Scenario: The matrix engine reproduces the suggestion service rankings
+    Given upcoming sessions and developers with mixed stacks, levels and languages
+    When I rank them with the affinity engine
+    Then every session gets the same developers as DeveloperSuggestionService
+    And every user gets the same sessions as SessionSuggestionService
+    And the management command writes the precomputed recommendations
+    And the shared engine is only reloaded after a developer profile changes
+    """
+    # Given: upcoming sessions and developers with mixed skills
+    stacks = [Stack.objects.get_or_create(name=name)[0] for name in ('Backend', 'Frontend', 'Fullstack')]
+    levels = [Level.objects.get_or_create(name=name)[0] for name in ('Junior', 'Senior')]
+    languages = [ProgLanguage.objects.get_or_create(name=name)[0] for name in ('Python', 'JavaScript', 'Go')]
+
+    developers = [
+        create_developer(
+            f'developer{index}', stacks[index % 3], levels[index % 2], languages[:index % 3 + 1][-(index % 2 + 1):]
+        )
+        for index in range(12)
+    ]
+
+    project = Project.objects.create(owner=developers[0], name='Project', stack=stacks[2], level=levels[0])
+    sessions = [
+        create_session(
+            project, [languages[index % 3]], days=index + 1, host=developers[index], name=f'Session {index}',
+            stack=stacks[index % 3], level=levels[(index + 1) % 2]
+        )
+        for index in range(6)
+    ]
+    InterestedParticipant.objects.create(user=developers[7], session=sessions[1])
+    sessions[2].participants.add(developers[8])
+
+    # When: I rank them with the affinity engine
+    engine = AffinityEngine.load()
+    block = engine.load_sessions(Session.objects.all())
+    top_developers = engine.top_developers(block, k=5)
+    top_sessions = engine.top_sessions(block, k=10)
+
+    # Then: every session gets the same developers as DeveloperSuggestionService
+    for session in sessions:
+        expected = DeveloperSuggestionService(session).get_ranked_developers()[:5]
+        assert top_developers[session.id] == [(user.id, user.match_tier) for user in expected]
+
+    # And: every user gets the same sessions as SessionSuggestionService
+    for developer in developers:
+        expected = SessionSuggestionService(developer).get_suggested_sessions()
+        assert [session_id for session_id, _ in top_sessions[developer.id]] == [session.id for session in expected]
+
+    # And: the management command writes the precomputed recommendations
+    output = tmp_path / 'recommendations.json'
+    call_command('precompute_recommendations', output=str(output))
+    recommendations = json.loads(output.read_text())
+    assert recommendations['developers_by_session'][str(sessions[0].id)] == [
+        user_id for user_id, _ in top_developers[sessions[0].id]
+    ]
+
+    # And: the shared engine is only reloaded after a developer profile changes
+    shared_engine = get_affinity_engine()
+    developers[0].about_me = 'Pairing on weekends'
+    developers[0].save()
+    InterestedParticipant.objects.create(user=developers[9], session=sessions[0])
+    assert get_affinity_engine() is shared_engine
+    developers[0].prog_language.add(languages[2])
+    assert get_affinity_engine() is not shared_engine
+
+
+@pytest.mark.django_db
+def test_stored_session_recommendations_are_refreshed(client, monkeypatch, create_developer, create_session):
+    """
+    Scenario: Suggested sessions are read from the precomputed recommendations table
+    Given a developer and upcoming sessions sharing their language
+    When the nightly refresh command runs
+    Then the developer's recommendations are stored and served by the endpoint
+    And changed sessions are queued, then merged into or dropped from them by the command
+    And a developer without matches keeps an empty list instead of recomputing it
+    """
+    # Given: a developer and upcoming sessions sharing their language
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+
+    host = create_developer('host')
+    developer = create_developer('developer', stack, level, [python])
+    authenticate_client(client, developer)
+
+    project = Project.objects.create(owner=host, name='Host Project', stack=stack, level=level)
+    later = create_session(project, [python], days=2, name='Later')
+    sooner = create_session(project, [python], days=1, name='Sooner')
+
+    # When: the nightly refresh command runs
+    call_command('refresh_session_recommendations', k=10, chunk_size=1)
+
+    # Then: the developer's recommendations are stored and served by the endpoint
+    assert list(SessionRecommendation.objects.filter(user=developer).values_list('session_id', 'rank', 'score')) == [
+        (sooner.id, 1, 1), (later.id, 2, 1)
+    ]
+    response = client.get(reverse('suggested_sessions'))
+    assert [session['id'] for session in response.data] == [sooner.id, later.id]
+
+    # And: creating a new matching session only queues it, without loading the engine
+    monkeypatch.setattr('projects.affinity.get_affinity_engine', lambda: pytest.fail())
+    soonest = create_session(project, [python], days=0.5, name='Soonest')
+    assert list(PendingSessionRecommendation.objects.values_list('session_id', flat=True)) == [soonest.id]
+    assert list(SessionRecommendation.objects.filter(user=developer).values_list('session_id', flat=True)) == [
+        sooner.id, later.id
+    ]
+    monkeypatch.undo()
+
+    # And: the command merges it into the stored list
+    call_command('refresh_session_recommendations', pending=True, k=10)
+    assert not PendingSessionRecommendation.objects.exists()
+    assert list(SessionRecommendation.objects.filter(user=developer).values_list('session_id', flat=True)) == [
+        soonest.id, sooner.id, later.id
+    ]
+    response = client.get(reverse('suggested_sessions'))
+    assert [session['id'] for session in response.data] == [soonest.id, sooner.id, later.id]
+
+    # And: a session that stops matching leaves it, and unrelated saves change nothing
+    sooner.languages.clear()
+    soonest.description = 'Updated description'
+    soonest.save()
+    call_command('refresh_session_recommendations', pending=True, k=10)
+    assert list(SessionRecommendation.objects.filter(user=developer).values_list('session_id', flat=True)) == [
+        soonest.id, later.id
+    ]
+
+    # And: merging a session that does not change the list leaves it untouched
+    computed = SessionRecommendationList.objects.get(user=developer).date_computed
+    SessionRecommendationService.mark_sessions([soonest.id])
+    call_command('refresh_session_recommendations', pending=True, k=10)
+    assert SessionRecommendationList.objects.get(user=developer).date_computed == computed
+
+    # And: a developer without matches keeps an empty list instead of recomputing it
+    authenticate_client(client, host)
+    assert client.get(reverse('suggested_sessions')).data == []
+    monkeypatch.setattr(SessionSuggestionService, 'get_suggested_sessions', lambda service: pytest.fail())
+    assert client.get(reverse('suggested_sessions')).data == []
+
+
+@pytest.mark.django_db
+def test_suggested_sessions_keyset_pagination(client, create_developer, create_session):
+    """
+    Scenario: Browsing suggested sessions beyond the top results
+    Given more matching upcoming sessions than fit on one page
+    When I follow the next cursor page by page
+    Then I see every session exactly once in priority and date order
+    """
+    # Given: more matching upcoming sessions than fit on one page
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    frontend, _ = Stack.objects.get_or_create(name='Frontend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+
+    host = create_developer('host')
+    developer = create_developer('developer', backend, level, [python])
+    authenticate_client(client, developer)
+
+    project = Project.objects.create(owner=host, name='Host Project', stack=backend, level=level)
+    start = datetime.now() + timedelta(days=1)
+    expected = {1: [], 3: []}
+    for index in range(5):
+        for stack, priority in ((backend, 1), (frontend, 3)):
+            session = create_session(
+                project, [python], name=f'Session {index}', stack=stack,
+                # Two sessions share each start time so the id tie-breaker is exercised.
+                schedule_date_time=start + timedelta(hours=index // 2)
+            )
+            expected[priority].append(session.id)
+
+    # When: I follow the next cursor page by page
+    url = reverse('suggested_sessions')
+    seen = []
+    response = client.get(url, {'page_size': 3})
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        seen.extend(session['id'] for session in response.data['results'])
+        if not response.data['next_cursor']:
+            break
+        response = client.get(url, {'page_size': 3, 'cursor': response.data['next_cursor']})
+
+    # Then: I see every session exactly once in priority and date order
+    assert seen == expected[1] + expected[3]
+    assert client.get(url, {'cursor': 'not-a-cursor'}).status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_session_lists_use_a_constant_number_of_queries(client, create_developer, create_session):
+    """
+    Scenario: Listing sessions does not issue queries per session
+    Given I host, join and am interested in sessions with participants and languages
+    When I request every session list endpoint with one and then with many sessions
+    Then each endpoint runs the same number of queries regardless of the session count
+    """
+    # Given: sessions I host, join and am interested in
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    sql, _ = ProgLanguage.objects.get_or_create(name='SQL')
+
+    user = create_developer('user', stack, level)
+    other = create_developer('other', stack, level, [python, sql])
+    authenticate_client(client, user)
+    project = Project.objects.create(owner=user, name='Project', stack=stack, level=level)
+
+    def add_sessions(count):
+        for index in range(count):
+            for host in (user, other):
+                session = create_session(project, [python, sql], host=host, name=f'Session {index}')
+                session.participants.add(other if host == user else user)
+                if host == other:
+                    InterestedParticipant.objects.create(user=user, session=session)
+
+    urls = [
+        '/api/projects/sessions/',
+        reverse('sessions_by_project', args=[project.id]),
+        reverse('user_hosted_sessions'),
+        reverse('user_participating_sessions'),
+        reverse('user_interested_sessions'),
+        reverse('user_sessions'),
+    ]
+
+    def count_queries():
+        counts = {}
+        for url in urls:
+            with CaptureQueriesContext(connection) as queries:
+                assert client.get(url).status_code == status.HTTP_200_OK
+            counts[url] = len(queries)
+        return counts
+
+    # When: I request every list endpoint with one and then with many sessions
+    add_sessions(1)
+    few = count_queries()
+    add_sessions(4)
+    many = count_queries()
+
+    # Then: the number of queries does not grow with the number of sessions
+    assert many == few
+
+
+@pytest.mark.django_db
+def test_values_list_serializers_match_model_serializers(client, settings, create_developer, create_session):
+    """
+    Scenario: Fast list responses are identical to the serializer output
+    Given projects and sessions with missing stacks, levels, hosts, photos and languages
+    When I request every project and session list with and without the values-based serializers
+    Then both responses are byte-for-byte identical
+    """
+    # Given: projects and sessions with optional data missing here and there
+    backend, _ = Stack.objects.get_or_create(name='Backend')
+    junior, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    sql, _ = ProgLanguage.objects.get_or_create(name='SQL')
+
+    user = create_developer('user', backend, junior, [sql, python])
+    bare = create_developer('bare', photo=None)
+    authenticate_client(client, user)
+
+    project = Project.objects.create(owner=user, name='Project', stack=backend, level=junior)
+    project.languages.add(python, sql)
+    orphan = Project.objects.create(name='Orphan', description='No owner', stack=backend, level=junior, image=None)
+
+    hosted = create_session(
+        project, [sql, python], name='Hosted', description='Pairing',
+        session_link='https://meet.example.com/a', participant_limit=3,
+        schedule_date_time=datetime.now() + timedelta(days=1, microseconds=123)
+    )
+    hosted.participants.add(bare)
+    joined = create_session(
+        orphan, days=2, host=bare, stack=None, level=None, public=False, duration=timedelta(minutes=45)
+    )
+    joined.participants.add(user, bare)
+    InterestedParticipant.objects.create(user=user, session=joined)
+    create_session(orphan, days=3, stack=None, level=None)
+
+    urls = [
+        '/api/projects/projects/',
+        '/api/projects/projects/?expand=sessions',
+        '/api/projects/projects/?expand=sessions.participants',
+        '/api/projects/projects/?omit=sessions,image,language_names',
+        '/api/projects/sessions/',
+        '/api/projects/sessions/?fields=id,is_private,participants',
+        '/api/projects/sessions/?expand=participants',
+        f"{reverse('user_sessions')}?expand=participants",
+        f'/api/projects/sessions/?languages={python.id}',
+        reverse('sessions_by_project', args=[orphan.id]),
+        reverse('user_hosted_sessions'),
+        reverse('user_participating_sessions'),
+        reverse('user_interested_sessions'),
+        reverse('user_sessions'),
+    ]
+
+    # When: I request every list with and without the values-based serializers
+    def fetch_all():
+        responses = [client.get(url) for url in urls]
+        assert all(response.status_code == status.HTTP_200_OK for response in responses)
+        return [response.content for response in responses]
+
+    settings.VALUES_LIST_SERIALIZERS_ENABLED = False
+    expected = fetch_all()
+    settings.VALUES_LIST_SERIALIZERS_ENABLED = True
+    actual = fetch_all()
+
+    # Then: both responses are byte-for-byte identical
+    for url, expected_content, actual_content in zip(urls, expected, actual):
+        assert actual_content == expected_content, url
+
+
+@pytest.mark.django_db
+def test_project_sessions_are_expanded_on_request(client, create_developer, create_session):
+    """
+    Scenario: Embedding sessions and participants in project lists on demand
+    Given a project with a session that has a participant
+    When I list projects without expansion, expanding sessions, and expanding participants too
+    Then I get session ids, then sessions with participant ids, then full participant profiles
+    """
+    # Given: a project with a session that has a participant
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    owner = create_developer('owner')
+    participant = create_developer('participant')
+    authenticate_client(client, owner)
+    project = Project.objects.create(owner=owner, name='Project', stack=stack, level=level)
+    session = create_session(project)
+    session.participants.add(participant)
+    url = '/api/projects/projects/'
+
+    # When: I list projects without expansion
+    response = client.get(url)
+    # Then: sessions are listed by id
+    assert response.data['results'][0]['sessions'] == [session.id]
+
+    # When: I expand the sessions
+    response = client.get(url, {'expand': 'sessions'})
+    # Then: sessions are embedded with participant ids
+    assert response.data['results'][0]['sessions'][0]['id'] == session.id
+    assert response.data['results'][0]['sessions'][0]['participants'] == [participant.id]
+
+    # When: I expand the participants of the sessions too
+    response = client.get(url, {'expand': 'sessions.participants'})
+    # Then: participants are embedded with their profile
+    assert response.data['results'][0]['sessions'][0]['participants'][0]['username'] == 'participant'
+
+
+@pytest.mark.django_db
+def test_sparse_fieldsets_trim_responses_and_queries(client, create_developer, create_session):
+    """
+    Scenario: Requesting only some fields of sessions and profiles
+    Given a session with languages and a participant
+    When I list sessions with ?fields= and ?omit=, and view a profile with ?fields=
+    Then only the selected fields are returned, fewer queries run, and unknown fields are rejected
+    """
+    # Given: a session with languages and a participant
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+    user = create_developer('user', stack, level, [python])
+    authenticate_client(client, user)
+    project = Project.objects.create(owner=user, name='Project', stack=stack, level=level)
+    session = create_session(project, [python], name='Pairing')
+    session.participants.add(user)
+    url = '/api/projects/sessions/'
+
+    def get(params):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, params)
+        return response, len(queries)
+
+    # When: I list sessions with and without a sparse fieldset
+    full_response, full_queries = get({})
+    sparse_response, sparse_queries = get({'fields': 'id,name'})
+    omitted_response, _ = get({'omit': 'participants,is_private'})
+
+    # Then: only the selected fields are returned and fewer queries run
+    assert sparse_response.data['results'] == [{'id': session.id, 'name': 'Pairing'}]
+    assert sparse_queries < full_queries
+    assert 'participants' not in omitted_response.data['results'][0]
+    assert 'is_private' not in omitted_response.data['results'][0]
+    omitted_fields = set(full_response.data['results'][0]) - {'participants', 'is_private'}
+    assert set(omitted_response.data['results'][0]) == omitted_fields
+
+    # When: I view a profile with a sparse fieldset
+    response = client.get(reverse('user_profile', args=[user.id]), {'fields': 'username,language_names'})
+    # Then: only those fields of the profile are returned
+    assert response.data['profile_data'] == {'username': 'user', 'language_names': ['Python']}
+
+    # When: I request a field that does not exist
+    response = client.get(url, {'fields': 'id,secret'})
+    # Then: the request is rejected
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_list_endpoints_use_cursor_pagination(client, settings, create_developer, create_session):
+    """
+    Scenario: Paging through session lists
+    Given more sessions than fit on one page
+    When I follow the next links of the session list
+    Then I see every session once in schedule order, page sizes are capped,
+    and the legacy flag restores the unpaginated list
+    """
+    # Given: more sessions than fit on one page
+    settings.API_MAX_PAGE_SIZE = 3
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    user = create_developer('user')
+    authenticate_client(client, user)
+    project = Project.objects.create(owner=user, name='Project', stack=stack, level=level)
+    start = datetime.now() + timedelta(days=1)
+    expected = [
+        create_session(project, schedule_date_time=start + timedelta(hours=6 - index)).id
+        for index in range(7)
+    ][::-1]
+
+    # When: I follow the next links of the session list
+    seen = []
+    response = client.get('/api/projects/sessions/', {'page_size': 50})
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        # Then: page sizes are capped by API_MAX_PAGE_SIZE
+        assert len(response.data['results']) <= 3
+        seen.extend(session['id'] for session in response.data['results'])
+        if not response.data['next']:
+            break
+        response = client.get(response.data['next'])
+
+    # Then: I see every session once in schedule order
+    assert seen == expected
+
+    # And: the legacy flag restores the unpaginated list
+    settings.UNPAGINATED_LIST_RESPONSES = True
+    response = client.get(reverse('user_hosted_sessions'))
+    assert [session['id'] for session in response.data] == [
+        session.id for session in Session.objects.filter(host=user)
+    ]
+
+
+@pytest.mark.django_db
+def test_conditional_get_returns_not_modified_until_resources_change(client, create_developer, create_session):
+    """
+    Scenario: Revalidating session and project payloads with ETags
+    Given a session I already downloaded along with its ETag
+    When I request it again with If-None-Match
+    Then I get a 304 without the session being loaded,
+    and a fresh payload once a participant joins, the list grows,
+    an embedded user field changes or a skill is renamed
+    """
+    # Given: a session I already downloaded along with its ETag
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    user = create_developer('user')
+    participant = create_developer('participant')
+    authenticate_client(client, user)
+    project = Project.objects.create(owner=user, name='Project', stack=stack, level=level)
+    session = create_session(project)
+    url = f'/api/projects/sessions/{session.id}/'
+    response = client.get(url)
+    etag = response['ETag']
+
+    # When: I request it again with If-None-Match
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    # Then: I get a 304 without the session being loaded
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response['ETag'] == etag
+    assert not any('projects_session_participants' in query['sql'] for query in queries)
+
+    # And: a fresh payload once a participant joins
+    project_etag = client.get(f'/api/projects/projects/{project.id}/')['ETag']
+    session.participants.add(participant)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response['ETag'] != etag
+    response = client.get(f'/api/projects/projects/{project.id}/', HTTP_IF_NONE_MATCH=project_etag)
+    assert response.status_code == status.HTTP_200_OK
+
+    # And: list ETags change when the list grows
+    list_etag = client.get('/api/projects/sessions/')['ETag']
+    response = client.get('/api/projects/sessions/', HTTP_IF_NONE_MATCH=list_etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    create_session(project, days=2)
+    response = client.get('/api/projects/sessions/', HTTP_IF_NONE_MATCH=list_etag)
+    assert response.status_code == status.HTTP_200_OK
+
+    # And: only changes to embedded user fields or skill names invalidate the session
+    etag = client.get(url)['ETag']
+    participant.last_login = datetime.now()
+    participant.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+    participant.about_me = 'Happy to pair'
+    participant.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response['ETag']
+    level.name = 'Beginner'
+    level.save()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_session_lists_reference_participants_through_a_user_table(client, create_developer, create_session):
+    """
+    Scenario: Listing sessions that share participants
+    Given a participant who joined several sessions
+    When I list the sessions
+    Then participants are referenced by id and summarized once in the users table,
+    and ?expand=participants inlines the full profiles instead
+    """
+    # Given: a participant who joined several sessions
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    host = create_developer('host')
+    participant = create_developer('participant', stack, level)
+    authenticate_client(client, host)
+    project = Project.objects.create(owner=host, name='Project', stack=stack, level=level)
+    for days in range(1, 4):
+        create_session(project, days=days).participants.add(participant)
+
+    # When: I list the sessions
+    response = client.get(reverse('user_hosted_sessions'))
+
+    # Then: participants are referenced by id and summarized once
+    participant.refresh_from_db()
+    assert [session['participants'] for session in response.data['results']] == [[participant.id]] * 3
+    assert response.data['users'] == {
+        participant.id: {
+            'id': participant.id,
+            'username': 'participant',
+            'avatar_url': str(participant.photo),
+            'stack': stack.id,
+            'level': level.id,
+        }
+    }
+
+    # And: ?expand=participants inlines the full profiles instead
+    response = client.get(reverse('user_hosted_sessions'), {'expand': 'participants'})
+    assert response.data['results'][0]['participants'][0]['email'] == 'participant@example.com'
+    assert 'users' not in response.data
+
+
+@pytest.mark.django_db
+@pytest.mark.skip_query_budget
+def test_query_budgets_report_views_running_too_many_queries(
+        client, settings, monkeypatch, create_developer, create_session):
+    """
+    Scenario: A view running more queries than its budget
+    Given a session list whose budget is lowered below its query count
+    When I list the sessions while budgets are enforced
+    Then the view is reported with its query count, and queries repeated per row
+    are recognized as the same shape
+    """
+    # Given: a session list whose budget is lowered below its query count
+    settings.QUERY_BUDGET_REPEAT_THRESHOLD = 3
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    host = create_developer('host')
+    authenticate_client(client, host)
+    project = Project.objects.create(owner=host, name='Project', stack=stack, level=level)
+    sessions = [create_session(project, days=days) for days in range(1, 4)]
+    monkeypatch.setattr(SessionViewSet, 'query_budget', {'list': 1})
+
+    # When: I list the sessions while budgets are enforced
+    with enforce_budgets() as violations:
+        response = client.get(reverse('session-list'))
+
+    # Then: the view is reported with its query count
+    assert response.status_code == status.HTTP_200_OK
+    assert [violation.view for violation in violations] == ['projects.views.SessionViewSet.list']
+    assert violations[0].budget == 1
+    assert violations[0].queries > 1
+
+    # And: queries repeated per row are recognized as the same shape
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        for session in sessions:
+            Session.objects.filter(id=session.id).exists()
+    assert recorder.count == 3
+    assert list(recorder.repeated_shapes().values()) == [3]
+
+
+@pytest.mark.django_db
+def test_query_stats_are_reported_per_view_to_admins(client, create_developer, create_session):
+    """
+    Scenario: Reading the query statistics recorded per view
+    Given the statistics were reset and a session list was requested
+    When an admin reads the query statistics
+    Then the session list is reported with its query count, and other users are refused
+    """
+    # Given: the statistics were reset and a session list was requested
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    admin = create_developer('admin', is_staff=True)
+    create_session(Project.objects.create(owner=admin, name='Project', stack=stack, level=level))
+    authenticate_client(client, admin)
+    assert client.delete(reverse('query_stats')).status_code == status.HTTP_204_NO_CONTENT
+    client.get(reverse('session-list'))
+
+    # When: an admin reads the query statistics
+    response = client.get(reverse('query_stats'))
+
+    # Then: the session list is reported with its query count
+    assert response.status_code == status.HTTP_200_OK
+    stats = response.data['projects.views.SessionViewSet.list']
+    assert stats['requests'] == 1
+    assert stats['max_queries'] > 0
+
+    # And: other users are refused
+    authenticate_client(client, create_developer('developer'))
+    assert client.get(reverse('query_stats')).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_fast_json_renderer_and_parser_match_drf(client, monkeypatch, create_developer, create_session):
+    """
+    Scenario: Rendering and parsing JSON with the fast codec
+    Given payloads holding datetimes, durations, decimals, lazy strings and id keys
+    When I render them with the fast renderer, with and without orjson installed
+    Then the bytes match DRF's JSONRenderer, floats in exponent form included,
+    NaN renders as null, and parsed bodies and errors match JSONParser
+    """
+    # Given: payloads holding datetimes, durations, decimals, lazy strings and id keys
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    host = create_developer('host')
+    authenticate_client(client, host)
+    project = Project.objects.create(owner=host, name='Project', stack=stack, level=level)
+    create_session(
+        project, schedule_date_time=datetime(2030, 5, 1, 10, 30, 15, 250),
+        duration=timedelta(hours=1, minutes=30), description='Line\u2028separator, caf\u00e9'
+    )
+    payloads = [
+        client.get(reverse('session-list')).data,
+        client.get(reverse('user_hosted_sessions')).data,
+        {
+            'when': datetime(2030, 5, 1, 10, 30, 15, 250),
+            'day': datetime(2030, 5, 1).date(),
+            'duration': timedelta(minutes=90),
+            'price': Decimal('12.50'),
+            'label': gettext_lazy('Hello'),
+            'ids': {1, 2},
+            7: [None, True, 1.5, 2 ** 70],
+        },
+        {'score': 1e16, 'floats': [1e-7, 1e-5, -2.5e-10, 1.5e300, 0.0001, 0.1], 'note': 'ratio:1e5'},
+    ]
+
+    # When: I render them with the fast renderer, with and without orjson installed
+    # Then: the bytes match DRF's JSONRenderer
+    for payload in payloads:
+        assert FastJSONRenderer().render(payload) == JSONRenderer().render(payload)
+        assert FastJSONRenderer().render(payload, 'application/json; indent=4') == \
+            JSONRenderer().render(payload, 'application/json; indent=4')
+    monkeypatch.setattr(renderers, 'orjson', None)
+    assert FastJSONRenderer().render(payloads[0]) == JSONRenderer().render(payloads[0])
+    monkeypatch.undo()
+
+    # And: NaN is the documented difference, written as null instead of raising
+    assert FastJSONRenderer().render({'score': float('nan')}) == b'{"score":null}'
+    with pytest.raises(ValueError):
+        JSONRenderer().render({'score': float('nan')})
+
+    # And: parsed bodies and errors match JSONParser
+    body = JSONRenderer().render(payloads[0])
+    assert FastJSONParser().parse(io.BytesIO(body)) == json.loads(body)
+    with pytest.raises(ParseError) as error:
+        FastJSONParser().parse(io.BytesIO(b'{"value": NaN}'))
+    assert 'JSON parse error' in str(error.value)
+
+
+@pytest.mark.django_db
+def test_emails_are_queued_and_delivered_by_the_outbox_worker(client, settings, create_developer, create_session):
+    """
+    Scenario: Sending an invitation through the outbox
+    Given I am the host of a session and a developer exists
+    When I invite the developer
+    Then the email is queued instead of sent, the worker delivers it, and failed
+    deliveries are retried with backoff until they are dead-lettered
+    """
+    # Given: I am the host of a session and a developer exists
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    host = create_developer('host')
+    developer = create_developer('developer')
+    authenticate_client(client, host)
+    project = Project.objects.create(owner=host, name='Project', stack=stack, level=level)
+    session = create_session(project)
+
+    # When: I invite the developer
+    response = client.post(reverse('invite_developer', args=[session.id, developer.id]))
+
+    # Then: the email is queued instead of sent
+    assert response.status_code == status.HTTP_200_OK
+    assert len(mail.outbox) == 0
+    email = OutboundEmail.objects.get()
+    assert email.to == ['developer@example.com']
+    assert email.status == OutboundEmail.Status.PENDING
+
+    # And: the worker delivers it
+    call_command('send_outbound_emails')
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == ['developer@example.com']
+    assert mail.outbox[0].alternatives[0][1] == 'text/html'
+    email.refresh_from_db()
+    assert email.status == OutboundEmail.Status.SENT
+    assert email.sent_at is not None
+
+    # And: failed deliveries are retried with backoff until they are dead-lettered
+    settings.EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+    settings.EMAIL_HOST, settings.EMAIL_PORT, settings.EMAIL_USE_TLS = 'localhost', 1, False
+    settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 3
+    client.post(reverse('invite_developer', args=[session.id, developer.id]))
+    failing = OutboundEmail.objects.get(status=OutboundEmail.Status.PENDING)
+
+    delays = []
+    for _ in range(3):
+        queued_at = datetime.now()
+        call_command('send_outbound_emails')
+        failing.refresh_from_db()
+        delays.append(round((failing.next_attempt_at - queued_at).total_seconds() / settings.EMAIL_OUTBOX_RETRY_DELAY))
+        OutboundEmail.objects.filter(pk=failing.pk).update(next_attempt_at=datetime.now())
+    assert delays[:2] == [1, 2]
+    assert failing.status == OutboundEmail.Status.DEAD
+    assert failing.attempts == 3
+    assert failing.last_error
+
+
+@pytest.mark.django_db
+def test_outbox_batches_reuse_one_connection_and_reconnect_on_failure(monkeypatch):
+    """
+    Scenario: Delivering a burst of queued emails
+    Given five queued emails
+    When the outbox is drained in batches of two
+    Then every batch goes over the same connection, a dropped connection is
+    reopened, and only the messages the server rejects are retried later
+    """
+    # Given: five queued emails
+    mail_delivery.close()
+    opened = []
+    monkeypatch.setattr(locmem.EmailBackend, 'open', lambda backend: opened.append(backend))
+    for index in range(5):
+        queue_email(f'Email {index}', 'Text', '<p>Html</p>', [f'dev{index}@example.com'])
+
+    # When: the outbox is drained in batches of two
+    totals = drain(batch_size=2)
+
+    # Then: every batch goes over the same connection
+    assert (totals['sent'], totals['failed'], len(totals['batch_seconds'])) == (5, 0, 3)
+    assert len(opened) == 1
+    assert len(mail.outbox) == 5
+
+    # And: a dropped connection is reopened
+    send_messages = locmem.EmailBackend.send_messages
+    calls = []
+
+    def flaky_send_messages(backend, messages):
+        calls.append(messages)
+        if len(calls) == 1:
+            raise SMTPServerDisconnected('Connection unexpectedly closed')
+        if any('bounce@example.com' in message.to for message in messages):
+            raise SMTPRecipientsRefused({'bounce@example.com': (550, b'Recipient refused')})
+        return send_messages(backend, messages)
+
+    monkeypatch.setattr(locmem.EmailBackend, 'send_messages', flaky_send_messages)
+    for recipient in ('first@example.com', 'bounce@example.com', 'last@example.com'):
+        queue_email('Burst', 'Text', '', [recipient])
+    totals = drain(batch_size=10)
+
+    # And: only the messages the server rejects are retried later
+    assert (totals['sent'], totals['failed']) == (2, 1)
+    assert len(opened) == 2
+    assert [message.to for message in mail.outbox[5:]] == [['first@example.com'], ['last@example.com']]
+    bounced = OutboundEmail.objects.get(to=['bounce@example.com'])
+    assert bounced.status == OutboundEmail.Status.PENDING
+    assert bounced.attempts == 1
+    mail_delivery.close()
+
+
+@pytest.mark.django_db
+def test_outbox_never_resends_an_accepted_email(monkeypatch):
+    """
+    Scenario: The server rejects an email in the middle of a batch
+    Given three queued emails
+    When the second one fails after the first was accepted
+    Then the first email is delivered exactly once and only the second is retried later
+    """
+    # Given: three queued emails
+    mail_delivery.close()
+    for recipient in ('first@example.com', 'broken@example.com', 'last@example.com'):
+        queue_email('Batch', 'Text', '', [recipient])
+
+    # When: the second one fails after the first was accepted
+    send_messages = locmem.EmailBackend.send_messages
+
+    def failing_send_messages(backend, messages):
+        for message in messages:
+            if 'broken@example.com' in message.to:
+                raise SMTPDataError(554, b'Message rejected')
+            send_messages(backend, [message])
+        return len(messages)
+
+    monkeypatch.setattr(locmem.EmailBackend, 'send_messages', failing_send_messages)
+    totals = drain(batch_size=10)
+
+    # Then: the first email is delivered exactly once and only the second is retried later
+    assert (totals['sent'], totals['failed']) == (2, 1)
+    assert [message.to for message in mail.outbox] == [['first@example.com'], ['last@example.com']]
+    assert OutboundEmail.objects.get(to=['broken@example.com']).status == OutboundEmail.Status.PENDING
+    mail_delivery.close()
+
+
+@pytest.mark.django_db
+def test_outbox_keeps_accepted_emails_when_a_batch_fails(settings, monkeypatch):
+    """
+    Scenario: A worker fails in the middle of a batch
+    Given three queued emails and a lease that expires right away
+    When recording the result of the second email fails
+    Then the first email stays sent, the others are claimed again by the next batch,
+    and the first email is never sent again
+    """
+    # Given: three queued emails and a lease that expires right away
+    settings.EMAIL_OUTBOX_LEASE = 0
+    mail_delivery.close()
+    for recipient in ('first@example.com', 'second@example.com', 'third@example.com'):
+        queue_email('Batch', 'Text', '', [recipient])
+
+    # When: recording the result of the second email fails
+    mark_sent = outbox.mark_sent
+
+    def failing_mark_sent(email):
+        if email.to == ['second@example.com']:
+            raise DatabaseError('Connection lost')
+        mark_sent(email)
+
+    monkeypatch.setattr(outbox, 'mark_sent', failing_mark_sent)
+    with pytest.raises(DatabaseError):
+        drain(batch_size=10)
+
+    # Then: the first email stays sent and the others are left claimed
+    assert list(OutboundEmail.objects.order_by('id').values_list('status', flat=True)) == [
+        OutboundEmail.Status.SENT, OutboundEmail.Status.SENDING, OutboundEmail.Status.SENDING
+    ]
+
+    # And: the next batch claims them again without sending the first email twice
+    monkeypatch.setattr(outbox, 'mark_sent', mark_sent)
+    assert drain(batch_size=10)['sent'] == 2
+    assert [message.to for message in mail.outbox].count(['first@example.com']) == 1
+    assert not OutboundEmail.objects.exclude(status=OutboundEmail.Status.SENT).exists()
+    mail_delivery.close()
+
+
+@pytest.mark.django_db
+def test_bulk_invite_queues_one_email_per_developer(client, create_developer, create_session):
+    """
+    Scenario: Inviting several developers to a session at once
+    Given I host a session with one participant already confirmed
+    When I invite several developers, the participant and an unknown id in one request
+    Then each developer gets an invitation through a single outbox insert, and the
+    response reports the outcome per developer
+    """
+    # Given: I host a session with one participant already confirmed
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    host = create_developer('host')
+    developers = [create_developer(f'developer{index}') for index in range(3)]
+    authenticate_client(client, host)
+    project = Project.objects.create(owner=host, name='Project', stack=stack, level=level)
+    session = create_session(project)
+    session.participants.add(developers[2])
+    developer_ids = [developers[0].id, developers[1].id, developers[2].id, 999999, developers[0].id]
+
+    # When: I invite several developers, the participant and an unknown id in one request
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(
+            reverse('invite_developers', args=[session.id]), {'developer_ids': developer_ids},
+            content_type='application/json'
+        )
+
+    # Then: each developer gets an invitation through a single outbox insert
+    assert response.status_code == status.HTTP_200_OK
+    assert sum('INSERT INTO "projects_outboundemail"' in query['sql'] for query in queries.captured_queries) == 1
+    assert sorted(email.to[0] for email in OutboundEmail.objects.all()) == [
+        'developer0@example.com', 'developer1@example.com'
+    ]
+    email = OutboundEmail.objects.get(to=['developer1@example.com'])
+    assert 'developer1' in email.body and 'developer1' in email.html_body
+
+    # And: the response reports the outcome per developer
+    assert response.data == {
+        'invited': 2,
+        'results': [
+            {'developer_id': developers[0].id, 'status': 'invited'},
+            {'developer_id': developers[1].id, 'status': 'invited'},
+            {'developer_id': developers[2].id, 'status': 'already_participant'},
+            {'developer_id': 999999, 'status': 'not_found'},
+        ],
+    }
+
+    # And: only the host can invite, with a list of integer ids
+    authenticate_client(client, developers[0])
+    response = client.post(
+        reverse('invite_developers', args=[session.id]), {'developer_ids': [developers[1].id]},
+        content_type='application/json'
+    )
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    authenticate_client(client, host)
+    response = client.post(
+        reverse('invite_developers', args=[session.id]), {'developer_ids': ['abc']}, content_type='application/json'
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_interest_is_summarized_in_one_digest_per_owner(client, settings, create_developer, create_session):
+    """
+    Scenario: Interest digests
+    Given interest digests are enabled and my sessions attract several developers
+    When the digest command runs before and after the digest window
+    Then no email is sent per interest, and once the window passes I get a single
+    summary of all pending interest, linking to the sessions, that is not sent again
+    """
+    # Given: interest digests are enabled and my sessions attract several developers
+    settings.INTEREST_DIGEST_ENABLED = True
+    settings.INTEREST_DIGEST_WINDOW = 30
+    settings.FRONTEND_URL = 'https://pairconnect.example.com/'
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    owner = create_developer('owner')
+    project = Project.objects.create(owner=owner, name='Project', stack=stack, level=level)
+    sessions = [create_session(project, name=f'Session {index}') for index in range(2)]
+    for index, session in enumerate([sessions[0], sessions[0], sessions[1]]):
+        authenticate_client(client, create_developer(f'developer{index}'))
+        response = client.post('/api/projects/interested-participants/', {'session': session.id})
+        assert response.status_code == status.HTTP_201_CREATED
+
+    # When: the digest command runs before the digest window
+    call_command('send_interest_digests')
+
+    # Then: no email is sent per interest
+    assert OutboundEmail.objects.count() == 0
+
+    # When: the digest command runs after the digest window
+    InterestedParticipant.objects.update(date_created_interested=datetime.now() - timedelta(minutes=31))
+    with CaptureQueriesContext(connection) as queries:
+        call_command('send_interest_digests')
+
+    # Then: I get a single summary of all pending interest
+    digest = OutboundEmail.objects.get()
+    assert digest.to == ['owner@example.com']
+    assert 'developer0, developer1' in digest.body and 'developer2' in digest.body
+    assert f'https://pairconnect.example.com/sessions/{sessions[1].id}/' in digest.body
+    assert sum(query['sql'].startswith('SELECT') for query in queries.captured_queries) == 1
+    assert not InterestedParticipant.objects.filter(owner_notified_at__isnull=True).exists()
+
+    # And: it is not sent again
+    call_command('send_interest_digests')
+    assert OutboundEmail.objects.count() == 1
+
+
+def test_email_templates_are_compiled_once_at_warm_up(monkeypatch):
+    """
+    Scenario: Rendering emails after the warm-up
+    Given the email templates were warmed up
+    When every email template is rendered
+    Then none of them is read from disk again
+    """
+    # Given: the email templates were warmed up
+    assert warm_email_templates() == len(EMAIL_TEMPLATES)
+
+    def read_from_disk(loader, origin):
+        raise AssertionError(f"{origin.template_name} was read from disk")
+
+    monkeypatch.setattr(filesystem.Loader, 'get_contents', read_from_disk)
 
+    # When: every email template is rendered
+    # Then: none of them is read from disk again
+    for name in EMAIL_TEMPLATES:
+        assert render_to_string(name, {'owner_name': 'owner', 'sessions': []})
@@ -12,9 +12,13 @@ from .views import (
     UserInterestedSessionsView,
     UserParticipatingSessionsView,
     UserSessionsView,
+    get_batch_suggested_developers,
+    get_query_stats,
     get_suggested_developers,
+    get_suggestion_cache_stats,
     get_suggested_sessions_for_user,
     invite_developer_to_session,
+    invite_developers_to_session,
 )
 
 router = DefaultRouter()
@@ -28,6 +32,11 @@ urlpatterns = [
         SessionsByProjectView.as_view(),
         name="sessions_by_project",
     ),
+    path(
+        "sessions/suggested-developers/",
+        get_batch_suggested_developers,
+        name="batch_suggested_developers",
+    ),
     path(
         "sessions/<int:session_id>/suggested-developers/",
         get_suggested_developers,
@@ -38,6 +47,16 @@ urlpatterns = [
         get_suggested_sessions_for_user,
         name="suggested_sessions",
     ),
+    path(
+        "suggestions/cache-stats/",
+        get_suggestion_cache_stats,
+        name="suggestion_cache_stats",
+    ),
+    path(
+        "query-stats/",
+        get_query_stats,
+        name="query_stats",
+    ),
     path(
         "projects/<int:project_id>/sessions/",
         SessionsByProjectView.as_view(),
@@ -48,6 +67,11 @@ urlpatterns = [
         invite_developer_to_session,
         name="invite_developer",
     ),
+    path(
+        "sessions/<int:session_id>/invite/",
+        invite_developers_to_session,
+        name="invite_developers",
+    ),
     path(
         "sessions/<int:session_id>/check-interest/",
         CheckUserInterestView.as_view(),
@@ -0,0 +1,254 @@
+import abc
+
+from rest_framework import serializers
+
+from pair_connect.fieldsets import SparseFieldset
+from pair_connect.images import photo_url, upload_url
+from skills.models import ProgLanguage
+from users.models import CustomUser
+
+from .models import Project, Session
+
+_datetime_field = serializers.DateTimeField()
+_duration_field = serializers.DurationField()
+
+
+def _cloudinary_value(model_field, value):
+    """Mirrors how ModelSerializer renders a CloudinaryField through ``ModelField``."""
+    if value is None:
+        return None
+    return model_field.get_prep_value(value)
+
+
+def _group_by_first(rows):
+    grouped = {}
+    for row in rows:
+        grouped.setdefault(row[0], []).append(row[1:])
+    return grouped
+
+
+class ValuesListSerializer(abc.ABC):
+    """
+    Read-only counterpart of a ``ModelSerializer(many=True)`` list response.
+
+    Only the needed columns are fetched with ``values()``, each many-to-many
+    relation costs one extra query, and the representation is assembled as plain
+    dicts whose JSON is identical to the model serializer's output.
+    """
+
+    def __init__(self, queryset, fieldset=None):
+        self.queryset = queryset.prefetch_related(None)
+        self.fieldset = fieldset or SparseFieldset()
+
+    @property
+    def data(self):
+        return self.serialize(list(self.rows()))
+
+    def rows(self):
+        """The ``values()`` queryset to read, which can be paginated before serializing."""
+        return self.queryset.values(*self.columns)
+
+    def serialize(self, rows):
+        representations = self.to_representation(rows)
+        if not self.fieldset:
+            return representations
+        return [self.fieldset.filter(representation) for representation in representations]
+
+    @abc.abstractmethod
+    def to_representation(self, rows):
+        """Returns the list representation of ``rows``, the dicts read by ``rows()``."""
+
+
+class ParticipantValuesSerializer:
+    """Values-based ``CustomUserSerializer`` representation of session participants."""
+
+    columns = (
+        "id", "username", "email", "name", "photo", "about_me", "telephone", "linkedin_link",
+        "github_link", "discord_link", "stack_id", "stack__name", "level_id", "level__name",
+    )
+
+    def __init__(self, session_ids):
+        self.session_ids = session_ids
+        self.photo_field = CustomUser._meta.get_field("photo")
+
+    def by_session(self):
+        """Returns ``{session_id: [participant representation, ...]}``."""
+        rows = list(
+            CustomUser.objects.filter(sessions_joined__in=self.session_ids).values_list(
+                "sessions_joined", *self.columns
+            )
+        )
+        languages = _group_by_first(
+            ProgLanguage.objects.filter(
+                customuser__in={row[1] for row in rows}
+            ).values_list("customuser", "id", "name")
+        )
+
+        representations = {}
+        participants = {}
+        for row in rows:
+            user = dict(zip(self.columns, row[1:]))
+            if user["id"] not in representations:
+                representations[user["id"]] = self.to_representation(user, languages.get(user["id"], []))
+            participants.setdefault(row[0], []).append(representations[user["id"]])
+        return participants
+
+    def to_representation(self, user, languages):
+        representation = {
+            "id": user["id"],
+            "username": user["username"],
+            "email": user["email"],
+            "name": user["name"],
+            "photo": _cloudinary_value(self.photo_field, user["photo"]),
+            "about_me": user["about_me"],
+            "telephone": user["telephone"],
+            "linkedin_link": user["linkedin_link"],
+            "github_link": user["github_link"],
+            "discord_link": user["discord_link"],
+            "stack": user["stack_id"],
+        }
+        if user["stack_id"] is not None:
+            representation["stack_name"] = user["stack__name"]
+        representation["level"] = user["level_id"]
+        representation["prog_language"] = [language_id for language_id, _ in languages]
+        representation["language_names"] = [name for _, name in languages]
+        if user["level_id"] is not None:
+            representation["level_name"] = user["level__name"]
+        if user["photo"]:
+            representation["photo"] = photo_url(user["photo"])
+        return representation
+
+
+class SessionValuesSerializer(ValuesListSerializer):
+    """Values-based ``SessionSerializer(many=True)`` representation."""
+
+    def __init__(self, queryset, fieldset=None, expand_participants=True):
+        super().__init__(queryset, fieldset)
+        self.expand_participants = expand_participants
+
+    columns = (
+        "id", "name", "description", "schedule_date_time", "duration", "stack_id", "stack__name",
+        "level_id", "level__name", "project_id", "project__name", "project__image", "host_id",
+        "host__username", "host__photo", "session_link", "participant_limit", "public",
+    )
+
+    def to_representation(self, rows):
+        session_ids = [row["id"] for row in rows]
+        languages = {}
+        if "language_names" in self.fieldset:
+            languages = _group_by_first(
+                ProgLanguage.objects.filter(session__in=session_ids).values_list("session", "name")
+            )
+        if "participants" not in self.fieldset:
+            participants = {}
+        elif self.expand_participants:
+            participants = ParticipantValuesSerializer(session_ids).by_session()
+        else:
+            participants = _group_by_first(
+                CustomUser.objects.filter(sessions_joined__in=session_ids).values_list("sessions_joined", "id")
+            )
+            participants = {
+                session_id: [user_id for user_id, in user_ids] for session_id, user_ids in participants.items()
+            }
+
+        return [
+            self.session_representation(
+                row, languages.get(row["id"], []), participants.get(row["id"], [])
+            )
+            for row in rows
+        ]
+
+    def session_representation(self, row, languages, participants):
+        representation = {
+            "id": row["id"],
+            "name": row["name"],
+            "description": row["description"],
+            "schedule_date_time": _datetime_field.to_representation(row["schedule_date_time"]),
+            "duration": _duration_field.to_representation(row["duration"]),
+        }
+        if row["stack_id"] is not None:
+            representation["stack_name"] = row["stack__name"]
+        if row["level_id"] is not None:
+            representation["level_name"] = row["level__name"]
+        representation["language_names"] = [name for name, in languages]
+        representation["project_id"] = row["project_id"]
+        representation["project_name"] = row["project__name"]
+        representation["project_image_url"] = (
+            upload_url(row["project__image"]) if row["project__image"] else None
+        )
+        representation["owner_id"] = row["host_id"]
+        if row["host_id"] is not None:
+            representation["owner_name"] = row["host__username"]
+            if row["host__photo"] is not None:
+                representation["owner_avatar_url"] = row["host__photo"].url
+        representation["participants"] = participants
+        representation["session_link"] = row["session_link"]
+        representation["participant_limit"] = row["participant_limit"]
+        representation["public"] = row["public"]
+        representation["is_private"] = not row["public"]
+        return representation
+
+
+class ProjectValuesSerializer(ValuesListSerializer):
+    """Values-based ``ProjectSerializer(many=True)`` representation."""
+
+    columns = (
+        "id", "name", "description", "image", "date_created", "stack__name", "level__name", "owner_id",
+        "owner__username", "owner__photo",
+    )
+
+    def __init__(self, queryset, fieldset=None, expanded=()):
+        super().__init__(queryset, fieldset)
+        self.expanded = expanded
+        self.image_field = Project._meta.get_field("image")
+
+    def to_representation(self, rows):
+        project_ids = [row["id"] for row in rows]
+        languages = {}
+        if "language_names" in self.fieldset:
+            languages = _group_by_first(
+                ProgLanguage.objects.filter(project__in=project_ids).values_list("project", "name")
+            )
+        sessions = self.sessions_by_project(project_ids) if "sessions" in self.fieldset else {}
+
+        return [
+            self.project_representation(row, languages.get(row["id"], []), sessions.get(row["id"], []))
+            for row in rows
+        ]
+
+    def sessions_by_project(self, project_ids):
+        """Returns session ids, or session representations when expanded, per project id."""
+        sessions = {}
+        if "sessions" in self.expanded:
+            for session in SessionValuesSerializer(
+                Session.objects.filter(project__in=project_ids),
+                expand_participants="sessions.participants" in self.expanded,
+            ).data:
+                sessions.setdefault(session["project_id"], []).append(session)
+        else:
+            for project_id, session_id in Session.objects.filter(
+                    project__in=project_ids).values_list("project", "id"):
+                sessions.setdefault(project_id, []).append(session_id)
+        return sessions
+
+    def project_representation(self, row, languages, sessions):
+        representation = {
+            "id": row["id"],
+            "name": row["name"],
+            "description": row["description"],
+            "image": _cloudinary_value(self.image_field, row["image"]),
+            "stack_name": row["stack__name"],
+            "language_names": [name for name, in languages],
+            "level_name": row["level__name"],
+        }
+        if row["image"] is not None:
+            image_url = row["image"].url
+            representation["image_url"] = None if image_url is None else str(image_url)
+        representation["owner_id"] = row["owner_id"]
+        if row["owner_id"] is not None:
+            representation["owner_name"] = row["owner__username"]
+        representation["owner_avatar_url"] = (
+            upload_url(row["owner__photo"]) if row["owner__photo"] else None
+        )
+        representation["sessions"] = sessions
+        return representation
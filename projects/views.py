@@ -1,12 +1,20 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
+from pair_connect import query_budget
+from pair_connect.conditional import ConditionalGetMixin
+from pair_connect.fieldsets import SparseFieldset
+from pair_connect.pagination import InterestCursorPagination, ProjectCursorPagination, SessionCursorPagination
 from rest_framework import generics, permissions, serializers, status, viewsets
-from rest_framework.decorators import action, api_view
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.exceptions import ValidationError
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from skills.masks import filter_shared_languages, language_mask
 from users.models import CustomUser
-from users.serializers import CustomUserSerializer
+from users.serializers import CustomUserSerializer, UserSummarySerializer
 from .email_service import EmailService
 from .models import InterestedParticipant, Project, Session
 from .serializers import (
@@ -15,8 +23,13 @@ from .serializers import (
     SessionDetailSerializer,
     SessionParticipantSerializer,
     SessionSerializer,
+    get_expanded_fields,
 )
 from .services import (
+    RANKING_MODES,
+    RANKING_TIER,
+    BatchDeveloperSuggestionService,
+    BulkInvitationService,
     DeveloperSuggestionService,
     InvitationService,
     SessionCreationService,
@@ -24,12 +37,145 @@ from .services import (
     InterestNotificationService,
     ConfirmationNotificationService,
 )
+from .suggestion_cache import developer_suggestion_cache, get_stats, session_suggestion_cache
+from .values_serializers import ProjectValuesSerializer, SessionValuesSerializer
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+def filter_by_languages(queryset, request):
+    """Applies the optional ``?languages=1,2`` filter using the denormalized language mask."""
+    language_ids = request.query_params.get("languages")
+    if not language_ids:
+        return queryset
+
+    try:
+        language_ids = [int(language_id) for language_id in language_ids.split(",") if language_id]
+    except ValueError:
+        raise ValidationError("languages must be a comma-separated list of ids.")
+
+    return filter_shared_languages(queryset, language_mask(language_ids))
+
+
+def session_list_queryset(request, participants=True):
+    """Session list query plan trimmed to the request's sparse fieldset."""
+    return Session.objects.with_list_relations(
+        participants=participants, fields=SparseFieldset.from_request(request)
+    )
+
+
+def compacts_participants(request):
+    """
+    Whether session lists reference participants by id and resolve them through a
+    per-response ``users`` table. ``?expand=participants`` inlines full profiles
+    instead, and so do the legacy unpaginated responses.
+    """
+    return not settings.UNPAGINATED_LIST_RESPONSES and "participants" not in get_expanded_fields(request)
+
+
+def get_user_table(sessions_data):
+    """Summaries of the participants referenced in ``sessions_data``, each serialized once."""
+    user_ids = {user_id for session in sessions_data for user_id in session.get("participants", ())}
+    users = CustomUser.objects.filter(id__in=user_ids).order_by("id")
+    return {user["id"]: user for user in UserSummarySerializer(users, many=True).data}
+
+
+class ValuesListMixin:
+    """
+    Serves list responses through ``values_serializer_class``, a read-only
+    values-based equivalent of ``serializer_class``. Pages are cut from the
+    ``values()`` rows, so only the rows of the current page are serialized.
+    """
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if not settings.VALUES_LIST_SERIALIZERS_ENABLED:
+            return super().list(request, *args, **kwargs)
+
+        # Instantiating the serializer validates ?fields= and ?omit=.
+        fieldset = self.get_serializer().fieldset
+        values_serializer = self.get_values_serializer(self.filter_queryset(self.get_queryset()), fieldset)
+        rows = values_serializer.rows()
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+        return Response(values_serializer.serialize(list(rows)))
+
+    def get_values_serializer(self, queryset, fieldset):
+        return self.values_serializer_class(queryset, fieldset)
+
+
+class SessionListMixin(ConditionalGetMixin, ValuesListMixin):
+    """
+    Shared behaviour of the session list endpoints: conditional GET, the
+    values-based fast path, cursor pagination and compact participants.
+    """
+    serializer_class = SessionSerializer
+    values_serializer_class = SessionValuesSerializer
+    pagination_class = SessionCursorPagination
+    query_budget = 8
+
+    def is_compact_list(self):
+        return getattr(self, "action", "list") == "list" and compacts_participants(self.request)
+
+    def get_session_queryset(self):
+        return session_list_queryset(self.request, participants=not self.is_compact_list())
+
+    def get_serializer(self, *args, **kwargs):
+        if self.is_compact_list():
+            kwargs.setdefault("expand_participants", False)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_values_serializer(self, queryset, fieldset):
+        return self.values_serializer_class(queryset, fieldset, expand_participants=not self.is_compact_list())
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.is_compact_list():
+            response.data["users"] = get_user_table(data)
+        return response
+
+
+class ProjectViewSet(ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
+    values_serializer_class = ProjectValuesSerializer
+    pagination_class = ProjectCursorPagination
     permission_classes = [IsAuthenticatedOrReadOnly]
+    query_budget = {"list": 10, "retrieve": 7}
+    relation_fields = {
+        "owner": ("owner_name", "owner_avatar_url"),
+        "stack": ("stack_name",),
+        "level": ("level_name",),
+    }
+
+    def get_queryset(self):
+        fieldset = SparseFieldset.from_request(self.request)
+        queryset = super().get_queryset()
+
+        related = [
+            relation for relation, fields in self.relation_fields.items()
+            if any(field in fieldset for field in fields)
+        ]
+        if related:
+            queryset = queryset.select_related(*related)
+        if "language_names" in fieldset:
+            queryset = queryset.prefetch_related("languages")
+        if "sessions" in fieldset:
+            queryset = queryset.prefetch_related(self.get_sessions_prefetch())
+        return filter_by_languages(queryset, self.request)
+
+    def get_sessions_prefetch(self):
+        """Loads only what the requested ``?expand=`` level of the sessions needs."""
+        expanded = get_expanded_fields(self.request)
+        if "sessions" not in expanded:
+            return Prefetch("sessions", queryset=Session.objects.only("id", "project_id"))
+        return Prefetch(
+            "sessions",
+            queryset=Session.objects.with_list_relations(participants="sessions.participants" in expanded),
+        )
+
+    def get_values_serializer(self, queryset, fieldset):
+        return self.values_serializer_class(queryset, fieldset, expanded=get_expanded_fields(self.request))
 
 
 class ProjectCreateView(generics.CreateAPIView):
@@ -41,10 +187,13 @@ class ProjectCreateView(generics.CreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class SessionViewSet(viewsets.ModelViewSet):
+class SessionViewSet(SessionListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedOrReadOnly]
     queryset = Session.objects.all()
-    serializer_class = SessionSerializer
+    query_budget = {"list": 9, "retrieve": 8}
+
+    def get_queryset(self):
+        return filter_by_languages(self.get_session_queryset(), self.request)
 
     def perform_create(self, serializer):
         project_id = self.request.data.get("project")
@@ -70,12 +219,10 @@ class SessionViewSet(viewsets.ModelViewSet):
         return response
 
 
-class SessionsByProjectView(generics.ListAPIView):
-    serializer_class = SessionSerializer
-
+class SessionsByProjectView(SessionListMixin, generics.ListAPIView):
     def get_queryset(self):
         project_id = self.kwargs["project_id"]
-        return Session.objects.filter(project__id=project_id)
+        return self.get_session_queryset().filter(project__id=project_id)
 
 
 class ConfirmParticipantView(APIView):
@@ -97,10 +244,11 @@ class ConfirmParticipantView(APIView):
             if session.participants.count() >= session.participant_limit > 0:
                 raise ValueError("Participant limit reached.")
 
-            session.participants.add(developer)
+            with transaction.atomic():
+                session.participants.add(developer)
 
-            confirmation_service = ConfirmationNotificationService(session, developer)
-            confirmation_service.send_confirmation()
+                confirmation_service = ConfirmationNotificationService(session, developer)
+                confirmation_service.send_confirmation()
 
             return Response(
                 {
@@ -125,6 +273,7 @@ class ConfirmParticipantView(APIView):
 class InterestedParticipantViewSet(viewsets.ModelViewSet):
     queryset = InterestedParticipant.objects.all()
     serializer_class = InterestedParticipantSerializer
+    pagination_class = InterestCursorPagination
     permission_classes = [IsAuthenticated]
 
     def perform_create(self, serializer):
@@ -140,10 +289,11 @@ class InterestedParticipantViewSet(viewsets.ModelViewSet):
             ).exists():
                 raise ValidationError("You are already interested in this session.")
 
-            interested_participant = serializer.save(user=self.request.user)
+            with transaction.atomic():
+                interested_participant = serializer.save(user=self.request.user)
 
-            notification_service = InterestNotificationService(session, self.request.user)
-            notification_service.send_notification()
+                notification_service = InterestNotificationService(session, self.request.user)
+                notification_service.send_notification()
 
             return Response(
                 {
@@ -169,7 +319,7 @@ class InterestedParticipantViewSet(viewsets.ModelViewSet):
         ).select_related("user")
 
         users = [participant.user for participant in interested_participants]
-        serializer = CustomUserSerializer(users, many=True)
+        serializer = CustomUserSerializer(users, many=True, context={"request": request})
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -194,10 +344,16 @@ class CheckUserInterestView(generics.GenericAPIView):
 @api_view(["GET"])
 def get_suggested_developers(request, session_id):
     try:
+        ranking = request.query_params.get("ranking", RANKING_TIER)
+        if ranking not in RANKING_MODES:
+            raise ValidationError(f"Invalid ranking. Choose one of: {', '.join(RANKING_MODES)}.")
+
         session = Session.objects.get(id=session_id)
-        suggestion_service = DeveloperSuggestionService(session)
-        suggested_developers = suggestion_service.get_suggested_developers()
-        serializer = CustomUserSerializer(suggested_developers, many=True)
+        suggestion_service = DeveloperSuggestionService(session, ranking=ranking)
+        suggested_developers = developer_suggestion_cache.get_or_compute(
+            session.id, ranking, suggestion_service.get_suggested_developers
+        )
+        serializer = CustomUserSerializer(suggested_developers, many=True, context={"request": request})
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -205,6 +361,57 @@ def get_suggested_developers(request, session_id):
         return Response(
             {"error": "Session not found"}, status=status.HTTP_404_NOT_FOUND
         )
+    except ValidationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(["POST"])
+def get_batch_suggested_developers(request):
+    try:
+        session_ids = request.data.get("session_ids")
+        if not isinstance(session_ids, list) or not session_ids:
+            raise ValidationError("session_ids must be a non-empty list.")
+        if len(session_ids) > BatchDeveloperSuggestionService.MAX_SESSIONS:
+            raise ValidationError(
+                f"At most {BatchDeveloperSuggestionService.MAX_SESSIONS} sessions can be requested at once."
+            )
+
+        limit = int(request.data.get("limit", DeveloperSuggestionService.SUGGESTION_LIMIT))
+        if not 1 <= limit <= BatchDeveloperSuggestionService.MAX_LIMIT:
+            raise ValidationError(f"limit must be between 1 and {BatchDeveloperSuggestionService.MAX_LIMIT}.")
+
+        sessions = list(Session.objects.filter(id__in=session_ids).select_related("stack", "level", "project"))
+        if any(request.user.id not in (session.host_id, session.project.owner_id) for session in sessions):
+            return Response(
+                {"error": "Only the host or the project owner can get suggestions for a session."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        suggestion_service = BatchDeveloperSuggestionService(sessions, limit=limit)
+        suggestions = suggestion_service.get_suggested_developer_ids()
+
+        user_ids = {user_id for ranked_ids in suggestions.values() for user_id in ranked_ids}
+        users = CustomUser.objects.filter(id__in=user_ids).select_related(
+            "stack", "level"
+        ).prefetch_related("prog_language")
+        serializer = CustomUserSerializer(users, many=True)
+
+        return Response(
+            {
+                "suggestions": suggestions,
+                "users": {user["id"]: user for user in serializer.data},
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    except (TypeError, ValueError):
+        return Response(
+            {"error": "session_ids and limit must be integers."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    except ValidationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
@@ -235,6 +442,42 @@ def invite_developer_to_session(request, session_id, developer_id):
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(["POST"])
+def invite_developers_to_session(request, session_id):
+    try:
+        session = Session.objects.select_related("project__owner").get(id=session_id)
+        if session.host != request.user:
+            return Response(
+                {"error": "Only the host can invite developers."}, status=status.HTTP_403_FORBIDDEN
+            )
+
+        developer_ids = request.data.get("developer_ids")
+        if not isinstance(developer_ids, list):
+            raise ValidationError("developer_ids must be a non-empty list.")
+
+        results = BulkInvitationService(session, developer_ids).send_invitations()
+        return Response(
+            {
+                "invited": sum(result["status"] == BulkInvitationService.INVITED for result in results),
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    except Session.DoesNotExist:
+        return Response(
+            {"error": "Session not found"}, status=status.HTTP_404_NOT_FOUND
+        )
+    except (TypeError, ValueError):
+        return Response(
+            {"error": "developer_ids must be integers."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    except ValidationError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class CheckUserParticipationView(generics.GenericAPIView):
     permission_classes = [IsAuthenticated]
 
@@ -267,13 +510,63 @@ class CheckUserParticipationView(generics.GenericAPIView):
             )
 
 
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def get_suggestion_cache_stats(request):
+    return Response(get_stats(), status=status.HTTP_200_OK)
+
+
+@api_view(["GET", "DELETE"])
+@permission_classes([IsAdminUser])
+def get_query_stats(request):
+    """
+    Query counts, DB time and repeated query shapes per view, as sampled by
+    QueryBudgetMiddleware in this worker process. DELETE starts a new sample.
+    """
+    if request.method == "DELETE":
+        query_budget.reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response(query_budget.get_stats(), status=status.HTTP_200_OK)
+
+
 @api_view(["GET"])
 def get_suggested_sessions_for_user(request):
     try:
+        ranking = request.query_params.get("ranking", RANKING_TIER)
+        if ranking not in RANKING_MODES:
+            raise ValidationError(f"Invalid ranking. Choose one of: {', '.join(RANKING_MODES)}.")
+
         user = request.user
-        session_suggestion_service = SessionSuggestionService(user)
-        suggested_sessions = session_suggestion_service.get_suggested_sessions()
-        serializer = SessionSerializer(suggested_sessions, many=True)
+        session_suggestion_service = SessionSuggestionService(user, ranking=ranking)
+
+        if "cursor" in request.query_params or "page_size" in request.query_params:
+            if ranking != RANKING_TIER:
+                raise ValidationError("Cursor pagination is only available for the tier ranking.")
+
+            try:
+                page_size = int(request.query_params.get("page_size", SessionSuggestionService.SUGGESTION_LIMIT))
+            except ValueError:
+                raise ValidationError("page_size must be an integer.")
+            page_size = max(1, min(page_size, SessionSuggestionService.MAX_PAGE_SIZE))
+
+            sessions, next_cursor = session_suggestion_service.get_suggested_sessions_page(
+                request.query_params.get("cursor"), page_size
+            )
+            return Response(
+                {
+                    "results": SessionSerializer(sessions, many=True, context={"request": request}).data,
+                    "next_cursor": next_cursor,
+                },
+                status=status.HTTP_200_OK,
+            )
+
+        if ranking == RANKING_TIER:
+            suggested_sessions = session_suggestion_service.get_recommended_sessions()
+        else:
+            suggested_sessions = session_suggestion_cache.get_or_compute(
+                user.id, ranking, session_suggestion_service.get_suggested_sessions
+            )
+        serializer = SessionSerializer(suggested_sessions, many=True, context={"request": request})
 
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -283,57 +576,70 @@ def get_suggested_sessions_for_user(request):
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class UserHostedSessionsView(generics.ListAPIView):
+class UserHostedSessionsView(SessionListMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
-    serializer_class = SessionSerializer
 
     def get_queryset(self):
         user = self.request.user
-        return Session.objects.filter(host=user)
+        return self.get_session_queryset().filter(host=user)
 
 
-class UserParticipatingSessionsView(generics.ListAPIView):
+class UserParticipatingSessionsView(SessionListMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
-    serializer_class = SessionSerializer
 
     def get_queryset(self):
         user = self.request.user
-        return Session.objects.filter(participants=user)
+        return self.get_session_queryset().filter(participants=user)
 
 
-class UserInterestedSessionsView(generics.ListAPIView):
+class UserInterestedSessionsView(SessionListMixin, generics.ListAPIView):
     permission_classes = [permissions.IsAuthenticated]
-    serializer_class = SessionSerializer
 
     def get_queryset(self):
         user = self.request.user
         interested_sessions_ids = InterestedParticipant.objects.filter(
             user=user
         ).values_list("session_id", flat=True)
-        return Session.objects.filter(id__in=interested_sessions_ids)
+        return self.get_session_queryset().filter(id__in=interested_sessions_ids)
 
 
 class UserSessionsView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 15
 
     def get(self, request):
         user = request.user
+        compact = compacts_participants(request)
 
-        hosted_sessions = Session.objects.filter(host=user)
-        participating_sessions = Session.objects.filter(participants=user)
+        hosted_sessions = session_list_queryset(request, participants=not compact).filter(host=user)
+        participating_sessions = session_list_queryset(request, participants=not compact).filter(participants=user)
         interested_sessions_ids = InterestedParticipant.objects.filter(
             user=user
         ).values_list("session_id", flat=True)
-        interested_sessions = Session.objects.filter(id__in=interested_sessions_ids)
-
-        hosted_serializer = SessionSerializer(hosted_sessions, many=True)
-        participating_serializer = SessionSerializer(participating_sessions, many=True)
-        interested_serializer = SessionSerializer(interested_sessions, many=True)
-
-        return Response(
-            {
-                "hosted_sessions": hosted_serializer.data,
-                "participating_sessions": participating_serializer.data,
-                "interested_sessions": interested_serializer.data,
-            }
+        interested_sessions = session_list_queryset(request, participants=not compact).filter(
+            id__in=interested_sessions_ids
         )
+
+        context = {"request": request}
+        if settings.VALUES_LIST_SERIALIZERS_ENABLED:
+            fieldset = SessionSerializer(context=context).fieldset
+            values_kwargs = {"fieldset": fieldset, "expand_participants": not compact}
+            hosted_serializer = SessionValuesSerializer(hosted_sessions, **values_kwargs)
+            participating_serializer = SessionValuesSerializer(participating_sessions, **values_kwargs)
+            interested_serializer = SessionValuesSerializer(interested_sessions, **values_kwargs)
+        else:
+            serializer_kwargs = {"many": True, "context": context, "expand_participants": not compact}
+            hosted_serializer = SessionSerializer(hosted_sessions, **serializer_kwargs)
+            participating_serializer = SessionSerializer(participating_sessions, **serializer_kwargs)
+            interested_serializer = SessionSerializer(interested_sessions, **serializer_kwargs)
+
+        data = {
+            "hosted_sessions": hosted_serializer.data,
+            "participating_sessions": participating_serializer.data,
+            "interested_sessions": interested_serializer.data,
+        }
+        if compact:
+            data["users"] = get_user_table(
+                data["hosted_sessions"] + data["participating_sessions"] + data["interested_sessions"]
+            )
+        return Response(data)
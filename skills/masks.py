@@ -0,0 +1,56 @@
+from django.db.models import F
+
+from .models import ProgLanguage
+
+# Masks are stored in signed BigIntegerFields, so only 63 bits are usable.
+LANGUAGE_MASK_BITS = 63
+
+
+def next_language_bit():
+    """
+    Returns the lowest bit no language holds. Languages get a bit of their own, so
+    a shared bit always means a shared language; once all of them are taken, new
+    languages are refused until the masks are widened.
+    """
+    taken = set(ProgLanguage.objects.exclude(mask_bit=None).values_list('mask_bit', flat=True))
+    for bit in range(LANGUAGE_MASK_BITS):
+        if bit not in taken:
+            return bit
+    raise ValueError(f"All {LANGUAGE_MASK_BITS} language mask bits are taken.")
+
+
+def language_bit(mask_bit):
+    return 1 << mask_bit
+
+
+def mask_of_bits(mask_bits):
+    mask = 0
+    for mask_bit in mask_bits:
+        mask |= language_bit(mask_bit)
+    return mask
+
+
+def language_mask(language_ids):
+    """Mask of the given language ids, built from the bits they were assigned."""
+    return mask_of_bits(ProgLanguage.objects.filter(pk__in=language_ids).values_list('mask_bit', flat=True))
+
+
+def filter_shared_languages(queryset, mask, field='language_mask'):
+    """Keeps rows whose ``field`` shares at least one language bit with ``mask``."""
+    if not mask:
+        return queryset.none()
+    return queryset.alias(shared_language_bits=F(field).bitand(mask)).exclude(shared_language_bits=0)
+
+
+def refresh_language_masks(model, relation_name, object_ids):
+    """Recomputes ``language_mask`` for the given rows from their ``relation_name`` M2M."""
+    masks = dict.fromkeys(object_ids, 0)
+    rows = model.objects.filter(
+        pk__in=object_ids, **{f'{relation_name}__isnull': False}
+    ).values_list('pk', f'{relation_name}__mask_bit')
+    for object_id, mask_bit in rows:
+        masks[object_id] |= language_bit(mask_bit)
+
+    for object_id, mask in masks.items():
+        model.objects.filter(pk=object_id).update(language_mask=mask)
+    return masks
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:26
+
+from django.db import migrations, models
+
+LANGUAGE_MASK_BITS = 63
+
+
+def assign_mask_bits(apps, schema_editor):
+    """
+    Gives every language a bit of its own and rebuilds the stored masks, which
+    wrapped language ids around 63 bits and kept the bits of deleted languages.
+    """
+    ProgLanguage = apps.get_model('skills', 'ProgLanguage')
+    languages = list(ProgLanguage.objects.order_by('id'))
+    if len(languages) > LANGUAGE_MASK_BITS:
+        raise RuntimeError(f"{len(languages)} languages do not fit in {LANGUAGE_MASK_BITS} mask bits.")
+
+    for bit, language in enumerate(languages):
+        language.mask_bit = bit
+    ProgLanguage.objects.bulk_update(languages, ['mask_bit'])
+
+    bits = {language.id: language.mask_bit for language in languages}
+    for app_label, model_name, relation_name, owner_field in (
+            ('users', 'CustomUser', 'prog_language', 'customuser_id'),
+            ('projects', 'Project', 'languages', 'project_id'),
+            ('projects', 'Session', 'languages', 'session_id'),
+    ):
+        model = apps.get_model(app_label, model_name)
+        masks = dict.fromkeys(model.objects.exclude(language_mask=0).values_list('pk', flat=True), 0)
+        for owner_id, language_id in getattr(model, relation_name).through.objects.values_list(
+                owner_field, 'proglanguage_id'):
+            masks[owner_id] = masks.get(owner_id, 0) | (1 << bits[language_id])
+        for owner_id, mask in masks.items():
+            model.objects.filter(pk=owner_id).update(language_mask=mask)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0004_dataversion'),
+        ('users', '0007_customuser_language_mask'),
+        ('projects', '0015_project_language_mask_session_language_mask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='proglanguage',
+            name='mask_bit',
+            field=models.PositiveSmallIntegerField(editable=False, null=True, unique=True),
+        ),
+        migrations.RunPython(assign_mask_bits, migrations.RunPython.noop),
+    ]
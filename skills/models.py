@@ -23,6 +23,19 @@ class Level(models.Model):
 
 class ProgLanguage(models.Model):
     name = models.CharField(max_length=100)
+    mask_bit = models.PositiveSmallIntegerField(unique=True, null=True, editable=False)
 
     def __str__(self):
         return self.name
+
+
+class DataVersion(models.Model):
+    """
+    Named version counters shared by every process. A version moves when the data
+    it describes changes, so process-local copies know when to reload.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.name}@{self.value}'
@@ -0,0 +1,52 @@
+import json
+import threading
+
+from pair_connect.conditional import make_etag
+
+from .models import Level, ProgLanguage, Stack
+from .serializers import LevelSerializer, ProgLanguageSerializer, StackSerializer
+from .versions import REFERENCE_DATA, get_version
+
+REFERENCE_TABLES = {
+    'stacks': (Stack, StackSerializer),
+    'levels': (Level, LevelSerializer),
+    'languages': (ProgLanguage, ProgLanguageSerializer),
+}
+
+
+class ReferenceDataCache:
+    """
+    Process-local copy of the stack, level and language tables. The tables are
+    read on first use and again only after a save or delete moved the
+    ``REFERENCE_DATA`` version kept in the database, so every worker picks up a
+    change on its next request while a request costs a single version lookup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._tables = None
+        self._etags = None
+
+    def get(self, name=None):
+        """Returns ``(data, etag)`` for one table, or for all of them when ``name`` is None."""
+        version = get_version(REFERENCE_DATA)
+        with self._lock:
+            if self._version != version:
+                self._load()
+                self._version = version
+
+            if name is None:
+                return self._tables, self._etags[None]
+            return self._tables[name], self._etags[name]
+
+    def _load(self):
+        self._tables = {
+            name: [dict(item) for item in serializer_class(model.objects.order_by('id'), many=True).data]
+            for name, (model, serializer_class) in REFERENCE_TABLES.items()
+        }
+        self._etags = {name: make_etag(json.dumps(table)) for name, table in self._tables.items()}
+        self._etags[None] = make_etag(json.dumps(self._tables))
+
+
+reference_data = ReferenceDataCache()
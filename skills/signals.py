@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .masks import next_language_bit
+from .models import Level, ProgLanguage, Stack
+from .versions import REFERENCE_DATA, bump_version
+
+
+@receiver(post_save, sender=Stack)
+@receiver(post_save, sender=Level)
+@receiver(post_save, sender=ProgLanguage)
+@receiver(post_delete, sender=Stack)
+@receiver(post_delete, sender=Level)
+@receiver(post_delete, sender=ProgLanguage)
+def invalidate_reference_data(sender, **kwargs):
+    bump_version(REFERENCE_DATA)
+
+
+@receiver(pre_save, sender=ProgLanguage)
+def assign_language_mask_bit(sender, instance, **kwargs):
+    if instance.mask_bit is None:
+        instance.mask_bit = next_language_bit()
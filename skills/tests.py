@@ -1,3 +1,72 @@
-from django.test import TestCase
+import pytest
+from rest_framework import status
 
-# Create your tests here.
+from skills.masks import LANGUAGE_MASK_BITS
+from skills.models import Level, ProgLanguage, Stack
+
+
+@pytest.mark.django_db
+def test_reference_data_is_served_from_cache_until_it_changes(client, django_assert_num_queries):
+    """
+    Scenario: Loading the skills reference data
+    Given stacks, levels and languages exist
+    When I request all skills twice
+    Then the second request only reads the reference data version,
+    an unchanged ETag gets a 304, and a new language shows up right away
+    """
+    # Given: stacks, levels and languages exist
+    stack, _ = Stack.objects.get_or_create(name='Backend')
+    level, _ = Level.objects.get_or_create(name='Junior')
+    python, _ = ProgLanguage.objects.get_or_create(name='Python')
+
+    # When: I request all skills twice
+    response = client.get('/api/skills/all/')
+    with django_assert_num_queries(1):
+        cached_response = client.get('/api/skills/all/')
+
+    # Then: both responses carry the reference data with caching headers
+    assert response.status_code == status.HTTP_200_OK
+    assert {'id': stack.id, 'name': 'Backend'} in cached_response.data['stacks']
+    assert {'id': level.id, 'name': 'Junior'} in cached_response.data['levels']
+    assert {'id': python.id, 'name': 'Python'} in cached_response.data['languages']
+    assert cached_response['ETag'] == response['ETag']
+    assert 'max-age' in cached_response['Cache-Control']
+
+    # And: an unchanged ETag gets a 304
+    response = client.get('/api/skills/languages/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == status.HTTP_200_OK
+    response = client.get('/api/skills/languages/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    # And: a new language shows up right away
+    rust = ProgLanguage.objects.create(name='Rust')
+    response = client.get('/api/skills/languages/', HTTP_IF_NONE_MATCH=response['ETag'])
+    assert response.status_code == status.HTTP_200_OK
+    assert {'id': rust.id, 'name': 'Rust'} in response.data
+    assert client.get(f'/api/skills/languages/{rust.id}/').data == {'id': rust.id, 'name': 'Rust'}
+
+
+@pytest.mark.django_db
+def test_languages_get_their_own_mask_bit_until_bits_run_out():
+    """
+    Scenario: Assigning language mask bits
+    Given languages being created until every mask bit is taken
+    When another language is created
+    Then it is refused instead of sharing a bit, and a deleted language frees its bit
+    """
+    # Given: languages being created until every mask bit is taken
+    languages = [
+        ProgLanguage.objects.create(name=f'Language {index}')
+        for index in range(LANGUAGE_MASK_BITS - ProgLanguage.objects.count())
+    ]
+    bits = list(ProgLanguage.objects.values_list('mask_bit', flat=True))
+    assert sorted(bits) == list(range(LANGUAGE_MASK_BITS))
+
+    # When: another language is created
+    with pytest.raises(ValueError):
+        ProgLanguage.objects.create(name='One too many')
+
+    # Then: a deleted language frees its bit
+    freed_bit = languages[0].mask_bit
+    languages[0].delete()
+    assert ProgLanguage.objects.create(name='Replacement').mask_bit == freed_bit
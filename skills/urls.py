@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import StackViewSet, LevelViewSet, ProgLanguageViewSet
+from .views import StackViewSet, LevelViewSet, ProgLanguageViewSet, get_all_skills
 
 router = DefaultRouter()
 router.register(r'stacks', StackViewSet, basename='stack')
@@ -8,5 +8,6 @@ router.register(r'levels', LevelViewSet, basename='level')
 router.register(r'languages', ProgLanguageViewSet, basename='language')
 
 urlpatterns = [
+    path('all/', get_all_skills, name='all_skills'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
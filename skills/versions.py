@@ -0,0 +1,26 @@
+import time
+
+from .models import DataVersion
+
+REFERENCE_DATA = 'reference_data'
+DEVELOPER_PROFILES = 'developer_profiles'
+DEVELOPER_SUGGESTIONS = 'developer_suggestions'
+SESSION_SUGGESTIONS = 'session_suggestions'
+
+
+def bump_version(name):
+    """
+    Moves ``name`` to a new version. The row is written in the caller's
+    transaction, so readers only see the new version once the change is committed.
+    """
+    DataVersion.objects.update_or_create(name=name, defaults={'value': time.time_ns()})
+
+
+def get_versions(*names):
+    """Returns the current version of each of ``names`` in one query, None for a version never bumped."""
+    values = dict(DataVersion.objects.filter(name__in=names).values_list('name', 'value'))
+    return tuple(values.get(name) for name in names)
+
+
+def get_version(name):
+    return get_versions(name)[0]
@@ -1,22 +1,59 @@
+from django.conf import settings
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_cache_control
 from rest_framework import viewsets
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
 from .models import Stack, Level, ProgLanguage
+from .reference_cache import reference_data
 from .serializers import StackSerializer, LevelSerializer, ProgLanguageSerializer
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 
 
-class StackViewSet(viewsets.ReadOnlyModelViewSet):
+def reference_response(request, data, etag):
+    """Answers from the reference data cache with Cache-Control and ETag headers."""
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = Response(data)
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=settings.SKILLS_CACHE_MAX_AGE)
+    return response
+
+
+class ReferenceDataViewSet(viewsets.ReadOnlyModelViewSet):
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    reference_table = None
+
+    def list(self, request, *args, **kwargs):
+        return reference_response(request, *reference_data.get(self.reference_table))
+
+    def retrieve(self, request, *args, **kwargs):
+        table, etag = reference_data.get(self.reference_table)
+        for item in table:
+            if str(item["id"]) == kwargs[self.lookup_field]:
+                return reference_response(request, item, etag)
+        raise Http404
+
+
+class StackViewSet(ReferenceDataViewSet):
     queryset = Stack.objects.all()
     serializer_class = StackSerializer
-    permission_classes = [IsAuthenticatedOrReadOnly]
+    reference_table = 'stacks'
 
 
-class LevelViewSet(viewsets.ReadOnlyModelViewSet):
+class LevelViewSet(ReferenceDataViewSet):
     queryset = Level.objects.all()
     serializer_class = LevelSerializer
-    permission_classes = [IsAuthenticatedOrReadOnly]
+    reference_table = 'levels'
 
 
-class ProgLanguageViewSet(viewsets.ReadOnlyModelViewSet):
+class ProgLanguageViewSet(ReferenceDataViewSet):
     queryset = ProgLanguage.objects.all()
     serializer_class = ProgLanguageSerializer
-    permission_classes = [IsAuthenticatedOrReadOnly]
+    reference_table = 'languages'
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticatedOrReadOnly])
+def get_all_skills(request):
+    return reference_response(request, *reference_data.get())
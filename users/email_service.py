@@ -1,6 +1,8 @@
 from djoser.email import ActivationEmail as BaseActivationEmail
 from django.template.loader import render_to_string
 
+from pair_connect.frontend import frontend_url
+
 
 class ActivationEmail(BaseActivationEmail):
     template_name = 'emails/activation_email.html'
@@ -10,8 +12,7 @@ class ActivationEmail(BaseActivationEmail):
     def get_context_data(self):
         context = super().get_context_data()
         context['user'] = self.context.get('user')
-        frontend_url = "http://localhost:5173"
-        context['activation_url'] = f"{frontend_url}/activate/{context.get('uid')}/{context.get('token')}"
+        context['activation_url'] = frontend_url(f"activate/{context.get('uid')}/{context.get('token')}")
         return context
 
     def send(self, to, **kwargs):
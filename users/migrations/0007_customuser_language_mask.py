@@ -0,0 +1,31 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:15
+
+from django.db import migrations, models
+
+LANGUAGE_MASK_BITS = 63
+
+
+def backfill_language_masks(apps, schema_editor):
+    CustomUser = apps.get_model('users', 'CustomUser')
+    masks = {}
+    for user_id, language_id in CustomUser.prog_language.through.objects.values_list(
+            'customuser_id', 'proglanguage_id'):
+        masks[user_id] = masks.get(user_id, 0) | (1 << ((language_id - 1) % LANGUAGE_MASK_BITS))
+    for user_id, mask in masks.items():
+        CustomUser.objects.filter(pk=user_id).update(language_mask=mask)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_alter_customuser_photo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='language_mask',
+            field=models.BigIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_language_masks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 21:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0007_customuser_language_mask'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='language_mask',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+    ]
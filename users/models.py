@@ -45,6 +45,7 @@ class CustomUser(AbstractUser):
     linkedin_link = models.URLField(max_length=255, null=True, blank=True)
     github_link = models.URLField(max_length=255, null=True, blank=True)
     discord_link = models.URLField(max_length=255, null=True, blank=True)
+    language_mask = models.BigIntegerField(default=0, editable=False)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'name']
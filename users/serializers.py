@@ -1,6 +1,8 @@
 from djoser.serializers import UserCreateSerializer, UserSerializer
 from rest_framework import serializers
 
+from pair_connect.fieldsets import SparseFieldsetMixin
+from pair_connect.images import photo_url
 from skills.models import Level, ProgLanguage, Stack
 
 from .models import CustomUser
@@ -50,7 +52,7 @@ class CustomUserCreateSerializer(UserCreateSerializer):
         return user
 
 
-class CustomUserSerializer(UserSerializer):
+class CustomUserSerializer(SparseFieldsetMixin, UserSerializer):
     photo_url = serializers.CharField(source="image.url", read_only=True)
     stack = serializers.PrimaryKeyRelatedField(
         queryset=Stack.objects.all(), allow_null=True
@@ -128,17 +130,26 @@ class CustomUserSerializer(UserSerializer):
     def to_representation(self, instance):
         """Override to adjust photo URL format."""
         representation = super().to_representation(instance)
-        if instance.photo:
-            base_url = "https://res.cloudinary.com/dwzqcmaod/image/upload/"
-            photo_url = str(instance.photo)
-            if not photo_url.startswith("http"):
-                representation["photo"] = f"{base_url}{photo_url}"
-            else:
-                representation["photo"] = photo_url
+        if instance.photo and "photo" in representation:
+            representation["photo"] = photo_url(instance.photo)
         return representation
 
 
-class PublicDeveloperSerializer(serializers.ModelSerializer):
+class UserSummarySerializer(serializers.ModelSerializer):
+    """Compact profile used to resolve participant ids in session lists."""
+    avatar_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CustomUser
+        fields = ("id", "username", "avatar_url", "stack", "level")
+
+    def get_avatar_url(self, obj):
+        if obj.photo:
+            return photo_url(obj.photo)
+        return None
+
+
+class PublicDeveloperSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     stack_name = serializers.CharField(source="stack.name", read_only=True)
     level_name = serializers.CharField(source="level.name", read_only=True)
     language_names = serializers.SlugRelatedField(
@@ -163,17 +174,12 @@ class PublicDeveloperSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         """Override to adjust photo URL format."""
         representation = super().to_representation(instance)
-        if instance.photo:
-            base_url = "https://res.cloudinary.com/dwzqcmaod/image/upload/"
-            photo_url = str(instance.photo)
-            if not photo_url.startswith("http"):
-                representation["photo"] = f"{base_url}{photo_url}"
-            else:
-                representation["photo"] = photo_url
+        if instance.photo and "photo" in representation:
+            representation["photo"] = photo_url(instance.photo)
         return representation
 
 
-class PrivateDeveloperSerializer(serializers.ModelSerializer):
+class PrivateDeveloperSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     stack_name = serializers.CharField(source="stack.name", read_only=True)
     level_name = serializers.CharField(source="level.name", read_only=True)
     language_names = serializers.SlugRelatedField(
@@ -203,11 +209,6 @@ class PrivateDeveloperSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         """Override to adjust photo URL format."""
         representation = super().to_representation(instance)
-        if instance.photo:
-            base_url = "https://res.cloudinary.com/dwzqcmaod/image/upload/"
-            photo_url = str(instance.photo)
-            if not photo_url.startswith("http"):
-                representation["photo"] = f"{base_url}{photo_url}"
-            else:
-                representation["photo"] = photo_url
-            return representation
+        if instance.photo and "photo" in representation:
+            representation["photo"] = photo_url(instance.photo)
+        return representation
@@ -13,11 +13,12 @@ class UserProfileService:
         self.viewer = viewer
         self.user_id = user_id
 
-    def get_profile_data(self, session=None):
+    def get_profile_data(self, session=None, context=None):
         """
             Retrieves a user's profile data based on the provided session.
         Args:
             session (Session, optional): The session for which the user's interest is checked. Defaults to None.
+            context (dict, optional): Serializer context, used for the request's sparse fieldset. Defaults to None.
         Returns:
             dict: The user's profile data.
         Raises:
@@ -27,7 +28,7 @@ class UserProfileService:
             user = CustomUser.objects.get(id=self.user_id)
             if not session:
                 return {
-                    "profile_data": PublicDeveloperSerializer(user).data,
+                    "profile_data": PublicDeveloperSerializer(user, context=context).data,
                     "has_permission": False,
                 }
 
@@ -41,12 +42,12 @@ class UserProfileService:
 
             if is_interested:
                 return {
-                    "profile_data": PrivateDeveloperSerializer(user).data,
+                    "profile_data": PrivateDeveloperSerializer(user, context=context).data,
                     "has_permission": True,
                 }
 
             return {
-                "profile_data": PublicDeveloperSerializer(user).data,
+                "profile_data": PublicDeveloperSerializer(user, context=context).data,
                 "has_permission": False,
             }
 
@@ -61,7 +61,7 @@ class UserProfileView(APIView):
                 session = Session.objects.get(id=session_id)
 
             profile_service = UserProfileService(request.user, user_id)
-            result = profile_service.get_profile_data(session)
+            result = profile_service.get_profile_data(session, context={"request": request})
 
             return Response(result, status=status.HTTP_200_OK)
 